@@ -0,0 +1,252 @@
+""" Throughput and latency of every operation against a stand-in Odoo server
+
+Starts `fake_odoo` in a child process, then runs each `odoo_api_wrapper.Operations`
+member across payload sizes (records per call), concurrency levels (threads sharing one
+`Api`) and result modes:
+
+- `dict`: the default `Api`
+- `fast`: `fast_decoder=True`, for reads
+- `record`: a `Model` with `result_mode="record"`, for reads
+
+and reports the throughput and the p50/p99 latencies of each case.
+
+```
+python benchmarks/calls.py --sizes 1 100 1000 --concurrency 1 8 --output results.jsonl
+python benchmarks/calls.py --compare results.jsonl
+```
+
+`--output` writes a JSON line per case. `--compare` runs the cases again and reports
+how each one moved against a previous output, exiting with status 1 when a case's
+throughput dropped, or its p99 latency grew, by more than `--threshold`.
+
+The timings include the stand-in server's own work, e.g. encoding large responses:
+compare results taken on the same machine, with enough `--calls` to smooth out noise.
+"""
+import argparse
+import concurrent.futures
+import functools
+import json
+import platform
+import sys
+import time
+import typing as t
+
+import fake_odoo
+
+import odoo_api_wrapper
+from odoo_api_wrapper import Operations
+
+READ_FIELDS = ["name", "partner_id", "debit", "credit", "date", "tax_ids"]
+
+# the operations result modes apply to
+READS = (Operations.READ, Operations.SEARCH_READ)
+
+
+def percentile(values: t.List[float], fraction: float) -> float:
+    """The `fraction` percentile of `values`, by nearest rank"""
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(fraction * (len(values) - 1))))]
+
+
+def make_calls(
+    api: odoo_api_wrapper.Api,
+    operation: Operations,
+    size: int,
+    calls: int,
+) -> t.Tuple[str, t.List[t.Tuple[t.List, t.Dict[str, t.Any]]]]:
+    """The model and the `(args, kwargs)` of each call of a case"""
+    if operation in (Operations.CREATE, Operations.WRITE, Operations.UNLINK):
+        model = "res.partner"
+        values = {"name": "Benchmark", "email": "benchmark@example.com"}
+
+        if operation is Operations.CREATE:
+            return model, [([[values] * size], {})] * calls
+
+        # fresh records for every call, so each one has something to change
+        ids = [api.create(model, [[values] * size]) for _ in range(calls)]
+        if operation is Operations.WRITE:
+            return model, [([chunk, {"name": "Written"}], {}) for chunk in ids]
+        return model, [([chunk], {}) for chunk in ids]
+
+    model = "account.move.line"
+    if operation is Operations.READ:
+        ids = list(range(1, size + 1))
+        return model, [([ids], {"fields": READ_FIELDS})] * calls
+    if operation is Operations.SEARCH_READ:
+        kwargs = {"fields": READ_FIELDS, "limit": size}
+        return model, [([[["id", ">", 0]]], kwargs)] * calls
+    if operation is Operations.SEARCH:
+        return model, [([[["id", ">", 0]]], {"limit": size})] * calls
+    if operation is Operations.SEARCH_COUNT:
+        return model, [([[]], {})] * calls
+    if operation is Operations.READ_GROUP:
+        args = [[], ["debit:sum", "credit:sum"], ["partner_id"]]
+        return model, [(args, {"lazy": False, "limit": size})] * calls
+    if operation is Operations.NAME_SEARCH:
+        return "res.partner", [(["Partner"], {"limit": size})] * calls
+
+    return model, [([], {"attributes": ["string", "type"]})] * calls
+
+
+def run_case(
+    func: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any],
+    calls: t.List[t.Tuple[t.List, t.Dict[str, t.Any]]],
+    concurrency: int,
+) -> t.Dict[str, t.Any]:
+    """Make `calls` on `concurrency` threads, timing each of them"""
+    latencies: t.List[float] = []
+
+    def _worker(worker_calls: t.List[t.Tuple[t.List, t.Dict[str, t.Any]]]):
+        for args, kwargs in worker_calls:
+            start = time.perf_counter()
+            func(args, kwargs)
+            latencies.append(time.perf_counter() - start)
+
+    with concurrent.futures.ThreadPoolExecutor(concurrency) as executor:
+        start = time.perf_counter()
+        list(
+            executor.map(
+                _worker, [calls[index::concurrency] for index in range(concurrency)]
+            )
+        )
+        seconds = time.perf_counter() - start
+
+    return {
+        "calls": len(calls),
+        "seconds": seconds,
+        "throughput": len(calls) / seconds,
+        "p50": percentile(latencies, 0.5),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+def measure(  # pylint:disable=too-many-locals
+    sizes: t.List[int],
+    concurrency_levels: t.List[int],
+    calls: int,
+    rows: int,
+) -> t.Iterator[t.Dict[str, t.Any]]:
+    """Run every case, yielding their results"""
+    process, url = fake_odoo.spawn(max(rows, *sizes))
+    environment = {
+        "version": odoo_api_wrapper.__version__,
+        "python": platform.python_version(),
+    }
+
+    try:
+        for operation in Operations.__members__.values():
+            modes = ("dict", "fast", "record") if operation in READS else ("dict",)
+
+            for size, concurrency, mode in (
+                (size, concurrency, mode)
+                for size in sizes
+                for concurrency in concurrency_levels
+                for mode in modes
+            ):
+                api = odoo_api_wrapper.Api(
+                    url,
+                    "db",
+                    "2",
+                    "password",
+                    max_workers=concurrency,
+                    fast_decoder=mode == "fast",
+                )
+                model, case_calls = make_calls(api, operation, size, calls + 1)
+
+                func: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
+                if mode == "record":
+                    records = odoo_api_wrapper.Model(api, model, "record")
+                    func = getattr(records, operation.value)
+                else:
+                    func = functools.partial(api.call, operation, model)
+
+                with api:
+                    # the first call opens a connection and warms the caches
+                    func(*case_calls[0])
+                    result = run_case(func, case_calls[1:], concurrency)
+
+                yield {
+                    "operation": operation.value,
+                    "model": model,
+                    "size": size,
+                    "concurrency": concurrency,
+                    "mode": mode,
+                    **result,
+                    **environment,
+                }
+    finally:
+        process.terminate()
+        process.join()
+
+
+def case_key(result: t.Dict[str, t.Any]) -> t.Tuple[t.Any, ...]:
+    """The fields identifying a case"""
+    return (result["operation"], result["size"], result["concurrency"], result["mode"])
+
+
+def compare(
+    results: t.List[t.Dict[str, t.Any]],
+    baseline_path: str,
+    threshold: float,
+) -> bool:
+    """Print how `results` moved against a previous output
+
+    Returns whether no case regressed by more than `threshold`.
+    """
+    with open(baseline_path, encoding="utf-8") as file:
+        baseline = {case_key(result): result for result in map(json.loads, file)}
+
+    ok = True
+    print(f"{'case':<40}{'throughput':>12}{'p99':>10}")
+    for result in results:
+        previous = baseline.get(case_key(result))
+        if previous is None:
+            continue
+
+        throughput = result["throughput"] / previous["throughput"] - 1
+        p99 = result["p99"] / previous["p99"] - 1
+        regressed = throughput < -threshold or p99 > threshold
+        ok = ok and not regressed
+
+        name = "/".join(map(str, case_key(result)))
+        flag = "  REGRESSED" if regressed else ""
+        print(f"{name:<40}{throughput:>+12.1%}{p99:>+10.1%}{flag}")
+
+    return ok
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 100, 1000])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--calls", type=int, default=100, help="calls per case")
+    parser.add_argument("--rows", type=int, default=10000, help="records per model")
+    parser.add_argument("--output", help="write a json line per case to this file")
+    parser.add_argument("--compare", help="compare with a previous --output file")
+    parser.add_argument("--threshold", type=float, default=0.25)
+    options = parser.parse_args()
+
+    results = []
+    for result in measure(
+        options.sizes, options.concurrency, options.calls, options.rows
+    ):
+        results.append(result)
+        print(
+            f"{'/'.join(map(str, case_key(result))):<40}"
+            f"{result['throughput']:>10.1f}/s"
+            f"{result['p50'] * 1000:>10.2f}ms{result['p99'] * 1000:>10.2f}ms",
+            file=sys.stderr,
+        )
+
+    if options.output:
+        with open(options.output, "w", encoding="utf-8") as file:
+            for result in results:
+                file.write(json.dumps(result) + "\n")
+
+    if options.compare and not compare(results, options.compare, options.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
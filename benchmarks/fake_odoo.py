@@ -0,0 +1,325 @@
+""" A stand-in Odoo server for benchmarks
+
+Serves `execute_kw` on `/xmlrpc/2/object` with `xmlrpc.server`, over keep-alive
+connections, backed by synthetic in-memory models:
+
+- `res.partner`: small records
+- `account.move.line`: wide records, shaped like `payload.make_rows`'
+
+Every `odoo_api_wrapper.Operations` member is supported. Domains may filter on `id`
+only, other leaves are ignored. `read_group` sums fields and groups by plain field
+values, `name_search` matches names containing the searched text.
+
+```
+python benchmarks/fake_odoo.py --port 8069 --rows 100000
+```
+"""
+import argparse
+import itertools
+import multiprocessing
+import operator
+import socketserver
+import threading
+import typing as t
+import xmlrpc.client
+import xmlrpc.server
+
+from payload import make_rows
+
+FIELD_TYPES = {
+    "id": "integer",
+    "name": "char",
+    "ref": "char",
+    "email": "char",
+    "is_company": "boolean",
+    "partner_id": "many2one",
+    "account_id": "many2one",
+    "debit": "monetary",
+    "credit": "monetary",
+    "quantity": "float",
+    "date": "date",
+    "reconciled": "boolean",
+    "tax_ids": "many2many",
+}
+
+_OPERATORS = {
+    "=": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "in": lambda value, values: value in values,
+    "not in": lambda value, values: value not in values,
+}
+
+
+def make_partners(count: int) -> t.List[t.Dict[str, t.Any]]:
+    """Build `count` small `res.partner` records"""
+    return [
+        {
+            "id": index,
+            "name": f"Partner {index}",
+            "email": f"partner{index}@example.com",
+            "is_company": index % 3 == 0,
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+class FakeOdoo:
+    """In-memory models answering `execute_kw`"""
+
+    def __init__(self, rows: int = 10000):
+        self.records: t.Dict[str, t.Dict[int, t.Dict[str, t.Any]]] = {
+            "res.partner": {row["id"]: row for row in make_partners(rows)},
+            "account.move.line": {row["id"]: row for row in make_rows(rows)},
+        }
+        self._ids = itertools.count(rows + 1)
+        self._lock = threading.Lock()
+
+    def execute_kw(  # pylint:disable=too-many-arguments
+        self,
+        db_name: str,
+        uid: t.Any,
+        password: str,
+        model: str,
+        method: str,
+        args: t.List,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> t.Any:
+        """Run an operation on a model"""
+        del db_name, uid, password
+
+        if model not in self.records:
+            raise xmlrpc.client.Fault(2, f"Object {model} doesn't exist")
+
+        handler = getattr(self, f"_{method}", None)
+        if handler is None:
+            raise xmlrpc.client.Fault(2, f"Unknown method {method}")
+
+        return handler(self.records[model], *args, **(kwargs or {}))
+
+    def _search_ids(  # pylint:disable=too-many-arguments
+        self,
+        records: t.Dict[int, t.Dict[str, t.Any]],
+        domain: t.List,
+        offset: int = 0,
+        limit: t.Optional[int] = None,
+        order: str = "id",
+        **_: t.Any,
+    ) -> t.List[int]:
+        leaves = [
+            (_OPERATORS[leaf[1]], leaf[2])
+            for leaf in domain
+            if isinstance(leaf, (list, tuple)) and leaf[0] == "id"
+        ]
+
+        with self._lock:
+            # ids are created in increasing order, stop scanning once `limit` matched
+            ids = list(records)
+            if order.strip().endswith("desc"):
+                ids.reverse()
+
+            matching = (
+                id_
+                for id_ in ids
+                if all(compare(id_, value) for compare, value in leaves)
+            )
+            return list(
+                itertools.islice(
+                    matching, offset, None if limit is None else offset + limit
+                )
+            )
+
+    def _search(self, records, domain, **kwargs):
+        return self._search_ids(records, domain, **kwargs)
+
+    def _search_count(self, records, domain, **kwargs):
+        if not any(isinstance(leaf, (list, tuple)) for leaf in domain):
+            return len(records)
+
+        return len(self._search_ids(records, domain, **kwargs))
+
+    def _read(self, records, ids, fields=None, **_):
+        with self._lock:
+            rows = [records[id_] for id_ in ids if id_ in records]
+
+        if not fields:
+            return rows
+
+        fields = ["id", *(field for field in fields if field != "id")]
+        return [{field: row.get(field, False) for field in fields} for row in rows]
+
+    def _search_read(self, records, domain, fields=None, **kwargs):
+        return self._read(records, self._search_ids(records, domain, **kwargs), fields)
+
+    def _read_group(  # pylint:disable=too-many-arguments,too-many-locals
+        self,
+        records,
+        domain,
+        fields,
+        groupby,
+        offset=0,
+        limit=None,
+        **_,
+    ):
+        groupby = [spec.split(":")[0] for spec in groupby]
+        # `name:agg(field)` or `field:agg`, only sums are supported
+        aggregates = {
+            spec.split(":")[0]: spec.split("(")[-1].rstrip(")").split(":")[0]
+            for spec in fields
+            if spec.split(":")[0] not in groupby
+        }
+
+        groups: t.Dict[t.Tuple, t.Dict[str, t.Any]] = {}
+        for row in self._read(records, self._search_ids(records, domain)):
+            values = [row.get(field, False) for field in groupby]
+            key = tuple(tuple(v) if isinstance(v, list) else v for v in values)
+
+            group = groups.get(key)
+            if group is None:
+                group = groups[key] = {
+                    **dict(zip(groupby, values)),
+                    **{name: 0 for name in aggregates},
+                    "__count": 0,
+                }
+            group["__count"] += 1
+            for name, field in aggregates.items():
+                group[name] += row.get(field) or 0
+
+        result = [groups[key] for key in sorted(groups, key=repr)]
+        return result[offset : None if limit is None else offset + limit]
+
+    def _name_search(self, records, name="", args=None, limit=100, **_):
+        with self._lock:
+            rows = list(records.values())
+
+        matching = (
+            [row["id"], row["name"]]
+            for row in rows
+            if name.lower() in str(row.get("name", "")).lower()
+            and all(
+                compare(row["id"], value)
+                for compare, value in (
+                    (_OPERATORS[leaf[1]], leaf[2])
+                    for leaf in args or []
+                    if isinstance(leaf, (list, tuple)) and leaf[0] == "id"
+                )
+            )
+        )
+        return list(itertools.islice(matching, limit))
+
+    def _fields_get(self, records, allfields=None, attributes=None, **_):
+        del records
+        fields = allfields or list(FIELD_TYPES)
+        return {
+            field: {
+                attribute: FIELD_TYPES[field] if attribute == "type" else field
+                for attribute in attributes or ("string", "type")
+            }
+            for field in fields
+            if field in FIELD_TYPES
+        }
+
+    def _create(self, records, values, **_):
+        batch = values if isinstance(values, list) else [values]
+
+        with self._lock:
+            ids = [next(self._ids) for _ in batch]
+            for id_, row in zip(ids, batch):
+                records[id_] = {**row, "id": id_}
+
+        return ids if isinstance(values, list) else ids[0]
+
+    def _write(self, records, ids, values, **_):
+        with self._lock:
+            for id_ in ids:
+                if id_ in records:
+                    records[id_] = {**records[id_], **values}
+
+        return True
+
+    def _unlink(self, records, ids, **_):
+        with self._lock:
+            for id_ in ids:
+                records.pop(id_, None)
+
+        return True
+
+
+class _RequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    """Keep-alive request handler"""
+
+    protocol_version = "HTTP/1.1"
+    rpc_paths = ("/xmlrpc/2/object",)
+
+    def log_message(self, *args):  # pylint:disable=arguments-differ
+        pass
+
+
+class Server(socketserver.ThreadingMixIn, xmlrpc.server.SimpleXMLRPCServer):
+    """Threaded XML-RPC server"""
+
+    daemon_threads = True
+    block_on_close = False
+
+    @property
+    def url(self) -> str:
+        """The server url"""
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+def start(
+    rows: int = 10000, host: str = "127.0.0.1", port: int = 0
+) -> t.Tuple[Server, FakeOdoo]:
+    """Serve a `FakeOdoo` from a background thread, `port` 0 picks a free port"""
+    server = Server((host, port), _RequestHandler, allow_none=True, logRequests=False)
+    odoo = FakeOdoo(rows)
+    server.register_function(odoo.execute_kw, "execute_kw")
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, odoo
+
+
+def _serve(rows: int, host: str, port: int, urls: t.Any):
+    server, _ = start(rows, host, port)
+    urls.put(server.url)
+    threading.Event().wait()
+
+
+def spawn(
+    rows: int = 10000, host: str = "127.0.0.1"
+) -> t.Tuple[multiprocessing.Process, str]:
+    """Serve a `FakeOdoo` from a child process, so it doesn't compete with the
+    benchmark for the GIL
+
+    Returns the process, to terminate once done, and the server url.
+    """
+    urls: t.Any = multiprocessing.Queue()
+    process = multiprocessing.Process(
+        target=_serve, args=(rows, host, 0, urls), daemon=True
+    )
+    process.start()
+    return process, urls.get(timeout=60)
+
+
+def main():
+    """Serve until interrupted"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8069)
+    parser.add_argument("--rows", type=int, default=10000)
+    options = parser.parse_args()
+
+    server, _ = start(options.rows, options.host, options.port)
+    print(f"serving on {server.url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+""" Payload size and decoding time of large `search_read` results
+
+Compares the XML-RPC (stock and fast decoder) and JSON-RPC encodings of a synthetic
+`search_read` result: the size of the response body (raw and gzipped) and the time it
+takes to decode it.
+
+```
+python benchmarks/payload.py --rows 100000 --repeat 3
+```
+"""
+import argparse
+import gzip
+import json
+import random
+import string
+import time
+import typing as t
+import xmlrpc.client
+
+from odoo_api_wrapper import decoder
+
+
+def make_rows(count: int, seed: int = 0) -> t.List[t.Dict[str, t.Any]]:
+    """Build `count` records shaped like `account.move.line` `search_read` rows"""
+    rng = random.Random(seed)
+
+    def _text(length: int) -> str:
+        return "".join(rng.choices(string.ascii_letters + " ", k=length))
+
+    return [
+        {
+            "id": index,
+            "name": _text(24),
+            "ref": _text(12) if rng.random() > 0.3 else False,
+            "partner_id": [rng.randint(1, 5000), _text(18)],
+            "account_id": [rng.randint(1, 300), _text(30)],
+            "debit": round(rng.uniform(0, 10000), 2),
+            "credit": round(rng.uniform(0, 10000), 2),
+            "quantity": rng.randint(1, 100),
+            "date": f"2022-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "reconciled": rng.random() > 0.5,
+            "tax_ids": rng.sample(range(1, 50), rng.randint(0, 3)),
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def encode_xmlrpc(rows: t.List[t.Dict[str, t.Any]]) -> bytes:
+    """Encode rows as an XML-RPC method response"""
+    return xmlrpc.client.dumps((rows,), methodresponse=True).encode()
+
+
+def encode_jsonrpc(rows: t.List[t.Dict[str, t.Any]]) -> bytes:
+    """Encode rows as an Odoo JSON-RPC response"""
+    return json.dumps({"jsonrpc": "2.0", "id": 1, "result": rows}).encode()
+
+
+def decode_xmlrpc(body: bytes) -> t.Any:
+    """Decode an XML-RPC response with the stock unmarshaller"""
+    return xmlrpc.client.loads(body)[0][0]
+
+
+def decode_xmlrpc_fast(body: bytes) -> t.Any:
+    """Decode an XML-RPC response with `odoo_api_wrapper.decoder`"""
+    return decoder.loads(body)[0]
+
+
+def decode_jsonrpc(body: bytes) -> t.Any:
+    """Decode a JSON-RPC response"""
+    return json.loads(body)["result"]
+
+
+DECODERS: t.Dict[str, t.Tuple[t.Callable, t.Callable]] = {
+    "xmlrpc": (encode_xmlrpc, decode_xmlrpc),
+    "xmlrpc-fast": (encode_xmlrpc, decode_xmlrpc_fast),
+    "jsonrpc": (encode_jsonrpc, decode_jsonrpc),
+}
+
+
+def measure(
+    rows: t.List[t.Dict[str, t.Any]],
+    repeat: int,
+) -> t.List[t.Dict[str, t.Any]]:
+    """Measure every decoder on `rows`"""
+    results = []
+
+    for name, (encode, decode) in DECODERS.items():
+        body = encode(rows)
+        assert decode(body) == rows, name
+
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            decode(body)
+            timings.append(time.perf_counter() - start)
+
+        results.append(
+            {
+                "format": name,
+                "rows": len(rows),
+                "bytes": len(body),
+                "gzip_bytes": len(gzip.compress(body, compresslevel=6)),
+                "decode_seconds": min(timings),
+            }
+        )
+
+    return results
+
+
+def main():
+    """Run the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="print json lines")
+    options = parser.parse_args()
+
+    results = measure(make_rows(options.rows), options.repeat)
+
+    if options.json:
+        for result in results:
+            print(json.dumps(result))
+        return
+
+    print(f"{'format':<12}{'bytes':>14}{'gzip bytes':>14}{'decode (s)':>14}")
+    for result in results:
+        print(
+            f"{result['format']:<12}{result['bytes']:>14,}"
+            f"{result['gzip_bytes']:>14,}{result['decode_seconds']:>14.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
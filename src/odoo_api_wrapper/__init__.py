@@ -95,7 +95,11 @@ partner.unlink([[id]])
 """
 from odoo_api_wrapper.api import Api  # noqa:F401
 from odoo_api_wrapper.api import APIError  # noqa:F401
+from odoo_api_wrapper.api import APITimeoutError  # noqa:F401
+from odoo_api_wrapper.api import BulkCreateError  # noqa:F401
+from odoo_api_wrapper.api import CircuitOpenError  # noqa:F401
 from odoo_api_wrapper.api import Operations  # noqa:F401
+from odoo_api_wrapper.api import Protocol  # noqa:F401
 from odoo_api_wrapper.model import Model  # noqa:F401
 
 __version__ = "0.2.3"
@@ -0,0 +1,426 @@
+""" asyncio client
+
+`odoo_api_wrapper.aio.AsyncApi` and `odoo_api_wrapper.aio.AsyncModel` mirror
+`odoo_api_wrapper.api.Api` and `odoo_api_wrapper.model.Model`, every operation is a
+coroutine. Requests go over a pool of non-blocking keep-alive connections, at most
+`max_connections` of them run at once.
+
+## Usage Examples
+
+### Instantiate an `AsyncApi`
+```python
+from odoo_api_wrapper.aio import AsyncApi, AsyncModel
+
+async with AsyncApi("http://localhost:8069", "db", "1001", "password") as api:
+    await api.search('res.partner', [[['is_company', '=', True]]])
+```
+
+### Define your model
+```python
+partner = AsyncModel(api, "res.partner")
+await partner.search_read(
+    [[['is_company', '=', True]]],
+    {'fields': ['name', 'country_id', 'comment'], 'limit': 5},
+)
+```
+
+### Time out
+Calls time out after `timeout` seconds, 120 by default, raising
+`odoo_api_wrapper.api.APITimeoutError`. A call can be given its own `timeout`.
+```python
+await api.search_count('res.partner', [[]], timeout=5)
+```
+
+### Run calls concurrently
+```python
+partners, companies = await asyncio.gather(
+    api.search_read('res.partner', [[]]),
+    api.search_read('res.company', [[]]),
+)
+```
+"""
+import asyncio
+import gzip
+import socket
+import ssl
+import time
+import typing as t
+import urllib.parse
+import xmlrpc.client
+
+import odoo_api_wrapper
+import odoo_api_wrapper.decoder
+from odoo_api_wrapper.api import APIError
+from odoo_api_wrapper.api import APITimeoutError
+from odoo_api_wrapper.api import OperationMethod
+from odoo_api_wrapper.api import Operations
+
+# errors raised when a kept-alive connection was closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    asyncio.IncompleteReadError,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+
+class AsyncConnection:  # pylint:disable=too-few-public-methods
+    """A keep-alive connection"""
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.released_at = time.monotonic()
+        self.requests = 0
+
+    def close(self):
+        """Close the connection"""
+        self.writer.close()
+
+
+class AsyncResponse(t.NamedTuple):
+    """A parsed HTTP response"""
+
+    status: int
+    reason: str
+    headers: t.Dict[str, str]
+    body: bytes
+    will_close: bool
+
+
+async def read_response(reader: asyncio.StreamReader) -> AsyncResponse:
+    """Read an HTTP/1.x response from `reader`"""
+    status_line = await reader.readline()
+    if not status_line:
+        raise ConnectionResetError("connection closed by the server")
+
+    version, status, *reason = status_line.decode("latin-1").split(None, 2)
+
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+    will_close = (
+        version == "HTTP/1.0" or headers.get("connection", "").lower() == "close"
+    )
+
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        chunks = []
+        while True:
+            size = int((await reader.readline()).split(b";")[0], 16)
+            if not size:
+                # skip the trailers
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                break
+            chunks.append(await reader.readexactly(size))
+            await reader.readline()
+        body = b"".join(chunks)
+    elif "content-length" in headers:
+        body = await reader.readexactly(int(headers["content-length"]))
+    else:
+        body = await reader.read()
+        will_close = True
+
+    if headers.get("content-encoding", "") == "gzip":
+        body = gzip.decompress(body)
+
+    return AsyncResponse(
+        int(status),
+        reason[0].strip() if reason else "",
+        headers,
+        body,
+        will_close,
+    )
+
+
+class AsyncTransport:  # pylint:disable=too-many-instance-attributes
+    """Non-blocking XML-RPC transport over pooled keep-alive connections
+
+    Args:
+        url: the server url
+        max_connections: the maximum number of concurrent requests
+        max_idle: idle connections older than this many seconds are not reused
+        ssl_context: the context of https connections (optional)
+        fast_decoder: decode responses with `odoo_api_wrapper.decoder.FastDecoder`
+    """
+
+    user_agent = f"odoo_api_wrapper/{odoo_api_wrapper.__version__}"
+
+    def __init__(
+        self,
+        url: str,
+        max_connections: int = 10,
+        max_idle: t.Optional[float] = 60.0,
+        ssl_context: t.Optional[ssl.SSLContext] = None,
+        fast_decoder: bool = False,
+    ):
+        parts = urllib.parse.urlsplit(url)
+        secure = parts.scheme == "https"
+
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or (443 if secure else 80)
+        self.netloc = parts.netloc
+        self.ssl: t.Union[ssl.SSLContext, bool, None] = None
+        if secure:
+            self.ssl = ssl_context or True
+
+        self.max_connections = max_connections
+        self.max_idle = max_idle
+        self.fast_decoder = fast_decoder
+
+        self._idle: t.List[AsyncConnection] = []
+        self._slots: t.Optional[asyncio.Semaphore] = None
+
+    @property
+    def slots(self) -> asyncio.Semaphore:
+        """The semaphore limiting concurrent requests, created in the running loop"""
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        return self._slots
+
+    async def connect(self) -> AsyncConnection:
+        """Open a new connection"""
+        reader, writer = await asyncio.open_connection(
+            self.host, self.port, ssl=self.ssl
+        )
+        return AsyncConnection(reader, writer)
+
+    async def acquire(self) -> AsyncConnection:
+        """Get an idle connection, or open a new one"""
+        while self._idle:
+            connection = self._idle.pop()
+            if (
+                self.max_idle is None
+                or time.monotonic() - connection.released_at <= self.max_idle
+            ):
+                return connection
+            connection.close()
+
+        return await self.connect()
+
+    def release(self, connection: AsyncConnection, reusable: bool = True):
+        """Give a connection back to the pool, closing it if it is not `reusable`"""
+        if reusable:
+            connection.released_at = time.monotonic()
+            self._idle.append(connection)
+        else:
+            connection.close()
+
+    async def request(self, handler: str, request_body: bytes) -> t.Any:
+        """Send an XML-RPC request and parse the response"""
+        async with self.slots:
+            # retry once when a reused connection has gone cold
+            for attempt in (0, 1):
+                connection = await self.acquire()
+                reused = connection.requests > 0
+                reusable = False
+
+                try:
+                    response = await self.send_request(
+                        connection, handler, request_body
+                    )
+                    reusable = not response.will_close
+                except STALE_CONNECTION_ERRORS:
+                    if attempt or not reused:
+                        raise
+                    continue
+                finally:
+                    self.release(connection, reusable)
+
+                return self.parse_response(handler, response)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    async def send_request(
+        self,
+        connection: AsyncConnection,
+        handler: str,
+        request_body: bytes,
+    ) -> AsyncResponse:
+        """Send the request over `connection` and read the response"""
+        connection.requests += 1
+
+        head = (
+            f"POST {handler} HTTP/1.1\r\n"
+            f"Host: {self.netloc}\r\n"
+            f"User-Agent: {self.user_agent}\r\n"
+            "Content-Type: text/xml\r\n"
+            "Accept-Encoding: gzip\r\n"
+            f"Content-Length: {len(request_body)}\r\n"
+            "\r\n"
+        )
+        connection.writer.write(head.encode("latin-1") + request_body)
+        await connection.writer.drain()
+
+        return await read_response(connection.reader)
+
+    def parse_response(self, handler: str, response: AsyncResponse) -> t.Any:
+        """Unmarshall a response, HTTP errors raise `xmlrpc.client.ProtocolError`"""
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                self.netloc + handler,
+                response.status,
+                response.reason,
+                response.headers,
+            )
+
+        parser: t.Any
+        unmarshaller: t.Any
+        if self.fast_decoder:
+            parser, unmarshaller = odoo_api_wrapper.decoder.getparser()
+        else:
+            parser, unmarshaller = xmlrpc.client.getparser()
+        parser.feed(response.body)
+        parser.close()
+        return unmarshaller.close()
+
+    def close(self):
+        """Close the idle connections"""
+        idle, self._idle = self._idle, []
+        for connection in idle:
+            connection.close()
+
+
+class AsyncApi:  # pylint:disable=too-few-public-methods
+    """asyncio API Wrapper"""
+
+    # the operations, they take a `timeout` keyword argument
+    write = OperationMethod(Operations.WRITE)
+    create = OperationMethod(Operations.CREATE)
+    read = OperationMethod(Operations.READ)
+    search = OperationMethod(Operations.SEARCH)
+    search_count = OperationMethod(Operations.SEARCH_COUNT)
+    search_read = OperationMethod(Operations.SEARCH_READ)
+    fields_get = OperationMethod(Operations.FIELDS_GET)
+    unlink = OperationMethod(Operations.UNLINK)
+    read_group = OperationMethod(Operations.READ_GROUP)
+    name_search = OperationMethod(Operations.NAME_SEARCH)
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        base_url: str,
+        db_name: str,
+        uid: str,
+        password: str,
+        max_connections: int = 10,
+        ssl_context: t.Optional[ssl.SSLContext] = None,
+        fast_decoder: bool = False,
+        timeout: t.Optional[float] = 120.0,
+    ):
+        """
+        Args:
+            base_url: the server url, e.g. `"http://localhost:8069"`
+            db_name: the database name
+            uid: the user id
+            password: the user password or api key
+            max_connections: the maximum number of concurrent requests
+            ssl_context: the context of https connections (optional)
+            fast_decoder: decode responses with `odoo_api_wrapper.decoder.FastDecoder`
+            timeout: the number of seconds a call may take, `None` for no limit
+        """
+        self.base_url = base_url
+        self.db_name = db_name
+        self.uid = uid
+        self.password = password
+        self.timeout = timeout
+
+        self.transport = AsyncTransport(
+            base_url,
+            max_connections=max_connections,
+            ssl_context=ssl_context,
+            fast_decoder=fast_decoder,
+        )
+        self.handler = urllib.parse.urlsplit(base_url).path + "/xmlrpc/2/object"
+
+    async def __aenter__(self) -> "AsyncApi":
+        return self
+
+    async def __aexit__(self, *exc_info: t.Any):
+        await self.close()
+
+    async def close(self):
+        """Close the idle connections"""
+        self.transport.close()
+
+    async def call(
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+    ) -> t.Any:
+        """Call the api with a model and an operation
+
+        Args:
+            operation: the operation to call
+            model: the name of the model
+            args: a list of parameters passed by position
+            kwargs: a dict of parameters to pass by keyword (optional)
+            timeout: the number of seconds the call may take, defaults to the
+                `AsyncApi`'s
+        """
+        if not isinstance(operation, Operations):
+            raise APIError("Invalid operation")
+
+        kwargs = kwargs if kwargs else {}
+
+        request_body = xmlrpc.client.dumps(
+            (
+                self.db_name,
+                self.uid,
+                self.password,
+                model,
+                operation.value,
+                args,
+                kwargs,
+            ),
+            "execute_kw",
+            allow_none=True,
+        ).encode()
+
+        try:
+            [result] = await asyncio.wait_for(
+                self.transport.request(self.handler, request_body),
+                self.timeout if timeout is None else timeout,
+            )
+        except xmlrpc.client.Fault as error:
+            raise APIError(error.faultString) from error
+        except (asyncio.TimeoutError, socket.timeout) as error:
+            raise APITimeoutError("Timed out") from error
+        except xmlrpc.client.ProtocolError as error:
+            raise APIError(f"HTTP {error.errcode} {error.errmsg}") from error
+        except (OSError, asyncio.IncompleteReadError) as error:
+            raise APIError(str(error)) from error
+
+        return result
+
+
+class AsyncModel:  # pylint:disable=too-few-public-methods
+    """asyncio Odoo model"""
+
+    # the operations, bound to the model, they take a `timeout` keyword argument
+    write = OperationMethod(Operations.WRITE, on_model=True)
+    create = OperationMethod(Operations.CREATE, on_model=True)
+    read = OperationMethod(Operations.READ, on_model=True)
+    search = OperationMethod(Operations.SEARCH, on_model=True)
+    search_count = OperationMethod(Operations.SEARCH_COUNT, on_model=True)
+    search_read = OperationMethod(Operations.SEARCH_READ, on_model=True)
+    fields_get = OperationMethod(Operations.FIELDS_GET, on_model=True)
+    unlink = OperationMethod(Operations.UNLINK, on_model=True)
+    read_group = OperationMethod(Operations.READ_GROUP, on_model=True)
+    name_search = OperationMethod(Operations.NAME_SEARCH, on_model=True)
+
+    def __init__(self, api: AsyncApi, model_name: str):
+        """
+        Args:
+            api: the api used for the calls
+            model_name: the name of the model, e.g. `"res.partner"`
+        """
+        self.api = api
+        self.model_name = model_name
@@ -19,6 +19,111 @@ import odoo_api_wrapper
 api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
 ```
 
+Calls go through a pool of keep-alive connections
+(`odoo_api_wrapper.transport.PooledTransport`), pass your own `transport` to tune it.
+Creating an `Api` is cheap: the server proxy is created, and connections opened, on the
+first call. Release the connections with `close()` once done, or use the `Api` as a
+context manager.
+```python
+api.close()
+```
+
+### Time out
+Each call times out after `timeout` seconds, 120 by default like Odoo's
+`limit_time_real`, raising `odoo_api_wrapper.api.APITimeoutError`. A call can be given
+its own `timeout`, or a `deadline` as a `time.monotonic()` time.
+```python
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", timeout=30
+)
+api.search_count('res.partner', [[]], timeout=5)
+```
+
+The deadline covers everything a call does: the chunks of a chunked call, the reads of
+`prefetch`, the calls of `call_many()` and the pages of `iter_search_read()` and
+`create_many()` share it. `deadline()` gives one to every call made in a block.
+```python
+with api.deadline(timeout=60):
+    partners = api.search_read('res.partner', [[]], {'fields': ['name']})
+    ids = [partner['id'] for partner in partners]
+    api.write('res.partner', [ids, {'active': True}], chunk_size=1000)
+```
+
+The default transport bounds waiting for a connection and each socket operation by the
+deadline: a stalled server times out at the deadline, but one still sending its
+response, however slowly, is only stopped once the response is read. A custom
+`transport` only has the deadline checked between calls.
+
+### Retry, break the circuit and hedge
+Read-only calls can be retried on connection errors and 5xx responses, calls can fail
+fast while the server is down, and slow reads can be sent twice, see
+`odoo_api_wrapper.resilience`.
+```python
+from odoo_api_wrapper.resilience import CircuitBreaker, RetryPolicy
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069",
+    "db",
+    "1001",
+    "password",
+    retry=RetryPolicy(),
+    circuit_breaker=CircuitBreaker(),
+)
+```
+
+### Record metrics
+Sinks given as `metrics` record the count, latency, sizes and errors of the requests by
+operation and model, see `odoo_api_wrapper.metrics`.
+```python
+from odoo_api_wrapper.metrics import PrometheusSink
+
+sink = PrometheusSink()
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", metrics=[sink]
+)
+```
+
+### Use JSON-RPC
+JSON is more compact and much faster to decode than XML, switch to Odoo's `/jsonrpc`
+endpoint for large reads.
+```python
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", protocol="jsonrpc"
+)
+```
+
+### Decode large responses faster
+`fast_decoder` swaps `xmlrpc.client`'s unmarshaller for an expat based decoder building
+the results directly and sharing field name strings between records.
+```python
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", fast_decoder=True
+)
+```
+
+### Compress requests
+Responses are gzip compressed when the server supports it, `encode_threshold` compresses
+request bodies past that many bytes too, e.g. large `create` and `write` batches.
+Odoo does not decode compressed requests by itself, see
+`odoo_api_wrapper.transport.PooledTransport`.
+```python
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", encode_threshold=1400
+)
+```
+
+### Run calls concurrently
+An `Api` is thread-safe, `call_many()` runs a batch of calls on its worker pool (see
+`max_workers`) and returns the results in order.
+```python
+partners, companies = api.call_many(
+    [
+        (odoo_api_wrapper.Operations.SEARCH_READ, 'res.partner', [[]]),
+        (odoo_api_wrapper.Operations.SEARCH_READ, 'res.company', [[]], {'limit': 5}),
+    ]
+)
+```
+
 ### List records
 Records can be listed and filtered via `search()`.
 ```python
@@ -51,6 +156,33 @@ of interest.
 api.fields_get('res.partner', [], {'attributes': ['string', 'help', 'type']})
 ```
 
+### Cache model metadata
+`fields_get()` results can be kept in a `odoo_api_wrapper.cache.MetadataCache`, shared
+between `Api` instances and optionally saved to disk so new processes start warm.
+```python
+from odoo_api_wrapper.cache import MetadataCache
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069",
+    "db",
+    "1001",
+    "password",
+    metadata_cache=MetadataCache(ttl=3600, path="fields.json"),
+)
+```
+
+### Cache records
+Reads can go through a `odoo_api_wrapper.cache.RecordCache`, only fetching the records
+and fields it misses. Writes and deletions made through the `Api` evict the records
+they touch.
+```python
+from odoo_api_wrapper.cache import RecordCache
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", record_cache=RecordCache()
+)
+```
+
 ### Search and read
 Because it is a very common task, Odoo provides a `search_read()` shortcut which, as
 its name suggests, is equivalent to a `search()` followed by a `read()`, but avoids
@@ -63,6 +195,72 @@ api.search_read(
 )
 ```
 
+### Iterate over large result sets
+`iter_search_read()` pages through the records matching a domain, `batch_size` at a
+time, filtering on `id > last id` rather than using an offset: memory stays flat and
+every page costs the same to the database however deep into the result set it is.
+```python
+for line in api.iter_search_read(
+    'account.move.line', [['parent_state', '=', 'posted']], ['debit', 'credit']
+):
+    ...
+```
+
+Pass `batched=True` to get the pages themselves.
+
+### Read, update or delete many records
+`read()`, `write()` and `unlink()` split their list of ids into calls of `chunk_size`
+ids when given one. The chunks run concurrently on the worker pool and the results are
+merged back in the order of the ids.
+```python
+records = api.read('res.partner', [ids], {'fields': ['name']}, chunk_size=1000)
+api.write('res.partner', [ids, {'active': False}], chunk_size=1000)
+```
+
+A failing chunk raises its `APIError`, the first in the order of the ids, once every
+chunk is done; chunks are separate calls, the ones that succeeded are not rolled back.
+
+### Read related records
+`prefetch` reads the records related to the results of `read()` or `search_read()` in
+one call per related model, and puts them in place of the many2one `[id, name]` pairs
+and x2many id lists.
+```python
+orders = api.search_read(
+    'sale.order',
+    [[['state', '=', 'sale']]],
+    {'fields': ['name', 'amount_total']},
+    prefetch={
+        'partner_id': ['name', 'vat'],
+        'order_line': ['product_id', 'product_uom_qty', 'price_subtotal'],
+    },
+)
+orders[0]['partner_id']['vat']
+```
+
+The related records are shared between the results referencing them. The relations
+are found with `fields_get()`, give the `Api` a metadata cache to spare that call.
+
+### Aggregate records
+`read_group()` has the database aggregate the records, only the groups cross the wire.
+`aggregate()` returns the aggregates of every group, keyed by the values grouped by,
+fetching the groups a page at a time, see `iter_read_group()`.
+```python
+totals = api.aggregate(
+    'account.move.line',
+    [['parent_state', '=', 'posted']],
+    ['debit:sum', 'credit:sum'],
+    ['partner_id', 'date:month'],
+)
+totals[(7, 'January 2024')]  # {'debit': 1250.0, 'credit': 0.0, '__count': 3}
+```
+
+### Search by name
+`name_search()` finds records whose display name matches, returning `[id, name]`
+pairs, as used by Odoo's many2one dropdowns.
+```python
+api.name_search('res.partner', ['Azure'], {'limit': 8})
+```
+
 ### Create records
 Records of a model are created using `create()`. The method creates a single record and
 returns its database identifier.
@@ -70,6 +268,17 @@ returns its database identifier.
 id = api.create('res.partner', [{'name': "New Partner"}])
 ```
 
+### Create many records
+`create_many()` sends the records `chunk_size` at a time (Odoo creates a list of
+records in one call), runs the chunks concurrently and returns the new ids in the order
+of the records.
+```python
+ids = api.create_many('res.partner', [{'name': name} for name in names])
+```
+
+Every chunk is attempted: when some fail, `odoo_api_wrapper.api.BulkCreateError` lists
+each failed chunk's error along with the ids created by the others.
+
 ### Update records
 Records can be updated using `write()`. It takes a list of records to update and a
 mapping of updated fields to values similar to `create()`.
@@ -84,12 +293,24 @@ api.unlink('res.partner', [[id]])
 ```
 
 """
+import concurrent.futures
+import contextlib
+import contextvars
 import enum
 import functools
+import http.client
 import socket
+import threading
+import time
 import typing as t
 import xmlrpc.client
 
+import odoo_api_wrapper.cache
+import odoo_api_wrapper.jsonrpc
+import odoo_api_wrapper.metrics
+import odoo_api_wrapper.resilience
+import odoo_api_wrapper.transport
+
 
 class Operations(enum.Enum):
     """Allowed API Operations"""
@@ -102,6 +323,34 @@ class Operations(enum.Enum):
     SEARCH_READ = "search_read"
     FIELDS_GET = "fields_get"
     UNLINK = "unlink"
+    READ_GROUP = "read_group"
+    NAME_SEARCH = "name_search"
+
+
+# operations taking a list of ids as their first argument, see `Api.call`'s chunk_size
+CHUNKABLE_OPERATIONS = frozenset(
+    (Operations.READ, Operations.WRITE, Operations.UNLINK),
+)
+
+# operations not changing any data, which can safely be sent more than once
+READ_ONLY_OPERATIONS = frozenset(
+    (
+        Operations.READ,
+        Operations.SEARCH,
+        Operations.SEARCH_COUNT,
+        Operations.SEARCH_READ,
+        Operations.FIELDS_GET,
+        Operations.READ_GROUP,
+        Operations.NAME_SEARCH,
+    ),
+)
+
+
+class Protocol(enum.Enum):
+    """Supported RPC protocols"""
+
+    XMLRPC = "xmlrpc"
+    JSONRPC = "jsonrpc"
 
 
 class APIError(Exception):
@@ -115,46 +364,575 @@ class APIError(Exception):
         return self.description
 
 
-class Api:  # pylint:disable=too-few-public-methods
-    """API Wrapper"""
-
-    # define the methods we'll add dynamically
-    write: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    create: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    read: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    search: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    search_count: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    search_read: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    fields_get: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-    unlink: t.Callable[[str, t.List, t.Dict[str, t.Any]], t.Any]
-
-    def __new__(cls, *args, **kwargs):  # pylint:disable=unused-argument
-        instance = super().__new__(cls)
-
-        # add the dynamic method
-        for operation in Operations.__members__.values():
-            setattr(
-                instance,
-                operation.value,
-                functools.partial(instance.call, operation),
+class APITimeoutError(APIError):
+    """A call timed out, or its deadline passed"""
+
+
+class CircuitOpenError(APIError):
+    """The circuit breaker refused a call, see
+    `odoo_api_wrapper.resilience.CircuitBreaker`"""
+
+
+class BulkCreateError(APIError):
+    """Some chunks of `Api.create_many` failed"""
+
+    def __init__(
+        self,
+        ids: t.List[t.Optional[int]],
+        errors: t.List[t.Tuple[int, APIError]],
+    ):
+        """
+        Args:
+            ids: the created ids in the order of the records, `None` for the records
+                of failed chunks
+            errors: `(index of the chunk's first record, error)` for each failed chunk
+        """
+        super().__init__(
+            f"{len(errors)} chunk(s) failed, first at record {errors[0][0]}: "
+            f"{errors[0][1]}"
+        )
+        self.ids = ids
+        self.errors = errors
+
+
+def chunks(items: t.Sequence[t.Any], size: int) -> t.List[t.Sequence[t.Any]]:
+    """Split `items` into consecutive slices of at most `size` items"""
+    if size < 1:
+        raise APIError("Invalid chunk size")
+
+    return [items[index : index + size] for index in range(0, len(items), size)]
+
+
+class OperationMethod:  # pylint:disable=too-few-public-methods
+    """An `Operations` member as a method, `api.search(...)` calling
+    `api.call(Operations.SEARCH, ...)`
+
+    Defined once on the class and bound on access, rather than built for each
+    instance. With `on_model`, the method is bound to a model's api and name instead,
+    `model.search(...)` calling `model.api.search(model.model_name, ...)`.
+    """
+
+    def __init__(self, operation: Operations, on_model: bool = False):
+        self.operation = operation
+        self.on_model = on_model
+
+    def __get__(self, instance: t.Any, owner: t.Any = None) -> t.Any:
+        if instance is None:
+            return self
+
+        if self.on_model:
+            return functools.partial(
+                getattr(instance.api, self.operation.value), instance.model_name
             )
 
-        return instance
+        return functools.partial(instance.call, self.operation)
+
+
+class _LazyServer:  # pylint:disable=too-few-public-methods
+    """The server proxy of an `Api`, created on first use
 
-    def __init__(self, base_url: str, db_name: str, uid: str, password: str):
+    The proxy replaces the descriptor in the instance's `__dict__`, racing threads may
+    each create one, harmlessly.
+    """
+
+    def __get__(self, instance: t.Any, owner: t.Any = None) -> t.Any:
+        if instance is None:
+            return self
+
+        server = instance.__dict__["server"] = instance.make_server()
+        return server
+
+
+class Api:  # pylint:disable=too-few-public-methods
+    """API Wrapper
+
+    An `Api` can be shared between threads as long as its transport is thread-safe,
+    which is the case of the default one.
+    """
+
+    # the operations, they all take `timeout` and `deadline` keyword arguments, `write`,
+    # `read` and `unlink` a `chunk_size` one, `read` and `search_read` a `prefetch` one
+    write = OperationMethod(Operations.WRITE)
+    create = OperationMethod(Operations.CREATE)
+    read = OperationMethod(Operations.READ)
+    search = OperationMethod(Operations.SEARCH)
+    search_count = OperationMethod(Operations.SEARCH_COUNT)
+    search_read = OperationMethod(Operations.SEARCH_READ)
+    fields_get = OperationMethod(Operations.FIELDS_GET)
+    unlink = OperationMethod(Operations.UNLINK)
+    read_group = OperationMethod(Operations.READ_GROUP)
+    name_search = OperationMethod(Operations.NAME_SEARCH)
+
+    # the `xmlrpc.client.ServerProxy`, or `odoo_api_wrapper.jsonrpc.JsonRpcProxy`
+    server = _LazyServer()
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        base_url: str,
+        db_name: str,
+        uid: str,
+        password: str,
+        transport: t.Optional[xmlrpc.client.Transport] = None,
+        max_workers: int = 10,
+        protocol: t.Union[Protocol, str] = Protocol.XMLRPC,
+        fast_decoder: bool = False,
+        metadata_cache: t.Optional[odoo_api_wrapper.cache.MetadataCache] = None,
+        record_cache: t.Optional[odoo_api_wrapper.cache.RecordCache] = None,
+        timeout: t.Optional[float] = 120.0,
+        retry: t.Optional[odoo_api_wrapper.resilience.RetryPolicy] = None,
+        circuit_breaker: t.Optional[odoo_api_wrapper.resilience.CircuitBreaker] = None,
+        hedging: t.Optional[odoo_api_wrapper.resilience.Hedger] = None,
+        metrics: t.Sequence[t.Any] = (),
+        encode_threshold: t.Optional[int] = None,
+    ):
+        """
+        Args:
+            base_url: the server url, e.g. `"http://localhost:8069"`
+            db_name: the database name
+            uid: the user id
+            password: the user password or api key
+            transport: the transport used by the `xmlrpc.client.ServerProxy`, defaults
+                to a thread-safe `odoo_api_wrapper.transport.PooledTransport`
+            max_workers: the number of concurrent calls made by `call_many`
+            protocol: the protocol used to reach the server, JSON-RPC requires a
+                `odoo_api_wrapper.transport.PooledTransport`
+            fast_decoder: decode XML-RPC responses with
+                `odoo_api_wrapper.decoder.FastDecoder` (default transport only)
+            metadata_cache: a cache `fields_get` results are served from
+            record_cache: a cache `read` results are served from, see
+                `odoo_api_wrapper.cache.RecordCache`
+            timeout: the number of seconds a call may take, `None` for no limit
+            retry: how read-only calls are retried, see
+                `odoo_api_wrapper.resilience`
+            circuit_breaker: a circuit breaker failing calls fast while the server is
+                unavailable
+            hedging: how slow read-only calls are hedged
+            metrics: sinks recording the metrics of each request, see
+                `odoo_api_wrapper.metrics`
+            encode_threshold: the size, in bytes, past which request bodies are gzip
+                compressed, `None` to never compress them (default transport only)
+        """
         self.base_url = base_url
         self.db_name = db_name
         self.uid = uid
         self.password = password
 
-        self.server = xmlrpc.client.ServerProxy(f"{self.base_url}/xmlrpc/2/object")
+        self.max_workers = max_workers
+        self.metadata_cache = metadata_cache
+        self.record_cache = record_cache
+        self.timeout = timeout
+        self.retry = retry
+        self.circuit_breaker = circuit_breaker
+        self.hedging = hedging
+        self.metrics = list(metrics)
+
+        if transport is None:
+            transport = odoo_api_wrapper.transport.from_url(
+                base_url,
+                pool_size=max_workers,
+                fast_decoder=fast_decoder,
+                encode_threshold=encode_threshold,
+            )
+        self.transport = transport
+
+        try:
+            self.protocol = Protocol(protocol)
+        except ValueError as error:
+            raise APIError("Invalid protocol") from error
+
+        if self.protocol is Protocol.JSONRPC and not isinstance(
+            transport, odoo_api_wrapper.transport.PooledTransport
+        ):
+            raise APIError("JSON-RPC requires a PooledTransport")
+
+        self._executor: t.Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._local = threading.local()
+        self._models: t.Dict[str, "odoo_api_wrapper.model.Model"] = {}
+
+    def __getitem__(self, model_name: str) -> "odoo_api_wrapper.model.Model":
+        """The `odoo_api_wrapper.model.Model` of `model_name`, created once
+
+        Models are shared, and so are their caches of field types and record classes.
+        """
+        model = self._models.get(model_name)
+        if model is None:
+            # pylint:disable=import-outside-toplevel
+            from odoo_api_wrapper.model import Model
+
+            model = self._models.setdefault(model_name, Model(self, model_name))
+
+        return model
+
+    def make_server(self) -> t.Any:
+        """Create the server proxy of the `protocol`"""
+        if self.protocol is Protocol.JSONRPC:
+            return odoo_api_wrapper.jsonrpc.JsonRpcProxy(
+                self.base_url,
+                transport=t.cast(
+                    odoo_api_wrapper.transport.PooledTransport, self.transport
+                ),
+            )
+
+        return xmlrpc.client.ServerProxy(
+            f"{self.base_url}/xmlrpc/2/object",
+            transport=self.transport,
+        )
+
+    def __enter__(self) -> "Api":
+        return self
+
+    def __exit__(self, *exc_info: t.Any):
+        self.close()
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """The worker pool running concurrent calls, created on first use"""
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers,
+                    thread_name_prefix="odoo-api",
+                    initializer=self._init_worker,
+                )
+
+        return self._executor
+
+    def _init_worker(self):
+        self._local.worker = True
+
+    def map(
+        self,
+        func: t.Callable[[t.Any], t.Any],
+        items: t.Iterable[t.Any],
+    ) -> t.List[t.Any]:
+        """Apply `func` to every item on the worker pool, keeping the items' order
+
+        Calls made from a worker run inline instead, a worker waiting for others would
+        otherwise be able to exhaust the pool. `func` runs in a copy of the caller's
+        context, and so within its deadline. The first error, in the items' order, is
+        raised once every item is done.
+
+        Args:
+            func: the function to call
+            items: the items to pass to `func`
+        """
+        if getattr(self._local, "worker", False):
+            return [func(item) for item in items]
+
+        context = contextvars.copy_context()
+        futures = [
+            self.executor.submit(context.copy().run, func, item) for item in items
+        ]
+        # nothing keeps running behind the caller's back once an item failed
+        concurrent.futures.wait(futures)
+        return [future.result() for future in futures]
+
+    def call_many(
+        self,
+        calls: t.Iterable[t.Sequence[t.Any]],
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.List[t.Any]:
+        """Run calls concurrently, at most `max_workers` at a time
+
+        Args:
+            calls: `(operation, model, args)` or `(operation, model, args, kwargs)`
+                tuples, as passed to `call`
+            timeout: the number of seconds all the calls may take (optional)
+            deadline: the `time.monotonic()` time by which all the calls must be done
+                (optional)
+
+        Returns the results in the order of `calls`, raises the first error once
+        every call is done.
+        """
+        with self.deadline(timeout, deadline):
+            return self.map(lambda call: self.call(*call), calls)
+
+    @contextlib.contextmanager
+    def deadline(
+        self,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterator[t.Optional[float]]:
+        """Give the calls made in the block a deadline
+
+        The deadline is the earliest of `deadline`, `timeout` seconds from now and the
+        current deadline, `timeout` defaults to the `Api`'s when neither is given.
+
+        Args:
+            timeout: the number of seconds the block may take (optional)
+            deadline: the `time.monotonic()` time by which the block must be done
+                (optional)
+
+        Yields the deadline, raises `odoo_api_wrapper.api.APITimeoutError` if it has
+        already passed.
+        """
+        token = odoo_api_wrapper.transport.DEADLINE.set(
+            self._deadline(timeout, deadline)
+        )
+        try:
+            yield odoo_api_wrapper.transport.DEADLINE.get()
+        finally:
+            odoo_api_wrapper.transport.DEADLINE.reset(token)
+
+    def _deadline(
+        self,
+        timeout: t.Optional[float],
+        deadline: t.Optional[float],
+    ) -> t.Optional[float]:
+        """Resolve a deadline, see `deadline`"""
+        if timeout is None and deadline is None:
+            timeout = self.timeout
+
+        now = time.monotonic()
+        candidates = [
+            value
+            for value in (
+                odoo_api_wrapper.transport.DEADLINE.get(),
+                deadline,
+                None if timeout is None else now + timeout,
+            )
+            if value is not None
+        ]
+        earliest = min(candidates) if candidates else None
+
+        if earliest is not None and earliest <= now:
+            raise APITimeoutError("Deadline exceeded")
+
+        return earliest
+
+    def iter_search_read(  # pylint:disable=too-many-arguments
+        self,
+        model: str,
+        domain: t.List,
+        fields: t.Optional[t.List[str]] = None,
+        batch_size: int = 1000,
+        batched: bool = False,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        after_id: int = 0,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterator[t.Any]:
+        """Iterate over the records matching `domain`, ordered by id
+
+        Pages are fetched with an `id > last id` condition rather than an offset, so
+        each page costs the same to the database.
+
+        Args:
+            model: the name of the model
+            domain: the search domain, e.g. `[['is_company', '=', True]]`
+            fields: the fields to read, defaults to all fields
+            batch_size: the number of records fetched per call
+            batched: yield lists of records rather than records
+            kwargs: other `search_read` parameters, e.g. `context`
+            after_id: start after this id, e.g. to resume an iteration
+            timeout: the number of seconds the whole iteration may take, from the
+                first page, each page has the `Api`'s timeout otherwise (optional)
+            deadline: the `time.monotonic()` time by which the whole iteration must be
+                done (optional)
+        """
+        if batch_size < 1:
+            raise APIError("Invalid batch size")
+
+        if timeout is not None or deadline is not None:
+            deadline = self._deadline(timeout, deadline)
+
+        kwargs = {**(kwargs or {}), "limit": batch_size, "order": "id"}
+        if fields is not None:
+            kwargs["fields"] = fields
+
+        last_id = after_id
+        while True:
+            records = self.search_read(
+                model,
+                [[*domain, ["id", ">", last_id]]],
+                kwargs,
+                deadline=deadline,
+            )
+
+            if records:
+                if batched:
+                    yield records
+                else:
+                    yield from records
+
+            if len(records) < batch_size:
+                return
+
+            last_id = records[-1]["id"]
+
+    def iter_read_group(  # pylint:disable=too-many-arguments
+        self,
+        model: str,
+        domain: t.List,
+        fields: t.List[str],
+        groupby: t.List[str],
+        page_size: int = 1000,
+        orderby: t.Optional[str] = None,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterator[t.Dict[str, t.Any]]:
+        """Iterate over the groups of the records matching `domain`
+
+        Groups are aggregated by the database and fetched `page_size` at a time,
+        grouped by every field of `groupby` at once (`lazy=False`), each one counting
+        its records in `__count`.
+
+        Args:
+            model: the name of the model
+            domain: the search domain, e.g. `[['is_company', '=', True]]`
+            fields: the aggregates, e.g. `['debit:sum', 'total:sum(credit)']`
+            groupby: the fields to group by, e.g. `['partner_id', 'date:month']`
+            page_size: the number of groups fetched per call
+            orderby: the order of the groups, defaults to the `groupby` fields so
+                pages don't overlap
+            kwargs: other `read_group` parameters, e.g. `context`
+            timeout: the number of seconds the whole iteration may take, from the
+                first page, each page has the `Api`'s timeout otherwise (optional)
+            deadline: the `time.monotonic()` time by which the whole iteration must be
+                done (optional)
+        """
+        if page_size < 1:
+            raise APIError("Invalid page size")
+
+        if timeout is not None or deadline is not None:
+            deadline = self._deadline(timeout, deadline)
+
+        kwargs = {
+            **(kwargs or {}),
+            "lazy": False,
+            "limit": page_size,
+            "orderby": orderby or ", ".join(spec.split(":")[0] for spec in groupby),
+        }
+
+        offset = 0
+        while True:
+            groups = self.read_group(
+                model,
+                [domain, fields, groupby],
+                {**kwargs, "offset": offset},
+                deadline=deadline,
+            )
+            yield from groups
+
+            if len(groups) < page_size:
+                return
+
+            offset += page_size
 
-    def call(
+    def aggregate(  # pylint:disable=too-many-arguments
+        self,
+        model: str,
+        domain: t.List,
+        fields: t.List[str],
+        groupby: t.List[str],
+        page_size: int = 1000,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Dict[t.Tuple[t.Any, ...], t.Dict[str, t.Any]]:
+        """Aggregate the records matching `domain`, by group
+
+        Returns the aggregates and the `__count` of each group, keyed by a tuple of
+        the group's `groupby` values, relational ones reduced to their id, e.g.
+        `{(7, 'January 2024'): {'debit': 1250.0, '__count': 3}}`.
+
+        See `odoo_api_wrapper.api.Api.iter_read_group`.
+        """
+        grouped = {spec.split(":")[0] for spec in groupby}
+        keys = [spec.split(":")[0] for spec in fields]
+        keys = [key for key in keys if key not in grouped]
+
+        return {
+            tuple(
+                group[spec][0] if isinstance(group[spec], list) else group[spec]
+                for spec in groupby
+            ): {
+                **{key: group[key] for key in keys if key in group},
+                "__count": group.get("__count"),
+            }
+            for group in self.iter_read_group(
+                model,
+                domain,
+                fields,
+                groupby,
+                page_size,
+                kwargs=kwargs,
+                timeout=timeout,
+                deadline=deadline,
+            )
+        }
+
+    def create_many(
+        self,
+        model: str,
+        records: t.Sequence[t.Dict[str, t.Any]],
+        chunk_size: int = 100,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.List[int]:
+        """Create records `chunk_size` at a time, chunks run concurrently
+
+        Args:
+            model: the name of the model
+            records: the values of each record to create
+            chunk_size: the number of records created per call
+            kwargs: other `create` parameters, e.g. `context`
+            timeout: the number of seconds all the chunks may take (optional)
+            deadline: the `time.monotonic()` time by which all the chunks must be
+                done (optional)
+
+        Returns the ids in the order of `records`, raises
+        `odoo_api_wrapper.api.BulkCreateError` once every chunk has run if any failed.
+        """
+
+        def _create(chunk: t.Sequence[t.Dict[str, t.Any]]) -> t.Any:
+            try:
+                return self.call(Operations.CREATE, model, [list(chunk)], kwargs)
+            except APIError as error:
+                return error
+
+        batches = chunks(records, chunk_size)
+        with self.deadline(timeout, deadline):
+            results = self.map(_create, batches)
+
+        ids: t.List[t.Optional[int]] = []
+        errors = []
+        for chunk, result in zip(batches, results):
+            if isinstance(result, APIError):
+                errors.append((len(ids), result))
+                ids.extend([None] * len(chunk))
+            else:
+                ids.extend(result)
+
+        if errors:
+            raise BulkCreateError(ids, errors)
+
+        return t.cast(t.List[int], ids)
+
+    def close(self):
+        """Shut down the worker pool and close the transport's connections"""
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
+
+        self.transport.close()
+
+    def call(  # pylint:disable=too-many-arguments
         self,
         operation: Operations,
         model: str,
         args: t.List,
-        kwargs: t.Dict[str, t.Any] = None,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        chunk_size: t.Optional[int] = None,
+        prefetch: t.Optional[t.Dict[str, t.List[str]]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
     ) -> t.Any:
         """Call the api with a model and an operation
 
@@ -163,12 +941,137 @@ class Api:  # pylint:disable=too-few-public-methods
             model: the name of the model
             args: a list of parameters passed by position
             kwargs: a dict of parameters to pass by keyword (optional)
+            chunk_size: split the ids of `read`, `write` and `unlink` into concurrent
+                calls of at most `chunk_size` ids (optional)
+            prefetch: the fields to read on the records related to the results of
+                `read` and `search_read`, by relational field (optional)
+            timeout: the number of seconds the call may take, defaults to the `Api`'s
+            deadline: the `time.monotonic()` time by which the call must be done,
+                within the current deadline in any case (optional)
         """
         if not isinstance(operation, Operations):
             raise APIError("Invalid operation")
 
         kwargs = kwargs if kwargs else {}
 
+        with self.deadline(timeout, deadline):
+            return self._dispatch(operation, model, args, kwargs, chunk_size, prefetch)
+
+    def _dispatch(  # pylint:disable=too-many-arguments
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+        chunk_size: t.Optional[int],
+        prefetch: t.Optional[t.Dict[str, t.List[str]]],
+    ) -> t.Any:
+        """Route a call to the helper handling it"""
+
+        if prefetch:
+            return self._call_prefetch(
+                operation, model, args, kwargs, chunk_size, prefetch
+            )
+
+        if chunk_size is not None:
+            return self._call_chunked(operation, model, args, kwargs, chunk_size)
+
+        if operation is Operations.FIELDS_GET and self.metadata_cache is not None:
+            return self._call_cached(model, args, kwargs)
+
+        if self.record_cache is not None:
+            return self._call_record_cache(operation, model, args, kwargs)
+
+        return self._execute(operation, model, args, kwargs)
+
+    def _execute(
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """Send a call to the server, applying the retry, circuit breaker and hedging
+        policies"""
+        breaker = self.circuit_breaker
+        read_only = operation in READ_ONLY_OPERATIONS
+
+        def _send() -> t.Any:
+            return self._send(operation, model, args, kwargs)
+
+        retries = 0
+        while True:
+            if breaker is not None and not breaker.allow():
+                raise CircuitOpenError("Circuit breaker open")
+
+            try:
+                if read_only and self.hedging is not None:
+                    result = self.hedging.run(_send)
+                else:
+                    result = _send()
+            except APIError as error:
+                cause = error.__cause__
+                if breaker is not None:
+                    breaker.record(odoo_api_wrapper.resilience.is_server_failure(cause))
+
+                if (
+                    not read_only
+                    or self.retry is None
+                    or retries >= self.retry.retries
+                    or not odoo_api_wrapper.resilience.is_retryable(cause)
+                ):
+                    raise
+
+                # don't wait for a retry that couldn't start before the deadline
+                delay = self.retry.delay(retries)
+                deadline = odoo_api_wrapper.transport.DEADLINE.get()
+                if deadline is not None and time.monotonic() + delay >= deadline:
+                    raise
+
+                time.sleep(delay)
+                retries += 1
+                continue
+
+            if breaker is not None:
+                breaker.record(False)
+
+            return result
+
+    def _send(
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """Send a call to the server, once, recording its metrics"""
+        if not self.metrics:
+            return self._request(operation, model, args, kwargs)
+
+        stats = odoo_api_wrapper.metrics.CallStats(operation.value, model)
+        token = odoo_api_wrapper.metrics.CURRENT.set(stats)
+        start = time.perf_counter()
+
+        try:
+            return self._request(operation, model, args, kwargs)
+        except APIError as error:
+            stats.error = odoo_api_wrapper.metrics.error_cause(error)
+            raise
+        finally:
+            stats.duration = time.perf_counter() - start
+            odoo_api_wrapper.metrics.CURRENT.reset(token)
+
+            for sink in self.metrics:
+                sink.record(stats)
+
+    def _request(
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """Send a call to the server, mapping errors to `APIError`"""
         try:
             return self.server.execute_kw(
                 self.db_name,
@@ -181,5 +1084,182 @@ class Api:  # pylint:disable=too-few-public-methods
             )
         except xmlrpc.client.Fault as error:
             raise APIError(error.faultString) from error
-        except socket.gaierror as error:
+        except socket.timeout as error:
+            raise APITimeoutError(f"Timed out: {error}") from error
+        except xmlrpc.client.ProtocolError as error:
+            raise APIError(f"HTTP {error.errcode} {error.errmsg}") from error
+        except (OSError, http.client.HTTPException) as error:
             raise APIError(str(error)) from error
+
+    def _call_cached(
+        self,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """`fields_get` through the metadata cache"""
+        cache = t.cast(odoo_api_wrapper.cache.MetadataCache, self.metadata_cache)
+        key = odoo_api_wrapper.cache.make_key(
+            self.base_url, self.db_name, self.uid, model, args, kwargs
+        )
+
+        value = cache.get(key)
+        if value is None:
+            value = self._execute(Operations.FIELDS_GET, model, args, kwargs)
+            cache.set(key, value)
+
+        return value
+
+    def _call_record_cache(
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Any:
+        """Serve `read` from the record cache, evict written and deleted records"""
+        cache = t.cast(odoo_api_wrapper.cache.RecordCache, self.record_cache)
+
+        ids = args[0] if args and isinstance(args[0], list) else args[:1]
+
+        if operation in (Operations.WRITE, Operations.UNLINK):
+            try:
+                return self._execute(operation, model, args, kwargs)
+            finally:
+                cache.invalidate(model, ids)
+
+        # other parameters, e.g. the context, may change the values
+        fields = kwargs.get("fields")
+        if (
+            operation is not Operations.READ
+            or len(args) != 1
+            or set(kwargs) != {"fields"}
+            or not isinstance(fields, list)
+            # all the fields
+            or not fields
+        ):
+            return self._execute(operation, model, args, kwargs)
+
+        found, missing_ids, missing_fields = cache.lookup(model, ids, fields)
+
+        if missing_ids:
+            records = self._execute(
+                operation, model, [missing_ids], {"fields": missing_fields}
+            )
+            merged = cache.update(model, records)
+
+            # the cached fields may have been evicted meanwhile, e.g. by a write
+            stale = [
+                id_
+                for id_, values in merged.items()
+                if any(field not in values for field in fields if field != "id")
+            ]
+            if stale:
+                records = self._execute(operation, model, [stale], {"fields": fields})
+                merged.update(cache.update(model, records))
+
+            for id_, values in merged.items():
+                found[id_] = {
+                    "id": id_,
+                    **{field: values[field] for field in fields if field != "id"},
+                }
+
+        return [found[id_] for id_ in ids if id_ in found]
+
+    def _call_prefetch(  # pylint:disable=too-many-arguments
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+        chunk_size: t.Optional[int],
+        prefetch: t.Dict[str, t.List[str]],
+    ) -> t.Any:
+        """Replace the relational values of the results with the related records"""
+        if operation not in (Operations.READ, Operations.SEARCH_READ):
+            raise APIError(f"{operation.value} can't prefetch")
+
+        relations = self.call(
+            Operations.FIELDS_GET,
+            model,
+            [],
+            {"allfields": sorted(prefetch), "attributes": ["type", "relation"]},
+        )
+        for field in prefetch:
+            if relations.get(field, {}).get("type") not in (
+                "many2one",
+                "one2many",
+                "many2many",
+            ):
+                raise APIError(f"{field} is not a relational field")
+
+        fields = kwargs.get("fields")
+        if fields:
+            missing = [field for field in prefetch if field not in fields]
+            kwargs = {**kwargs, "fields": [*fields, *missing]}
+
+        records = self.call(operation, model, args, kwargs, chunk_size)
+
+        # the ids and fields to read, by related model
+        reads: t.Dict[str, t.Tuple[t.Dict[int, None], t.Dict[str, None]]] = {}
+        for field, related_fields in prefetch.items():
+            relation = relations[field]
+            ids, names = reads.setdefault(relation["relation"], ({}, {}))
+            names.update(dict.fromkeys(related_fields))
+
+            for record in records:
+                value = record.get(field) or ()
+                if relation["type"] == "many2one":
+                    value = value[:1]
+                ids.update(dict.fromkeys(value))
+
+        def _read(item: t.Tuple[str, t.Any]) -> t.Tuple[str, t.Dict[int, t.Any]]:
+            related_model, (ids, names) = item
+            result = self.call(
+                Operations.READ,
+                related_model,
+                [list(ids)],
+                {"fields": list(names)},
+                chunk_size,
+            )
+            return related_model, {record["id"]: record for record in result}
+
+        related = dict(self.map(_read, [item for item in reads.items() if item[1][0]]))
+
+        for field in prefetch:
+            relation = relations[field]
+            by_id = related.get(relation["relation"], {})
+
+            for record in records:
+                value = record.get(field)
+                if relation["type"] == "many2one":
+                    record[field] = by_id.get(value[0], False) if value else False
+                else:
+                    record[field] = [by_id[id_] for id_ in value or () if id_ in by_id]
+
+        return records
+
+    def _call_chunked(  # pylint:disable=too-many-arguments
+        self,
+        operation: Operations,
+        model: str,
+        args: t.List,
+        kwargs: t.Dict[str, t.Any],
+        chunk_size: int,
+    ) -> t.Any:
+        """Run `operation` over chunks of the ids in `args[0]`, see `call`"""
+        if operation not in CHUNKABLE_OPERATIONS:
+            raise APIError(f"{operation.value} can't be chunked")
+
+        ids, *rest = args
+        results = self.map(
+            lambda chunk: self.call(operation, model, [chunk, *rest], kwargs),
+            chunks(ids, chunk_size),
+        )
+
+        if operation is not Operations.READ:
+            return all(results)
+
+        # keep the order of `ids`, whatever order the chunks came back in
+        records = {record["id"]: record for result in results for record in result}
+        return [records[id_] for id_ in ids if id_ in records]
@@ -0,0 +1,174 @@
+""" Write-behind buffer
+
+`odoo_api_wrapper.buffer.WriteBuffer` collects `write` calls and sends them as few
+calls as possible: successive updates of a record are merged into a single set of
+values, and the records ending up with the same values are written together. The
+command lists of x2many fields, e.g. `[(4, 7)]`, are appended to each other rather than
+replaced, so every command is sent.
+
+## Usage Examples
+
+### Buffer writes
+The pending writes are sent by `commit()`, when the buffer holds `max_records` records,
+or on a `write()` made more than `max_delay` seconds after the oldest pending one.
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.buffer import WriteBuffer
+
+api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
+
+with WriteBuffer(api, max_records=5000, max_delay=30) as buffer:
+    for partner in partners:
+        buffer.write("res.partner", [partner["id"]], {"active": False})
+        buffer.write("res.partner", [partner["id"]], {"comment": "archived"})
+```
+
+Leaving the `with` block commits the pending writes, or drops them when an exception
+was raised, as `rollback()` does.
+"""
+import threading
+import time
+import typing as t
+
+from odoo_api_wrapper.api import Api
+from odoo_api_wrapper.api import Operations
+
+
+def _is_commands(value: t.Any) -> bool:
+    """Whether `value` is a list of x2many commands, e.g. `[(4, 7), (3, 8)]`"""
+    return isinstance(value, (list, tuple)) and all(
+        isinstance(command, (list, tuple)) for command in value
+    )
+
+
+def _merge(record: t.Dict[str, t.Any], values: t.Dict[str, t.Any]):
+    """Update `record` with `values`, appending x2many commands to pending ones"""
+    for field, value in values.items():
+        pending = record.get(field, ())
+        if _is_commands(pending) and _is_commands(value):
+            record[field] = [*pending, *value]
+        else:
+            record[field] = value
+
+
+class WriteBuffer:
+    """Coalesce `write` calls
+
+    Args:
+        api: the api used to send the writes
+        max_records: commit once this many records have pending writes, `None` to
+            only commit explicitly
+        max_delay: commit on a `write()` made this many seconds after the oldest
+            pending one, `None` to disable
+        chunk_size: split the ids of the writes into chunks of this size, see
+            `odoo_api_wrapper.api.Api.call`
+    """
+
+    def __init__(
+        self,
+        api: Api,
+        max_records: t.Optional[int] = 1000,
+        max_delay: t.Optional[float] = None,
+        chunk_size: t.Optional[int] = None,
+    ):
+        self.api = api
+        self.max_records = max_records
+        self.max_delay = max_delay
+        self.chunk_size = chunk_size
+
+        # model -> record id -> merged values, in the order of the first writes
+        self._pending: t.Dict[str, t.Dict[int, t.Dict[str, t.Any]]] = {}
+        self._count = 0
+        self._since: t.Optional[float] = None
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "WriteBuffer":
+        return self
+
+    def __exit__(self, exc_type: t.Any, *exc_info: t.Any):
+        if exc_type is None:
+            self.commit()
+        else:
+            self.rollback()
+
+    def __len__(self) -> int:
+        """The number of records with pending writes"""
+        return self._count
+
+    def write(self, model: str, ids: t.Iterable[int], values: t.Dict[str, t.Any]):
+        """Add a write, merging it with the pending writes of the same records
+
+        Args:
+            model: the name of the model
+            ids: the ids of the records to update
+            values: the updated fields
+        """
+        with self._lock:
+            records = self._pending.setdefault(model, {})
+
+            for id_ in ids:
+                record = records.get(id_)
+                if record is None:
+                    records[id_] = dict(values)
+                    self._count += 1
+                else:
+                    _merge(record, values)
+
+            if self._since is None:
+                self._since = time.monotonic()
+
+            due = (
+                self.max_records is not None and self._count >= self.max_records
+            ) or (
+                self.max_delay is not None
+                and time.monotonic() - self._since >= self.max_delay
+            )
+
+        if due:
+            self.commit()
+
+    def _take(self) -> t.Dict[str, t.Dict[int, t.Dict[str, t.Any]]]:
+        """Empty the buffer, returning the pending writes"""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._count = 0
+            self._since = None
+
+        return pending
+
+    def commit(self) -> int:
+        """Send the pending writes, concurrently
+
+        Records with the same values are written in a single call. The buffer is
+        emptied before sending, the writes of a failed call are not retried.
+
+        Returns the number of `write` calls made.
+        """
+        calls: t.List[t.Tuple[str, t.List[t.Any]]] = []
+
+        for model, records in self._take().items():
+            # group the records by values
+            groups: t.Dict[str, t.Tuple[t.List[int], t.Dict[str, t.Any]]] = {}
+            for id_, values in records.items():
+                key = repr(sorted(values.items()))
+                groups.setdefault(key, ([], values))[0].append(id_)
+
+            calls.extend(
+                (model, [ids, values]) for ids, values in groups.values() if values
+            )
+
+        self.api.map(
+            lambda call: self.api.call(
+                Operations.WRITE,
+                call[0],
+                call[1],
+                chunk_size=self.chunk_size,
+            ),
+            calls,
+        )
+
+        return len(calls)
+
+    def rollback(self):
+        """Drop the pending writes"""
+        self._take()
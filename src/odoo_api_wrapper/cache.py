@@ -0,0 +1,302 @@
+""" Model metadata and record caches
+
+`odoo_api_wrapper.cache.MetadataCache` keeps `fields_get` results in memory, and
+optionally on disk, so processes asking for the same models' fields don't need a
+round trip each time.
+
+`odoo_api_wrapper.cache.RecordCache` keeps the field values of read records, so reading
+them again only fetches what is missing.
+
+## Usage Examples
+
+### Cache `fields_get`
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.cache import MetadataCache
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069",
+    "db",
+    "1001",
+    "password",
+    metadata_cache=MetadataCache(ttl=3600, path="/var/cache/odoo/fields.json"),
+)
+
+# only the first call reaches the server
+api.fields_get('res.partner', [], {'attributes': ['string', 'type']})
+api.fields_get('res.partner', [], {'attributes': ['type', 'string']})
+```
+
+A cache can be shared between `Api` instances, the server, database and user are part
+of the key.
+
+### Cache records
+```python
+from odoo_api_wrapper.cache import RecordCache
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069",
+    "db",
+    "1001",
+    "password",
+    record_cache=RecordCache(maxsize=10000),
+)
+
+api.read('res.partner', [[1, 2]], {'fields': ['name']})
+# only fetches `email` for 1 and 2, and both fields for 3
+api.read('res.partner', [[1, 2, 3]], {'fields': ['name', 'email']})
+```
+
+Only `read` calls with a list of `fields` and no other parameter are served from the
+cache. `write` and `unlink` calls made through the same `Api` evict the records they
+touch, changes made by anyone else are not seen until the records are evicted.
+"""
+import collections
+import copy
+import json
+import os
+import tempfile
+import threading
+import time
+import typing as t
+
+Key = t.Tuple[str, ...]
+RecordKey = t.Tuple[str, int]
+
+
+def make_key(  # pylint:disable=too-many-arguments
+    base_url: str,
+    db_name: str,
+    uid: t.Any,
+    model: str,
+    args: t.List,
+    kwargs: t.Dict[str, t.Any],
+) -> Key:
+    """Build the cache key of a `fields_get` call
+
+    The requested attributes are sorted, any other parameter (e.g. the context's
+    language) is part of the key as is.
+    """
+    kwargs = dict(kwargs)
+    attributes = ",".join(sorted(kwargs.pop("attributes", None) or ()))
+    others = json.dumps([args, kwargs], sort_keys=True, default=str)
+
+    return (base_url, db_name, str(uid), model, attributes, others)
+
+
+class MetadataCache:
+    """A thread-safe LRU cache with a time to live, optionally stored on disk
+
+    Args:
+        ttl: the number of seconds entries stay valid, `None` for no expiry
+        maxsize: the maximum number of entries, the least recently used ones are
+            evicted first
+        path: a JSON file the entries are loaded from, and saved to on change
+    """
+
+    def __init__(
+        self,
+        ttl: t.Optional[float] = 3600.0,
+        maxsize: int = 256,
+        path: t.Optional[str] = None,
+    ):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self.path = path
+
+        self.hits = 0
+        self.misses = 0
+
+        # key -> (stored at, as a unix timestamp to survive restarts, value)
+        self._entries: "collections.OrderedDict[Key, t.Tuple[float, t.Any]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+        if path is not None:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at >= self.ttl
+
+    def get(self, key: Key) -> t.Optional[t.Any]:
+        """Return a copy of the value stored for `key`, `None` if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is None or self._expired(entry[0]):
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+
+        return copy.deepcopy(entry[1])
+
+    def set(self, key: Key, value: t.Any):
+        """Store `value` for `key`, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.time(), copy.deepcopy(value))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+        if self.path is not None:
+            self.save()
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._entries.clear()
+
+        if self.path is not None:
+            self.save()
+
+    def load(self):
+        """Load the entries of `path`, a missing or unreadable file is ignored"""
+        try:
+            with open(t.cast(str, self.path), encoding="utf-8") as file:
+                entries = json.load(file)
+        except (OSError, ValueError):
+            return
+
+        with self._lock:
+            for key, stored_at, value in entries:
+                if not self._expired(stored_at):
+                    self._entries[tuple(key)] = (stored_at, value)
+
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def save(self):
+        """Write the entries to `path`, atomically"""
+        path = t.cast(str, self.path)
+
+        with self._lock:
+            entries = [
+                [list(key), stored_at, value]
+                for key, (stored_at, value) in self._entries.items()
+            ]
+
+        directory = os.path.dirname(os.path.abspath(path))
+        descriptor, temporary = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump(entries, file)
+            os.replace(temporary, path)
+        except BaseException:
+            os.unlink(temporary)
+            raise
+
+
+class RecordCache:
+    """A thread-safe LRU identity map of record field values, keyed by `(model, id)`
+
+    Args:
+        maxsize: the maximum number of records, the least recently used ones are
+            evicted first
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self.maxsize = maxsize
+
+        self.hits = 0
+        self.misses = 0
+
+        # (model, id) -> field -> value
+        self._records: "collections.OrderedDict[RecordKey, t.Dict[str, t.Any]]" = (
+            collections.OrderedDict()
+        )
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def lookup(
+        self,
+        model: str,
+        ids: t.Iterable[int],
+        fields: t.Iterable[str],
+    ) -> t.Tuple[t.Dict[int, t.Dict[str, t.Any]], t.List[int], t.List[str]]:
+        """Look records up
+
+        Returns the records having all of `fields`, as `read` would return them, the
+        ids of the other records, and the fields missing from any of them.
+        """
+        fields = [field for field in dict.fromkeys(fields) if field != "id"]
+        found = {}
+        missing_ids = []
+        missing_fields: t.Dict[str, None] = {}
+
+        with self._lock:
+            for id_ in dict.fromkeys(ids):
+                values = self._records.get((model, id_))
+
+                if values is not None:
+                    self._records.move_to_end((model, id_))
+                    missing = [field for field in fields if field not in values]
+
+                    if not missing:
+                        found[id_] = {
+                            "id": id_,
+                            **{field: copy.deepcopy(values[field]) for field in fields},
+                        }
+                        continue
+
+                    missing_fields.update(dict.fromkeys(missing))
+                else:
+                    missing_fields.update(dict.fromkeys(fields))
+
+                missing_ids.append(id_)
+
+            self.hits += len(found)
+            self.misses += len(missing_ids)
+
+        return found, missing_ids, list(missing_fields)
+
+    def update(
+        self,
+        model: str,
+        records: t.Iterable[t.Dict[str, t.Any]],
+    ) -> t.Dict[int, t.Dict[str, t.Any]]:
+        """Store the field values of `records`, as returned by `read`
+
+        Returns the records merged with the values already cached, by id.
+        """
+        merged = {}
+
+        with self._lock:
+            for record in records:
+                key = (model, record["id"])
+                values = self._records.setdefault(key, {})
+                values.update(
+                    (field, copy.deepcopy(value))
+                    for field, value in record.items()
+                    if field != "id"
+                )
+                self._records.move_to_end(key)
+                merged[record["id"]] = {"id": record["id"], **copy.deepcopy(values)}
+
+            while len(self._records) > self.maxsize:
+                self._records.popitem(last=False)
+
+        return merged
+
+    def invalidate(self, model: str, ids: t.Optional[t.Iterable[int]] = None):
+        """Evict records of `model`, all of them unless `ids` is given"""
+        with self._lock:
+            if ids is None:
+                ids = [id_ for name, id_ in self._records if name == model]
+
+            for id_ in ids:
+                self._records.pop((model, id_), None)
+
+    def clear(self):
+        """Evict every record"""
+        with self._lock:
+            self._records.clear()
@@ -0,0 +1,238 @@
+""" Record and replay transport
+
+`odoo_api_wrapper.cassette.CassetteTransport` records the raw responses a server
+returns, along with their latency, to a cassette file, and replays them later without
+any network. Replayed responses go through the same decoding as live ones, so runs
+against a cassette exercise everything but the network: pipelines can run end to end
+in CI on production-shaped payloads, and the wrapper's own CPU and memory costs can be
+profiled in isolation.
+
+## Usage Examples
+
+### Record
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.cassette import CassetteTransport
+
+transport = CassetteTransport("sync.cassette", mode="record", secrets=["password"])
+with odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", transport=transport
+) as api:
+    api.search_read('res.partner', [[]], {'fields': ['name']})
+```
+
+### Replay
+```python
+transport = CassetteTransport("sync.cassette", secrets=["another password"])
+with odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "another password", transport=transport
+) as api:
+    api.search_read('res.partner', [[]], {'fields': ['name']})
+```
+
+Pass `timing=True` to wait for each response as long as the server took to send it.
+
+## Cassettes
+
+A cassette is a gzip compressed JSON line per response. Requests are identified by a
+SHA-256 hash of their body with the `secrets` (passwords, API keys) removed first:
+neither the requests nor the secrets are stored, and replays match whatever the
+credentials. The `id` of JSON-RPC requests, a counter, is left out of the hash too, so
+they replay in any order. Only the `Content-Type` and `Content-Encoding` response
+headers are kept.
+
+The same request recorded several times is replayed in the recorded order, the last
+response repeating once they run out. A request missing from the cassette raises
+`odoo_api_wrapper.cassette.CassetteError`.
+"""
+import base64
+import enum
+import gzip
+import hashlib
+import html
+import http.client
+import io
+import json
+import threading
+import time
+import typing as t
+
+from odoo_api_wrapper.api import APIError
+from odoo_api_wrapper.transport import PooledTransport
+
+# the response headers kept, others may hold e.g. session cookies
+KEPT_HEADERS = ("Content-Type", "Content-Encoding")
+
+
+class Mode(enum.Enum):
+    """Cassette modes"""
+
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class CassetteError(APIError):
+    """A request is missing from the cassette"""
+
+
+class RecordedResponse(io.BytesIO):
+    """A recorded response, standing in for an `http.client.HTTPResponse`"""
+
+    def __init__(self, entry: t.Dict[str, t.Any]):
+        super().__init__(base64.b64decode(entry["body"]))
+        self.status: int = entry["status"]
+        self.reason: str = entry["reason"]
+        self.headers: t.Dict[str, str] = entry["headers"]
+
+    def getheader(self, name: str, default: t.Any = None) -> t.Any:
+        """Get a header, ignoring the case of its name"""
+        for header, value in self.headers.items():
+            if header.lower() == name.lower():
+                return value
+
+        return default
+
+    def getheaders(self) -> t.List[t.Tuple[str, str]]:
+        """Get the headers"""
+        return list(self.headers.items())
+
+
+class CassetteTransport(PooledTransport):
+    """A pooled transport recording responses to, or replaying them from, a cassette
+
+    Args:
+        path: the cassette file, truncated when recording
+        mode: `record` or `replay`
+        secrets: strings removed from the request bodies before they are hashed
+        timing: when replaying, wait for each response as long as it took to record
+        kwargs: passed on to `odoo_api_wrapper.transport.PooledTransport`
+    """
+
+    def __init__(
+        self,
+        path: str,
+        mode: t.Union[Mode, str] = Mode.REPLAY,
+        secrets: t.Iterable[str] = (),
+        timing: bool = False,
+        **kwargs: t.Any,
+    ):
+        super().__init__(**kwargs)
+
+        try:
+            self.mode = Mode(mode)
+        except ValueError as error:
+            raise APIError("Invalid cassette mode") from error
+
+        self.path = path
+        self.timing = timing
+
+        # the secrets as they appear in XML-RPC and JSON-RPC bodies
+        self._secrets = sorted(
+            {
+                form.encode()
+                for secret in secrets
+                if secret
+                for form in (secret, html.escape(secret), json.dumps(secret)[1:-1])
+            },
+            key=len,
+            reverse=True,
+        )
+
+        # key -> recorded responses, and the index of the next one to replay
+        self._entries: t.Dict[str, t.List[t.Dict[str, t.Any]]] = {}
+        self._positions: t.Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        if self.mode is Mode.RECORD:
+            with open(path, "wb"):
+                pass
+        else:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                for line in file:
+                    entry = json.loads(line)
+                    self._entries.setdefault(entry["key"], []).append(entry)
+
+    def key(self, handler: str, request_body: bytes) -> str:
+        """The key identifying a request"""
+        if request_body.startswith(b"{"):
+            payload = json.loads(request_body)
+            # the JSON-RPC id depends on the number of calls made before
+            payload.pop("id", None)
+            request_body = json.dumps(payload, sort_keys=True).encode()
+
+        for secret in self._secrets:
+            request_body = request_body.replace(secret, b"")
+
+        return hashlib.sha256(handler.encode() + b"\0" + request_body).hexdigest()
+
+    def pooled(
+        self,
+        host: str,
+        exchange: t.Callable[[http.client.HTTPConnection], t.Any],
+    ) -> t.Any:
+        if self.mode is Mode.REPLAY:
+            # replays need no connection
+            return exchange(t.cast(http.client.HTTPConnection, None))
+
+        return super().pooled(host, exchange)
+
+    def send_pooled_request(  # pylint:disable=too-many-arguments
+        self,
+        connection: http.client.HTTPConnection,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool,
+        content_type: str = "text/xml",
+    ) -> t.Any:
+        key = self.key(handler, request_body)
+
+        if self.mode is Mode.REPLAY:
+            return self.replay(key)
+
+        start = time.perf_counter()
+        response = super().send_pooled_request(
+            connection, host, handler, request_body, verbose, content_type
+        )
+        body = response.read()
+
+        entry = {
+            "key": key,
+            "status": response.status,
+            "reason": response.reason,
+            "headers": {
+                header: response.getheader(header)
+                for header in KEPT_HEADERS
+                if response.getheader(header) is not None
+            },
+            "latency": time.perf_counter() - start,
+            "body": base64.b64encode(body).decode("ascii"),
+        }
+        self.record(entry)
+
+        return RecordedResponse(entry)
+
+    def record(self, entry: t.Dict[str, t.Any]):
+        """Append a response to the cassette"""
+        line = json.dumps(entry) + "\n"
+
+        with self._lock:
+            # a gzip member per response, readable as one stream
+            with open(self.path, "ab") as file:
+                file.write(gzip.compress(line.encode()))
+
+    def replay(self, key: str) -> RecordedResponse:
+        """The next recorded response of a request"""
+        with self._lock:
+            entries = self._entries.get(key)
+            if not entries:
+                raise CassetteError(f"No recorded response for request {key}")
+
+            position = self._positions.get(key, 0)
+            self._positions[key] = position + 1
+            entry = entries[min(position, len(entries) - 1)]
+
+        if self.timing:
+            time.sleep(entry["latency"])
+
+        return RecordedResponse(entry)
@@ -0,0 +1,164 @@
+""" Columnar results
+
+`odoo_api_wrapper.columns.ColumnBuilder` turns `search_read` rows into one column per
+field: numeric, boolean, date and datetime fields are packed into `array.array`
+buffers, or NumPy arrays when NumPy is installed, and many2one fields are split into
+an id column and a name column.
+
+## Usage Examples
+
+### Read columns
+```python
+import odoo_api_wrapper
+
+api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
+lines = odoo_api_wrapper.Model(api, "account.move.line")
+
+columns = lines.search_read_columns(
+    [['parent_state', '=', 'posted']], ['debit', 'date', 'partner_id']
+)
+columns['debit'].sum()
+columns['partner_id']  # the partners' ids, 0 when empty
+columns['partner_id_name']  # the partners' names, `None` when empty
+```
+
+## Column types
+
+| field type | `array.array` | NumPy |
+|---|---|---|
+| `integer`, `many2one` id | `q`, 0 when empty | `int64` |
+| `float`, `monetary` | `d`, NaN when empty | `float64` |
+| `boolean` | `b` | `bool` |
+| `date` | `q`, days since 1970-01-01 | `datetime64[D]` |
+| `datetime` | `q`, seconds since 1970-01-01 UTC | `datetime64[s]` |
+| others | `list` | `list` |
+
+Empty dates and datetimes are `NAT`, NumPy's not-a-time value.
+"""
+import array
+import datetime
+import typing as t
+
+from odoo_api_wrapper.api import APIError
+
+try:
+    import numpy
+except ImportError:  # pragma: no cover
+    numpy = None  # type: ignore[assignment]
+
+# the integer NumPy uses for `NaT`
+NAT = -(2**63)
+
+_EPOCH = datetime.date(1970, 1, 1).toordinal()
+
+
+def _date(value: t.Any) -> int:
+    if not value:
+        return NAT
+
+    return datetime.date.fromisoformat(value[:10]).toordinal() - _EPOCH
+
+
+def _datetime(value: t.Any) -> int:
+    if not value:
+        return NAT
+
+    moment = datetime.datetime.fromisoformat(value)
+    return (
+        (moment.toordinal() - _EPOCH) * 86400
+        + moment.hour * 3600
+        + moment.minute * 60
+        + moment.second
+    )
+
+
+def _integer(value: t.Any) -> int:
+    return value or 0
+
+
+def _float(value: t.Any) -> float:
+    return float("nan") if value is False else value
+
+
+def _many2one_id(value: t.Any) -> int:
+    return value[0] if value else 0
+
+
+def _many2one_name(value: t.Any) -> t.Optional[str]:
+    return value[1] if value else None
+
+
+def _raw(value: t.Any) -> t.Any:
+    return value
+
+
+# field type -> (array type code, NumPy dtype, value converter)
+_PACKED: t.Dict[str, t.Tuple[str, str, t.Callable[[t.Any], t.Any]]] = {
+    "integer": ("q", "int64", _integer),
+    "float": ("d", "float64", _float),
+    "monetary": ("d", "float64", _float),
+    "boolean": ("b", "bool", bool),
+    "date": ("q", "datetime64[D]", _date),
+    "datetime": ("q", "datetime64[s]", _datetime),
+}
+
+# array type code -> the NumPy dtype of its buffer
+_BUFFER_DTYPES = {"q": "int64", "d": "float64", "b": "int8"}
+
+
+class ColumnBuilder:
+    """Accumulate `search_read` rows into columns
+
+    Args:
+        types: the type of each field, as given by `fields_get`, the columns follow
+            its order
+        use_numpy: return NumPy arrays, defaults to whether NumPy is installed
+    """
+
+    def __init__(self, types: t.Dict[str, str], use_numpy: t.Optional[bool] = None):
+        if use_numpy is None:
+            use_numpy = numpy is not None
+        elif use_numpy and numpy is None:  # pragma: no cover
+            raise APIError("NumPy is not installed")
+
+        self.use_numpy = use_numpy
+
+        # (column name, field, packed type or `None`, converter)
+        self._columns: t.List[
+            t.Tuple[str, str, t.Optional[t.Tuple[str, str]], t.Callable]
+        ] = []
+        for field, type_ in types.items():
+            if type_ == "many2one":
+                self._columns.append((field, field, ("q", "int64"), _many2one_id))
+                self._columns.append((f"{field}_name", field, None, _many2one_name))
+            elif type_ in _PACKED:
+                code, dtype, converter = _PACKED[type_]
+                self._columns.append((field, field, (code, dtype), converter))
+            else:
+                self._columns.append((field, field, None, _raw))
+
+        self._data: t.List[t.Any] = [
+            array.array(packed[0]) if packed else []
+            for _, _, packed, _ in self._columns
+        ]
+
+    def extend(self, rows: t.Iterable[t.Dict[str, t.Any]]):
+        """Append `rows` to the columns"""
+        rows = list(rows)
+
+        for (_, field, _, converter), data in zip(self._columns, self._data):
+            data.extend([converter(row[field]) for row in rows])
+
+    def build(self) -> t.Dict[str, t.Any]:
+        """Return the columns, by name"""
+        columns = {}
+
+        for (name, _, packed, _), data in zip(self._columns, self._data):
+            if packed and self.use_numpy:
+                code, dtype = packed
+                # `frombuffer` shares the array's memory rather than copying it
+                data = numpy.frombuffer(data, dtype=_BUFFER_DTYPES[code]).view(dtype)
+
+            columns[name] = data
+
+        return columns
@@ -0,0 +1,229 @@
+""" Fast XML-RPC response decoder
+
+`odoo_api_wrapper.decoder.FastDecoder` is a drop-in replacement for the
+`xmlrpc.client` parser/unmarshaller pair. It is fed straight from expat and builds the
+result's lists and dicts as elements close, instead of going through the intermediate
+stack of `xmlrpc.client.Unmarshaller`. Struct member names, i.e. field names in
+`search_read` results, are interned so each row shares the same key strings.
+
+`dateTime.iso8601` values are left as the ISO 8601 strings they were sent as, and only
+converted, to `datetime.datetime` rather than `xmlrpc.client.DateTime`, when
+`use_datetime` is set.
+
+## Usage Examples
+
+### Enable the fast decoder
+```python
+import odoo_api_wrapper
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", fast_decoder=True
+)
+```
+
+### Decode a response
+```python
+from odoo_api_wrapper.decoder import loads
+
+loads(body)
+```
+"""
+import base64
+import datetime
+import sys
+import typing as t
+import xmlrpc.client
+from xml.parsers import expat
+
+# returned for elements that don't hold a value
+_SKIP = object()
+
+
+def parse_datetime(value: str) -> datetime.datetime:
+    """Parse an XML-RPC `dateTime.iso8601` value"""
+    value = value.strip()
+
+    # the common `YYYYMMDDTHH:MM:SS` form, without going through strptime
+    if len(value) == 17 and value[8] == "T":
+        return datetime.datetime(
+            int(value[0:4]),
+            int(value[4:6]),
+            int(value[6:8]),
+            int(value[9:11]),
+            int(value[12:14]),
+            int(value[15:17]),
+        )
+
+    return datetime.datetime.fromisoformat(value)
+
+
+class FastDecoder:  # pylint:disable=too-many-instance-attributes
+    """Streaming XML-RPC response decoder
+
+    It plays the roles of both the parser and the unmarshaller returned by
+    `xmlrpc.client.getparser`: feed it data, then `close()` it to get the response
+    tuple.
+
+    The expat handlers are closures over local state: attribute lookups and
+    per-element method dispatch are what makes `xmlrpc.client.Unmarshaller` slow.
+
+    Args:
+        use_datetime: decode `dateTime.iso8601` values to `datetime.datetime`
+        use_builtin_types: decode `base64` values to `bytes` rather than
+            `xmlrpc.client.Binary`
+    """
+
+    def __init__(self, use_datetime: bool = False, use_builtin_types: bool = False):
+        self.use_datetime = use_datetime or use_builtin_types
+        self.use_builtin_types = use_builtin_types
+
+        self._params: t.List[t.Any] = []
+        self._type: t.Optional[str] = None
+        self._result: t.Optional[t.Tuple[t.Any, ...]] = None
+        # open arrays and structs
+        self._containers: t.List[t.Any] = []
+
+        self._parser = expat.ParserCreate()
+        self._parser.buffer_text = True
+        self._set_handlers()
+
+    def _set_handlers(self):  # pylint:disable=too-many-statements
+        params = self._params
+        containers = self._containers
+        # the current member name of each open struct
+        names: t.List[str] = []
+        intern = sys.intern
+        decode_other = self._decode_other
+        skip = _SKIP
+
+        text = ""
+        typed = False
+
+        def start(tag: str, attrs: t.Any):  # pylint:disable=unused-argument
+            nonlocal text, typed
+            text = ""
+            if tag == "value":
+                typed = False
+            elif tag == "struct":
+                containers.append({})
+                names.append("")
+            elif tag == "array":
+                containers.append([])
+
+        def characters(data: str):
+            nonlocal text
+            text += data
+
+        def end(tag: str):  # pylint:disable=too-many-branches
+            nonlocal typed
+
+            # most frequent tags first
+            if tag == "value":
+                # a value without a type element is a string
+                if typed:
+                    return
+                value: t.Any = text
+            elif tag == "string":
+                value = text
+            elif tag == "name":
+                names[-1] = intern(text)
+                return
+            elif tag in ("int", "i4"):
+                value = int(text)
+            elif tag in ("member", "data", "param"):
+                return
+            elif tag == "struct":
+                names.pop()
+                value = containers.pop()
+            elif tag == "array":
+                value = containers.pop()
+            elif tag == "boolean":
+                if text not in ("0", "1"):
+                    raise TypeError("bad boolean value")
+                value = text == "1"
+            elif tag == "double":
+                value = float(text)
+            elif tag == "nil":
+                value = None
+            else:
+                value = decode_other(tag, text)
+                if value is skip:
+                    return
+
+            typed = True
+            if not containers:
+                params.append(value)
+            elif containers[-1].__class__ is dict:
+                containers[-1][names[-1]] = value
+            else:
+                containers[-1].append(value)
+
+        self._parser.StartElementHandler = start
+        self._parser.EndElementHandler = end
+        self._parser.CharacterDataHandler = characters
+
+    def _decode_other(self, tag: str, text: str) -> t.Any:
+        """Decode the less common elements"""
+        tag = tag.rpartition(":")[2]
+
+        if tag in ("i8", "i1", "i2", "biginteger"):
+            return int(text)
+        if tag == "nil":
+            return None
+        if tag == "dateTime.iso8601":
+            return parse_datetime(text) if self.use_datetime else text
+        if tag == "base64":
+            value = base64.decodebytes(text.encode("ascii"))
+            return value if self.use_builtin_types else xmlrpc.client.Binary(value)
+        if tag in ("params", "fault"):
+            self._type = tag
+
+        return _SKIP
+
+    def feed(self, data: bytes):
+        """Parse a chunk of the response"""
+        self._parser.Parse(data, False)
+
+    def close(self) -> t.Tuple[t.Any, ...]:
+        """Finish parsing and return the response parameters
+
+        Raises `xmlrpc.client.Fault` when the response is a fault.
+        """
+        if self._result is None:
+            self._parser.Parse(b"", True)
+
+            if self._type is None or self._containers:
+                raise xmlrpc.client.ResponseError()
+
+            self._result = tuple(self._params)
+
+        if self._type == "fault":
+            raise xmlrpc.client.Fault(**self._result[0])
+
+        return self._result
+
+
+def getparser(
+    use_datetime: bool = False,
+    use_builtin_types: bool = False,
+) -> t.Tuple[FastDecoder, FastDecoder]:
+    """`xmlrpc.client.getparser` counterpart returning a `FastDecoder`"""
+    decoder = FastDecoder(use_datetime, use_builtin_types)
+    return decoder, decoder
+
+
+def loads(
+    data: t.Union[bytes, str],
+    use_datetime: bool = False,
+    use_builtin_types: bool = False,
+) -> t.Tuple[t.Any, ...]:
+    """Decode a whole XML-RPC response
+
+    Args:
+        data: the response body
+        use_datetime: decode `dateTime.iso8601` values to `datetime.datetime`
+        use_builtin_types: decode `base64` values to `bytes`
+    """
+    decoder = FastDecoder(use_datetime, use_builtin_types)
+    decoder.feed(data.encode() if isinstance(data, str) else data)
+    return decoder.close()
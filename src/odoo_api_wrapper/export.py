@@ -0,0 +1,217 @@
+""" Streaming export
+
+`odoo_api_wrapper.export.export` writes the records matching a domain to a JSON lines
+or CSV file, one `search_read` page at a time, so memory stays bounded whatever the
+size of the model.
+
+## Usage Examples
+
+### Export to a file
+```python
+import odoo_api_wrapper
+
+api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
+lines = odoo_api_wrapper.Model(api, "account.move.line")
+
+lines.export([], ['name', 'debit', 'partner_id'], "lines.jsonl.gz")
+```
+
+Paths ending with `.gz` are gzip compressed.
+
+### Resume an export
+After each page, the last exported id and the size of the file are saved to
+`<path>.checkpoint`. An export started again with the checkpoint present truncates the
+file to the saved size and carries on after the saved id. The checkpoint is removed
+once the export completes, exporting other fields, to another format or with another
+compression, with another domain or other `kwargs` while it exists raises
+`odoo_api_wrapper.APIError`, as does a missing file.
+
+## Formats
+
+- `jsonl`: one JSON object per record, as returned by `search_read`
+- `csv`: a header row then one row per record. A many2one field gives an id column and
+  a `<field>_name` column, as `odoo_api_wrapper.columns` does, other relational fields
+  are JSON lists, and `False` is empty for fields other than booleans.
+"""
+import csv
+import enum
+import gzip
+import io
+import json
+import os
+import tempfile
+import typing as t
+
+import odoo_api_wrapper
+from odoo_api_wrapper.api import APIError
+
+
+class Format(enum.Enum):
+    """Export file formats"""
+
+    JSONL = "jsonl"
+    CSV = "csv"
+
+
+def _jsonl(rows: t.List[t.Dict[str, t.Any]], *_: t.Any) -> str:
+    return "".join(json.dumps(row, default=str) + "\n" for row in rows)
+
+
+def _csv_row(row: t.Dict[str, t.Any], types: t.Dict[str, t.Any]) -> t.List[t.Any]:
+    values: t.List[t.Any] = []
+
+    for field, type_ in types.items():
+        value = row[field]
+
+        if type_ == "many2one":
+            values.extend(value or ("", ""))
+        elif type_ == "boolean":
+            values.append(value)
+        elif value is False:
+            values.append("")
+        elif isinstance(value, (list, dict)):
+            values.append(json.dumps(value))
+        else:
+            values.append(value)
+
+    return values
+
+
+def _csv(
+    rows: t.List[t.Dict[str, t.Any]],
+    types: t.Dict[str, t.Any],
+    header: bool,
+) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    if header:
+        writer.writerow(
+            name
+            for field, type_ in types.items()
+            for name in ((field, f"{field}_name") if type_ == "many2one" else (field,))
+        )
+
+    writer.writerows(_csv_row(row, types) for row in rows)
+    return buffer.getvalue()
+
+
+_ENCODERS = {Format.JSONL: _jsonl, Format.CSV: _csv}
+
+
+def _save_checkpoint(path: str, checkpoint: t.Dict[str, t.Any]):
+    """Write the checkpoint atomically"""
+    descriptor, temporary = tempfile.mkstemp(
+        dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp"
+    )
+    with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+        json.dump(checkpoint, file)
+
+    os.replace(temporary, path)
+
+
+def export(  # pylint:disable=too-many-arguments,too-many-locals
+    model: "odoo_api_wrapper.Model",
+    domain: t.List,
+    fields: t.List[str],
+    path: str,
+    format: t.Union[Format, str] = Format.JSONL,  # pylint:disable=redefined-builtin
+    compress: t.Optional[bool] = None,
+    batch_size: int = 1000,
+    kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+) -> int:
+    """Write the records matching `domain` to `path`, ordered by id
+
+    Args:
+        model: the model to export
+        domain: the search domain
+        fields: the fields to export, `id` is always exported first
+        path: the file to write
+        format: `jsonl` or `csv`
+        compress: gzip the file, defaults to whether `path` ends with `.gz`
+        batch_size: the number of records fetched per call, and written at a time
+        kwargs: other `search_read` parameters, e.g. `context`
+
+    Returns the number of records in the file.
+    """
+    try:
+        format = Format(format)
+    except ValueError as error:
+        raise APIError("Invalid export format") from error
+
+    if compress is None:
+        compress = path.endswith(".gz")
+
+    field_types = model.field_types()
+    unknown = [field for field in fields if field not in field_types]
+    if unknown:
+        raise APIError(f"Unknown fields: {', '.join(unknown)}")
+
+    fields = [field for field in fields if field != "id"]
+    types = {field: field_types[field] for field in ["id", *fields]}
+    encode = _ENCODERS[format]
+
+    # what the checkpoint must match to be resumed, as it is saved
+    export_id = json.loads(
+        json.dumps(
+            {
+                "model": model.model_name,
+                "domain": domain,
+                "kwargs": kwargs or {},
+                "fields": fields,
+                "format": format.value,
+                "compress": compress,
+            }
+        )
+    )
+
+    checkpoint_path = f"{path}.checkpoint"
+    try:
+        with open(checkpoint_path, encoding="utf-8") as file:
+            checkpoint = json.load(file)
+    except FileNotFoundError:
+        checkpoint = {**export_id, "last_id": 0, "offset": 0, "count": 0}
+
+    if {key: checkpoint.get(key) for key in export_id} != export_id:
+        raise APIError(f"{checkpoint_path} belongs to another export")
+    if checkpoint["offset"] and not os.path.exists(path):
+        raise APIError(f"{path} is missing, remove {checkpoint_path} to start over")
+
+    with open(path, "r+b" if checkpoint["offset"] else "wb") as output:
+        # drop what was written after the checkpoint
+        output.truncate(checkpoint["offset"])
+        output.seek(checkpoint["offset"])
+
+        def _write(text: str):
+            data = text.encode()
+            # a gzip member per page, so the file can be truncated between pages
+            output.write(gzip.compress(data) if compress else data)
+            output.flush()
+
+        for rows in model.api.iter_search_read(
+            model.model_name,
+            domain,
+            fields,
+            batch_size,
+            True,
+            kwargs,
+            checkpoint["last_id"],
+        ):
+            _write(encode(rows, types, not checkpoint["offset"]))
+
+            checkpoint = {
+                **export_id,
+                "last_id": rows[-1]["id"],
+                "offset": output.tell(),
+                "count": checkpoint["count"] + len(rows),
+            }
+            _save_checkpoint(checkpoint_path, checkpoint)
+
+        # the header of an empty csv export
+        if not checkpoint["offset"] and format is Format.CSV:
+            _write(encode([], types, True))
+
+    if os.path.exists(checkpoint_path):
+        os.unlink(checkpoint_path)
+
+    return checkpoint["count"]
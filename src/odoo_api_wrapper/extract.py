@@ -0,0 +1,157 @@
+""" Parallel bulk extraction
+
+Decoding large responses keeps a core busy, and the GIL keeps threads from decoding
+in parallel. `odoo_api_wrapper.extract.extract` splits the ids matching a domain into
+ranges, and has a pool of processes, each with its own `Api`, fetch and decode them.
+
+## Usage Examples
+
+### Extract a model
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.extract import extract
+
+api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
+
+for records in extract(api, "account.move.line", [], ["debit", "credit"], workers=16):
+    ...
+```
+
+Each worker returns a whole range of records, split the ids into more ranges with
+`ranges_per_worker` to hold fewer records at a time. Run the extraction from a
+`if __name__ == "__main__":` block when processes are spawned rather than forked.
+"""
+import concurrent.futures
+import functools
+import os
+import threading
+import typing as t
+
+from odoo_api_wrapper.api import Api
+from odoo_api_wrapper.api import Operations
+
+# the workers' apis, by configuration
+_APIS: t.Dict[t.Tuple[t.Tuple[str, t.Any], ...], Api] = {}
+_APIS_LOCK = threading.Lock()
+
+
+def split_ids(
+    api: Api,
+    model: str,
+    domain: t.List,
+    parts: int,
+) -> t.List[t.Tuple[int, int]]:
+    """Split the ids matching `domain` into `parts` ranges of about the same size
+
+    Returns `(low, high)` ranges, holding the ids greater than `low` up to `high`.
+    """
+    count = api.search_count(model, [domain], {})
+    if not count:
+        return []
+
+    parts = min(parts, count)
+    calls: t.List[t.Sequence[t.Any]] = [
+        (
+            Operations.SEARCH,
+            model,
+            [domain],
+            {"offset": index * count // parts - 1, "limit": 1, "order": "id"},
+        )
+        for index in range(1, parts)
+    ]
+    calls.append((Operations.SEARCH, model, [domain], {"limit": 1, "order": "id desc"}))
+
+    bounds = [0, *(ids[0] for ids in api.call_many(calls) if ids)]
+    return list(zip(bounds, bounds[1:]))
+
+
+def _worker_api(config: t.Dict[str, t.Any]) -> Api:
+    """The api of the current process for `config`, created on first use"""
+    key = tuple(sorted(config.items()))
+
+    with _APIS_LOCK:
+        api = _APIS.get(key)
+        if api is None:
+            api = _APIS[key] = Api(**config, max_workers=1)
+
+    return api
+
+
+def _extract_range(  # pylint:disable=too-many-arguments
+    config: t.Dict[str, t.Any],
+    model: str,
+    domain: t.List,
+    fields: t.Optional[t.List[str]],
+    batch_size: int,
+    kwargs: t.Optional[t.Dict[str, t.Any]],
+    bounds: t.Tuple[int, int],
+) -> t.List[t.Dict[str, t.Any]]:
+    """Read the records of a range of ids, in a worker"""
+    low, high = bounds
+    records: t.List[t.Dict[str, t.Any]] = []
+
+    for batch in _worker_api(config).iter_search_read(
+        model,
+        [*domain, ["id", "<=", high]],
+        fields,
+        batch_size,
+        True,
+        kwargs,
+        low,
+    ):
+        records.extend(batch)
+
+    return records
+
+
+def extract(  # pylint:disable=too-many-arguments,too-many-locals
+    api: Api,
+    model: str,
+    domain: t.List,
+    fields: t.Optional[t.List[str]] = None,
+    workers: t.Optional[int] = None,
+    ranges_per_worker: int = 4,
+    batch_size: int = 1000,
+    kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    executor: t.Optional[concurrent.futures.Executor] = None,
+    mp_context: t.Optional[t.Any] = None,
+) -> t.Iterator[t.List[t.Dict[str, t.Any]]]:
+    """Read the records matching `domain` on a pool of processes
+
+    Args:
+        api: the api used to split the ids, its settings are used by the workers
+        model: the name of the model
+        domain: the search domain
+        fields: the fields to read, defaults to all fields
+        workers: the number of processes, defaults to the number of CPUs
+        ranges_per_worker: the number of id ranges per worker
+        batch_size: the number of records the workers fetch per call
+        kwargs: other `search_read` parameters, e.g. `context`
+        executor: the pool to run the workers on, defaults to a
+            `concurrent.futures.ProcessPoolExecutor` of `workers` processes
+        mp_context: the `multiprocessing` context of the default pool, e.g.
+            `multiprocessing.get_context("spawn")`
+
+    Yields the records of each id range, in the order of the ids.
+    """
+    workers = workers or os.cpu_count() or 1
+    ranges = split_ids(api, model, domain, workers * ranges_per_worker)
+
+    config = {
+        "base_url": api.base_url,
+        "db_name": api.db_name,
+        "uid": api.uid,
+        "password": api.password,
+        "protocol": api.protocol.value,
+        "fast_decoder": getattr(api.transport, "fast_decoder", False),
+    }
+    extract_range = functools.partial(
+        _extract_range, config, model, domain, fields, batch_size, kwargs
+    )
+
+    if executor is not None:
+        yield from executor.map(extract_range, ranges)
+        return
+
+    with concurrent.futures.ProcessPoolExecutor(workers, mp_context) as pool:
+        yield from pool.map(extract_range, ranges)
@@ -0,0 +1,126 @@
+""" JSON-RPC backend
+
+Odoo also serves its external API on `/jsonrpc`. JSON is more compact than XML-RPC's
+markup and much cheaper to decode, which matters for large `search_read` results.
+
+`odoo_api_wrapper.jsonrpc.JsonRpcProxy` stands in for `xmlrpc.client.ServerProxy`, it is
+what `odoo_api_wrapper.api.Api` uses when created with
+`protocol=odoo_api_wrapper.Protocol.JSONRPC`. Requests go through the connection pools
+of an `odoo_api_wrapper.transport.PooledTransport`, and errors returned by the server
+raise `xmlrpc.client.Fault` so they end up as `odoo_api_wrapper.api.APIError` exactly as
+with XML-RPC.
+
+## Usage Examples
+
+### Instantiate an `Api` using JSON-RPC
+```python
+import odoo_api_wrapper
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", protocol="jsonrpc"
+)
+```
+"""
+import gzip
+import itertools
+import json
+import typing as t
+import urllib.parse
+import xmlrpc.client
+
+import odoo_api_wrapper.metrics
+from odoo_api_wrapper.transport import from_url
+from odoo_api_wrapper.transport import PooledTransport
+
+
+class JsonRpcProxy:
+    """`xmlrpc.client.ServerProxy` look-alike for Odoo's `/jsonrpc` endpoint"""
+
+    def __init__(
+        self,
+        url: str,
+        transport: t.Optional[PooledTransport] = None,
+        service: str = "object",
+    ):
+        """
+        Args:
+            url: the server url, e.g. `"http://localhost:8069"`
+            transport: the transport providing the connections (optional)
+            service: the Odoo service to call
+        """
+        parts = urllib.parse.urlsplit(url)
+
+        self.host = parts.netloc
+        self.handler = f"{parts.path}/jsonrpc"
+        self.service = service
+        self.transport = transport if transport is not None else from_url(url)
+
+        self._ids = itertools.count(1)
+
+    def execute_kw(self, *args: t.Any) -> t.Any:
+        """Call `execute_kw` on the service"""
+        return self.call("execute_kw", *args)
+
+    def call(self, method: str, *args: t.Any) -> t.Any:
+        """Call a method of the service
+
+        Args:
+            method: the method name
+            args: the method parameters
+        """
+        request_body = json.dumps(
+            {
+                "jsonrpc": "2.0",
+                "method": "call",
+                "params": {"service": self.service, "method": method, "args": args},
+                "id": next(self._ids),
+            }
+        ).encode()
+
+        def _exchange(connection):
+            response = self.transport.send_pooled_request(
+                connection,
+                self.host,
+                self.handler,
+                request_body,
+                False,
+                content_type="application/json",
+            )
+            return self.read_response(response)
+
+        return self.transport.pooled(self.host, _exchange)
+
+    def read_response(self, response: t.Any) -> t.Any:
+        """Decode a response, raising `xmlrpc.client.Fault` on errors"""
+        with odoo_api_wrapper.metrics.timed("network"):
+            body = response.read()
+
+        stats = odoo_api_wrapper.metrics.CURRENT.get()
+        if stats is not None:
+            stats.response_bytes += len(body)
+
+        if response.status != 200:
+            raise xmlrpc.client.ProtocolError(
+                self.host + self.handler,
+                response.status,
+                response.reason,
+                dict(response.getheaders()),
+            )
+
+        with odoo_api_wrapper.metrics.timed("unmarshal"):
+            if response.getheader("Content-Encoding", "") == "gzip":
+                body = gzip.decompress(body)
+            if stats is not None:
+                stats.response_uncompressed_bytes += len(body)
+
+            payload = json.loads(body)
+
+        error = payload.get("error")
+        if error is not None:
+            data = error.get("data") or {}
+            raise xmlrpc.client.Fault(
+                error.get("code", 0),
+                data.get("message") or error.get("message", ""),
+            )
+
+        return payload.get("result")
@@ -0,0 +1,281 @@
+""" Call metrics
+
+An `odoo_api_wrapper.api.Api` given `metrics` sinks records every request it sends to
+the server as an `odoo_api_wrapper.metrics.CallStats`: its operation and model, how
+long it took, the size of the request and the response, where the time went and, when
+it failed, the cause of its `odoo_api_wrapper.api.APIError`.
+
+`odoo_api_wrapper.metrics.InMemorySink` aggregates them by operation and model,
+`odoo_api_wrapper.metrics.PrometheusSink` also renders them in Prometheus' text format.
+Any object with a `record(stats)` method can be a sink.
+
+## Usage Examples
+
+### Find out where the time goes
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.metrics import InMemorySink
+
+sink = InMemorySink()
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", metrics=[sink]
+)
+...
+for (operation, model), stats in sink.snapshot().items():
+    print(operation, model, stats.count, stats.duration, stats.network)
+```
+
+### Expose Prometheus metrics
+```python
+from odoo_api_wrapper.metrics import PrometheusSink
+
+sink = PrometheusSink()
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", metrics=[sink]
+)
+...
+sink.render()  # the body of a `/metrics` response
+```
+
+## Phases
+
+- `wait`: waiting for a connection from the pool
+- `network`: sending the request and reading the response
+- `unmarshal`: decoding the response
+- `marshal`: the rest of the call, mostly encoding the request
+
+## Sizes
+
+Requests and responses are measured both on the wire and once decompressed, their
+ratio is how much gzip compression saves, see `OperationStats.request_ratio` and
+`OperationStats.response_ratio`.
+
+Only the default transport tells the phases and sizes apart, other transports only
+record the duration. When recording, responses are read whole before being decoded.
+"""
+import bisect
+import collections
+import contextlib
+import contextvars
+import copy
+import threading
+import time
+import typing as t
+
+# the upper bounds of the latency histogram buckets, in seconds
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class CallStats:  # pylint:disable=too-many-instance-attributes
+    """The metrics of a request"""
+
+    def __init__(self, operation: str, model: str):
+        self.operation = operation
+        self.model = model
+
+        self.duration = 0.0
+        self.wait = 0.0
+        self.network = 0.0
+        self.unmarshal = 0.0
+        # the sizes on the wire, and once decompressed
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.request_uncompressed_bytes = 0
+        self.response_uncompressed_bytes = 0
+        # the class name of the error's cause, e.g. `Fault`, `None` on success
+        self.error: t.Optional[str] = None
+
+    @property
+    def marshal(self) -> float:
+        """The time spent outside of the other phases"""
+        return max(0.0, self.duration - self.wait - self.network - self.unmarshal)
+
+
+# the stats of the request being sent in the current context, filled in by the
+# transports
+CURRENT: "contextvars.ContextVar[t.Optional[CallStats]]" = contextvars.ContextVar(
+    "odoo_api_wrapper_call_stats", default=None
+)
+
+
+@contextlib.contextmanager
+def timed(phase: str) -> t.Iterator[None]:
+    """Add the time spent in the block to `phase` of the current stats, if any"""
+    stats = CURRENT.get()
+    if stats is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        setattr(stats, phase, getattr(stats, phase) + time.perf_counter() - start)
+
+
+def error_cause(error: BaseException) -> str:
+    """The name recording an error, its cause's class name when it has one"""
+    cause = error.__cause__ if error.__cause__ is not None else error
+    return type(cause).__name__
+
+
+class OperationStats:  # pylint:disable=too-many-instance-attributes
+    """The metrics of the requests of an operation on a model"""
+
+    def __init__(self):
+        self.count = 0
+        self.errors: t.Dict[str, int] = collections.defaultdict(int)
+        # request counts by bucket of `BUCKETS`, the last one past the largest bound
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+        self.duration = 0.0
+        self.marshal = 0.0
+        self.wait = 0.0
+        self.network = 0.0
+        self.unmarshal = 0.0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.request_uncompressed_bytes = 0
+        self.response_uncompressed_bytes = 0
+
+    @property
+    def request_ratio(self) -> float:
+        """How many times smaller compression made the requests, 1.0 by default"""
+        return self.request_uncompressed_bytes / (self.request_bytes or 1) or 1.0
+
+    @property
+    def response_ratio(self) -> float:
+        """How many times smaller compression made the responses, 1.0 by default"""
+        return self.response_uncompressed_bytes / (self.response_bytes or 1) or 1.0
+
+    def add(self, stats: CallStats):
+        """Add a request's metrics"""
+        self.count += 1
+        if stats.error is not None:
+            self.errors[stats.error] += 1
+
+        self.buckets[bisect.bisect_left(BUCKETS, stats.duration)] += 1
+
+        self.duration += stats.duration
+        self.marshal += stats.marshal
+        self.wait += stats.wait
+        self.network += stats.network
+        self.unmarshal += stats.unmarshal
+        self.request_bytes += stats.request_bytes
+        self.response_bytes += stats.response_bytes
+        self.request_uncompressed_bytes += stats.request_uncompressed_bytes
+        self.response_uncompressed_bytes += stats.response_uncompressed_bytes
+
+
+class InMemorySink:
+    """Aggregate request metrics by `(operation, model)`"""
+
+    def __init__(self):
+        self._stats: t.Dict[t.Tuple[str, str], OperationStats] = {}
+        self._lock = threading.Lock()
+
+    def record(self, stats: CallStats):
+        """Add a request's metrics"""
+        with self._lock:
+            key = (stats.operation, stats.model)
+            operation_stats = self._stats.get(key)
+            if operation_stats is None:
+                operation_stats = self._stats[key] = OperationStats()
+
+            operation_stats.add(stats)
+
+    def snapshot(self) -> t.Dict[t.Tuple[str, str], OperationStats]:
+        """A copy of the metrics, by `(operation, model)`"""
+        with self._lock:
+            return copy.deepcopy(self._stats)
+
+    def clear(self):
+        """Drop the metrics"""
+        with self._lock:
+            self._stats.clear()
+
+
+def _labels(**labels: t.Any) -> str:
+    escaped = (
+        str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        for value in labels.values()
+    )
+    return ",".join(f'{name}="{value}"' for name, value in zip(labels, escaped))
+
+
+class PrometheusSink(InMemorySink):
+    """Aggregate request metrics and render them in Prometheus' text format
+
+    Args:
+        prefix: the prefix of the metric names
+    """
+
+    def __init__(self, prefix: str = "odoo_api"):
+        super().__init__()
+        self.prefix = prefix
+
+    def render(self) -> str:
+        """Render the metrics in Prometheus' text exposition format"""
+        snapshot = sorted(self.snapshot().items())
+        lines = []
+
+        def _metric(name: str, type_: str, help_: str):
+            lines.append(f"# HELP {self.prefix}_{name} {help_}")
+            lines.append(f"# TYPE {self.prefix}_{name} {type_}")
+
+        _metric("requests_total", "counter", "Requests sent to the server.")
+        for (operation, model), stats in snapshot:
+            labels = _labels(operation=operation, model=model)
+            lines.append(f"{self.prefix}_requests_total{{{labels}}} {stats.count}")
+
+        _metric("errors_total", "counter", "Failed requests, by cause.")
+        for (operation, model), stats in snapshot:
+            for cause, count in sorted(stats.errors.items()):
+                labels = _labels(operation=operation, model=model, cause=cause)
+                lines.append(f"{self.prefix}_errors_total{{{labels}}} {count}")
+
+        _metric("request_duration_seconds", "histogram", "Request durations.")
+        for (operation, model), stats in snapshot:
+            labels = _labels(operation=operation, model=model)
+            total = 0
+            for bound, count in zip((*BUCKETS, "+Inf"), stats.buckets):
+                total += count
+                lines.append(
+                    f"{self.prefix}_request_duration_seconds_bucket"
+                    f'{{{labels},le="{bound}"}} {total}'
+                )
+            lines.append(
+                f"{self.prefix}_request_duration_seconds_sum{{{labels}}} "
+                f"{stats.duration}"
+            )
+            lines.append(
+                f"{self.prefix}_request_duration_seconds_count{{{labels}}} "
+                f"{stats.count}"
+            )
+
+        _metric("phase_seconds_total", "counter", "Time spent per request phase.")
+        for (operation, model), stats in snapshot:
+            for phase in ("marshal", "wait", "network", "unmarshal"):
+                labels = _labels(operation=operation, model=model, phase=phase)
+                lines.append(
+                    f"{self.prefix}_phase_seconds_total{{{labels}}} "
+                    f"{getattr(stats, phase)}"
+                )
+
+        for direction, size, help_ in (
+            (direction, size, help_)
+            for direction in ("request", "response")
+            for size, help_ in (
+                ("bytes", f"Bytes of {direction}s on the wire."),
+                ("uncompressed_bytes", f"Bytes of {direction}s once decompressed."),
+            )
+        ):
+            _metric(f"{direction}_{size}_total", "counter", help_)
+            for (operation, model), stats in snapshot:
+                labels = _labels(operation=operation, model=model)
+                lines.append(
+                    f"{self.prefix}_{direction}_{size}_total{{{labels}}} "
+                    f"{getattr(stats, f'{direction}_{size}')}"
+                )
+
+        return "\n".join(lines) + "\n"
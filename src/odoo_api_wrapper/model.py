@@ -15,6 +15,12 @@ api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
 partner = odoo_api_wrapper.Model(api, "res.partner")
 ```
 
+Or get the model shared by every caller of the `Api`, created once, along with its
+caches of field types and record classes.
+```python
+partner = api["res.partner"]
+```
+
 ### List records
 Records can be listed and filtered via `search()`.
 ```python
@@ -58,6 +64,83 @@ partner.search_read(
 )
 ```
 
+### Iterate over large result sets
+`iter_search_read()` pages through the matching records by id, `batch_size` at a time,
+keeping memory flat however many records there are.
+```python
+for partner_batch in partner.iter_search_read(
+    [['is_company', '=', True]], ['name'], batch_size=500, batched=True
+):
+    ...
+```
+
+### Read, update or delete many records
+Split long lists of ids into concurrent calls with `chunk_size`, see
+`odoo_api_wrapper.api.Api.call`.
+```python
+records = partner.read([ids], {'fields': ['name']}, chunk_size=1000)
+```
+
+### Read related records
+Replace relational values with the related records, read in one call per related
+model, see `odoo_api_wrapper.api.Api.call`.
+```python
+partner.search_read(
+    [[['is_company', '=', True]]],
+    {'fields': ['name']},
+    prefetch={'country_id': ['code'], 'child_ids': ['name', 'email']},
+)
+```
+
+### Get records as objects
+With `result_mode="record"`, `read()`, `search_read()` and `iter_search_read()`
+return instances of classes generated from the model's fields, using `__slots__`: they
+take a fraction of the memory of dicts, and their fields are read as attributes.
+```python
+moves = odoo_api_wrapper.Model(api, "stock.move", result_mode="record")
+
+for move in moves.iter_search_read([], ['product_id', 'quantity']):
+    move.quantity
+```
+
+### Read columns
+`search_read_columns()` returns a column per field rather than a dict per record, packed
+into `array.array` buffers or NumPy arrays when possible, see
+`odoo_api_wrapper.columns`.
+```python
+lines = odoo_api_wrapper.Model(api, "account.move.line")
+columns = lines.search_read_columns([], ['debit', 'credit', 'partner_id'])
+```
+
+### Export to a file
+`export()` writes the matching records to a JSON lines or CSV file page by page,
+optionally gzipped, and resumes where it stopped when interrupted, see
+`odoo_api_wrapper.export`.
+```python
+lines.export([], ['name', 'debit', 'partner_id'], "lines.csv.gz", format="csv")
+```
+
+### Mirror to SQLite
+Keep chosen fields of a model in a local SQLite database, synced incrementally by
+`write_date`, see `odoo_api_wrapper.sync`.
+```python
+from odoo_api_wrapper.sync import Replica
+
+with Replica("replica.db") as replica:
+    replica.sync(lines, ['name', 'debit', 'partner_id'], indexes=['partner_id'])
+```
+
+### Aggregate records
+Have the database aggregate the records, see `odoo_api_wrapper.api.Api.aggregate`.
+```python
+lines.aggregate([], ['debit:sum', 'credit:sum'], ['partner_id'])
+```
+
+### Search by name
+```python
+partner.name_search(['Azure'], {'limit': 8})
+```
+
 ### Create records
 Records of a model are created using `create()`. The method creates a single record and
 returns its database identifier.
@@ -65,6 +148,11 @@ returns its database identifier.
 id = partner.create([{'name': "New Partner"}])
 ```
 
+### Create many records
+```python
+ids = partner.create_many([{'name': name} for name in names], chunk_size=500)
+```
+
 ### Update records
 Records can be updated using `write()`. It takes a list of records to update and a
 mapping of updated fields to values similar to `create()`.
@@ -79,36 +167,277 @@ partner.unlink([[id]])
 ```
 
 """
-import functools
 import typing as t
 
 import odoo_api_wrapper
+import odoo_api_wrapper.export
+from odoo_api_wrapper.api import OperationMethod
+from odoo_api_wrapper.api import Operations
+from odoo_api_wrapper.columns import ColumnBuilder
+from odoo_api_wrapper.records import from_dicts
+from odoo_api_wrapper.records import make_record_class
+from odoo_api_wrapper.records import Record
+from odoo_api_wrapper.records import ResultMode
 
 
 class Model:  # pylint:disable=too-few-public-methods
     """Odoo model"""
 
-    # define the methods we'll add dynamically
-    write: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    create: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    read: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    search: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    search_count: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    search_read: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    fields_get: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-    unlink: t.Callable[[t.List, t.Dict[str, t.Any]], t.Any]
-
-    def __new__(  # pylint:disable=unused-argument
-        cls,
+    # the operations, bound to the model
+    write = OperationMethod(Operations.WRITE, on_model=True)
+    create = OperationMethod(Operations.CREATE, on_model=True)
+    read = OperationMethod(Operations.READ, on_model=True)
+    search = OperationMethod(Operations.SEARCH, on_model=True)
+    search_count = OperationMethod(Operations.SEARCH_COUNT, on_model=True)
+    search_read = OperationMethod(Operations.SEARCH_READ, on_model=True)
+    fields_get = OperationMethod(Operations.FIELDS_GET, on_model=True)
+    unlink = OperationMethod(Operations.UNLINK, on_model=True)
+    read_group = OperationMethod(Operations.READ_GROUP, on_model=True)
+    name_search = OperationMethod(Operations.NAME_SEARCH, on_model=True)
+
+    def __init__(
+        self,
         api: odoo_api_wrapper.api.Api,
         model_name: str,
-        *args,
-        **kwargs,
+        result_mode: t.Union[ResultMode, str] = ResultMode.DICT,
     ):
-        instance = super().__new__(cls)
+        """
+        Args:
+            api: the api used for the calls
+            model_name: the name of the model, e.g. `"res.partner"`
+            result_mode: return the records of `read`, `search_read` and
+                `iter_search_read` as dicts, or as instances of `record_class`
+        """
+        self.api = api
+        self.model_name = model_name
+
+        try:
+            self.result_mode = ResultMode(result_mode)
+        except ValueError as error:
+            raise odoo_api_wrapper.APIError("Invalid result mode") from error
+
+        self._fields: t.Optional[t.Dict[str, t.Any]] = None
+        self._record_classes: t.Dict[t.Tuple[str, ...], t.Type[Record]] = {}
+
+        if self.result_mode is ResultMode.RECORD:
+            self.read = self._returning_records(self.read)
+            self.search_read = self._returning_records(self.search_read)
+
+    def _returning_records(
+        self,
+        func: t.Callable[..., t.Any],
+    ) -> t.Callable[..., t.Any]:
+        def _wrapped(*args: t.Any, **kwargs: t.Any) -> t.List[Record]:
+            return self.to_records(func(*args, **kwargs))
+
+        return _wrapped
+
+    def field_types(self) -> t.Dict[str, t.Any]:
+        """The type of each field, as given by `fields_get`, fetched once"""
+        if self._fields is None:
+            self._fields = {
+                field: attributes.get("type")
+                for field, attributes in self.fields_get(
+                    [], {"attributes": ["type"]}
+                ).items()
+            }
+
+        return self._fields
+
+    def record_class(self, fields: t.Iterable[str]) -> t.Type[Record]:
+        """Get the `__slots__` class of records holding `fields`
+
+        Classes are built once per set of fields, the fields are checked against
+        `fields_get`.
+        """
+        fields = tuple(fields)
+        cls = self._record_classes.get(fields)
+
+        if cls is None:
+            types = self.field_types()
+            unknown = [field for field in fields if field not in types]
+            if unknown:
+                raise odoo_api_wrapper.APIError(f"Unknown fields: {', '.join(unknown)}")
+
+            cls = self._record_classes[fields] = make_record_class(
+                self.model_name, fields
+            )
+
+        return cls
+
+    def to_records(self, rows: t.List[t.Dict[str, t.Any]]) -> t.List[Record]:
+        """Convert `read` results to instances of `record_class`"""
+        if not rows:
+            return []
+
+        return from_dicts(self.record_class(rows[0]), rows)
+
+    def iter_search_read(  # pylint:disable=too-many-arguments
+        self,
+        domain: t.List,
+        fields: t.Optional[t.List[str]] = None,
+        batch_size: int = 1000,
+        batched: bool = False,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        after_id: int = 0,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterator[t.Any]:
+        """Iterate over the records matching `domain`, ordered by id
+
+        See `odoo_api_wrapper.api.Api.iter_search_read`.
+        """
+        if self.result_mode is ResultMode.DICT:
+            return self.api.iter_search_read(
+                self.model_name,
+                domain,
+                fields,
+                batch_size,
+                batched,
+                kwargs,
+                after_id,
+                timeout,
+                deadline,
+            )
+
+        batches = (
+            self.to_records(batch)
+            for batch in self.api.iter_search_read(
+                self.model_name,
+                domain,
+                fields,
+                batch_size,
+                True,
+                kwargs,
+                after_id,
+                timeout,
+                deadline,
+            )
+        )
+        if batched:
+            return batches
+
+        return (record for batch in batches for record in batch)
+
+    def iter_read_group(  # pylint:disable=too-many-arguments
+        self,
+        domain: t.List,
+        fields: t.List[str],
+        groupby: t.List[str],
+        page_size: int = 1000,
+        orderby: t.Optional[str] = None,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Iterator[t.Dict[str, t.Any]]:
+        """Iterate over the groups of the records matching `domain`
+
+        See `odoo_api_wrapper.api.Api.iter_read_group`.
+        """
+        return self.api.iter_read_group(
+            self.model_name,
+            domain,
+            fields,
+            groupby,
+            page_size,
+            orderby,
+            kwargs,
+            timeout,
+            deadline,
+        )
+
+    def aggregate(  # pylint:disable=too-many-arguments
+        self,
+        domain: t.List,
+        fields: t.List[str],
+        groupby: t.List[str],
+        page_size: int = 1000,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.Dict[t.Tuple[t.Any, ...], t.Dict[str, t.Any]]:
+        """Aggregate the records matching `domain`, by group
+
+        See `odoo_api_wrapper.api.Api.aggregate`.
+        """
+        return self.api.aggregate(
+            self.model_name,
+            domain,
+            fields,
+            groupby,
+            page_size,
+            kwargs,
+            timeout,
+            deadline,
+        )
+
+    def search_read_columns(  # pylint:disable=too-many-arguments
+        self,
+        domain: t.List,
+        fields: t.List[str],
+        batch_size: int = 1000,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        use_numpy: t.Optional[bool] = None,
+    ) -> t.Dict[str, t.Any]:
+        """Read the records matching `domain` as columns, ordered by id
+
+        The records are read `batch_size` at a time with `iter_search_read`, and only
+        one batch is held as dicts at a time.
+
+        Args:
+            domain: the search domain
+            fields: the fields to read, the `id` column is always included
+            batch_size: the number of records fetched per call
+            kwargs: other `search_read` parameters, e.g. `context`
+            use_numpy: return NumPy arrays, defaults to whether NumPy is installed
+
+        Returns the columns by name, see `odoo_api_wrapper.columns` for their types.
+        """
+        types = self.field_types()
+        unknown = [field for field in fields if field not in types]
+        if unknown:
+            raise odoo_api_wrapper.APIError(f"Unknown fields: {', '.join(unknown)}")
+
+        builder = ColumnBuilder(
+            {field: types[field] for field in ["id", *fields]}, use_numpy
+        )
+        for batch in self.api.iter_search_read(
+            self.model_name, domain, fields, batch_size, True, kwargs
+        ):
+            builder.extend(batch)
+
+        return builder.build()
+
+    def export(  # pylint:disable=too-many-arguments
+        self,
+        domain: t.List,
+        fields: t.List[str],
+        path: str,
+        format: str = "jsonl",  # pylint:disable=redefined-builtin
+        compress: t.Optional[bool] = None,
+        batch_size: int = 1000,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> int:
+        """Write the records matching `domain` to a file, a page at a time
+
+        See `odoo_api_wrapper.export.export`.
+        """
+        return odoo_api_wrapper.export.export(
+            self, domain, fields, path, format, compress, batch_size, kwargs
+        )
 
-        for operation in odoo_api_wrapper.Operations.__members__.values():
-            func = getattr(api, operation.value)
-            setattr(instance, operation.value, functools.partial(func, model_name))
+    def create_many(
+        self,
+        records: t.Sequence[t.Dict[str, t.Any]],
+        chunk_size: int = 100,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+        timeout: t.Optional[float] = None,
+        deadline: t.Optional[float] = None,
+    ) -> t.List[int]:
+        """Create records `chunk_size` at a time, chunks run concurrently
 
-        return instance
+        See `odoo_api_wrapper.api.Api.create_many`.
+        """
+        return self.api.create_many(
+            self.model_name, records, chunk_size, kwargs, timeout, deadline
+        )
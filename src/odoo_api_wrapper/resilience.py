@@ -0,0 +1,252 @@
+""" Retries, circuit breaking and hedged reads
+
+Policies `odoo_api_wrapper.api.Api` applies to each call it sends:
+
+- `odoo_api_wrapper.resilience.RetryPolicy` retries read-only calls failing on a
+  connection error or a 5xx response, after a jittered exponential backoff
+- `odoo_api_wrapper.resilience.CircuitBreaker` fails calls fast, with
+  `odoo_api_wrapper.api.CircuitOpenError`, once the server keeps failing
+- `odoo_api_wrapper.resilience.Hedger` sends a read-only call a second time, on another
+  connection, when the first one is slower than most, and keeps the first response
+
+Calls that change data (`create`, `write`, `unlink`) are never retried nor hedged.
+
+## Usage Examples
+
+### Retry reads
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.resilience import CircuitBreaker, Hedger, RetryPolicy
+
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069",
+    "db",
+    "1001",
+    "password",
+    retry=RetryPolicy(retries=3, backoff=0.1, max_backoff=5.0),
+    circuit_breaker=CircuitBreaker(failure_threshold=5, reset_timeout=30.0),
+)
+```
+
+Backoffs are cut short by the call's deadline: a retry that could not start before it
+raises the last error instead.
+
+### Hedge slow reads
+```python
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", hedging=Hedger(percentile=95)
+)
+```
+
+Once `min_samples` latencies were measured, a read still running after the
+`percentile`th of them is sent again. The slower request is not cancelled: it keeps its
+connection and a server worker busy until it completes.
+"""
+import collections
+import concurrent.futures
+import contextvars
+import random
+import socket
+import threading
+import time
+import typing as t
+import xmlrpc.client
+
+
+def is_retryable(error: t.Optional[BaseException]) -> bool:
+    """Whether the cause of a failed call is worth retrying
+
+    Connection errors and 5xx responses are, timeouts and faults are not.
+    """
+    if isinstance(error, xmlrpc.client.ProtocolError):
+        return error.errcode >= 500
+
+    return isinstance(error, OSError) and not isinstance(error, socket.timeout)
+
+
+def is_server_failure(error: t.Optional[BaseException]) -> bool:
+    """Whether the cause of a failed call means the server is unavailable
+
+    Retryable errors and timeouts are, faults raised by a working server are not.
+    """
+    return is_retryable(error) or isinstance(error, socket.timeout)
+
+
+class RetryPolicy:  # pylint:disable=too-few-public-methods
+    """Retry read-only calls with a jittered exponential backoff
+
+    Args:
+        retries: the maximum number of retries of a call
+        backoff: the backoff before the first retry, doubled for each retry
+        max_backoff: the maximum backoff
+        jitter: wait a random time up to the backoff rather than the whole backoff,
+            so clients failing together don't retry together
+    """
+
+    def __init__(
+        self,
+        retries: int = 3,
+        backoff: float = 0.1,
+        max_backoff: float = 10.0,
+        jitter: bool = True,
+    ):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+
+    def delay(self, retry: int) -> float:
+        """The number of seconds to wait before the `retry`th retry, from 0"""
+        delay = min(self.max_backoff, self.backoff * 2**retry)
+        return random.uniform(0, delay) if self.jitter else delay
+
+
+class CircuitBreaker:
+    """Fail calls fast while the server is unavailable
+
+    The circuit opens after `failure_threshold` consecutive server failures. While
+    open, calls are refused until `reset_timeout` seconds have passed, then one trial
+    call is let through every `reset_timeout` seconds: its success closes the circuit,
+    its failure keeps it open.
+
+    Args:
+        failure_threshold: the number of consecutive failures opening the circuit
+        reset_timeout: the number of seconds between trial calls while open
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+
+        self.failures = 0
+        # when the circuit opened or the last trial call started, `None` when closed
+        self._opened_at: t.Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def open(self) -> bool:
+        """Whether calls are being refused"""
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        """Whether a call may be sent, counts as the trial call when it is one"""
+        with self._lock:
+            if self._opened_at is None:
+                return True
+
+            now = time.monotonic()
+            if now - self._opened_at < self.reset_timeout:
+                return False
+
+            self._opened_at = now
+            return True
+
+    def record(self, failure: bool):
+        """Record the outcome of a call"""
+        with self._lock:
+            if not failure:
+                self.failures = 0
+                self._opened_at = None
+                return
+
+            self.failures += 1
+            if self._opened_at is not None or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+class Hedger:
+    """Send read-only calls again when they are slower than most
+
+    Args:
+        percentile: the latency percentile, out of 100, past which a call is hedged
+        min_samples: the number of latencies to measure before hedging
+        window: the number of recent latencies the percentile is computed from
+        max_workers: the number of threads running the requests
+    """
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_samples: int = 50,
+        window: int = 1000,
+        max_workers: int = 10,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_workers = max_workers
+
+        self.hedged = 0
+
+        self._latencies: t.Deque[float] = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+        self._executor: t.Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @property
+    def executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """The pool running the requests, created on first use"""
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    self.max_workers, thread_name_prefix="odoo-api-hedge"
+                )
+
+        return self._executor
+
+    def delay(self) -> t.Optional[float]:
+        """The latency past which calls are hedged, `None` until `min_samples`"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+
+            latencies = sorted(self._latencies)
+
+        index = int(len(latencies) * self.percentile / 100)
+        return latencies[min(index, len(latencies) - 1)]
+
+    def _timed(self, func: t.Callable[[], t.Any]) -> t.Any:
+        start = time.monotonic()
+        result = func()
+
+        with self._lock:
+            self._latencies.append(time.monotonic() - start)
+
+        return result
+
+    def run(self, func: t.Callable[[], t.Any]) -> t.Any:
+        """Call `func`, and call it again if it is slow
+
+        Returns the first result, raises the last error when both calls fail.
+        """
+        delay = self.delay()
+        if delay is None:
+            return self._timed(func)
+
+        # the requests run in the caller's context, and so within its deadline
+        context = contextvars.copy_context()
+        futures = {self.executor.submit(context.copy().run, self._timed, func)}
+
+        done, _ = concurrent.futures.wait(futures, timeout=delay)
+        if not done:
+            with self._lock:
+                self.hedged += 1
+            futures.add(self.executor.submit(context.copy().run, self._timed, func))
+
+        error: t.Optional[BaseException] = None
+        while futures:
+            done, futures = concurrent.futures.wait(
+                futures, return_when=concurrent.futures.FIRST_COMPLETED
+            )
+            for future in done:
+                error = future.exception()
+                if error is None:
+                    return future.result()
+
+        raise t.cast(BaseException, error)
+
+    def close(self):
+        """Shut down the thread pool, once the running requests are done"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+
+        if executor is not None:
+            executor.shutdown()
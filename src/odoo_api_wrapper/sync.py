@@ -0,0 +1,402 @@
+""" Local SQLite replica
+
+`odoo_api_wrapper.sync.Replica` mirrors chosen fields of Odoo models into a SQLite
+database, so read-heavy services can query them locally instead of calling the server
+for every lookup.
+
+## Usage Examples
+
+### Mirror a model
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.sync import Replica
+
+api = odoo_api_wrapper.Api("http://localhost:8069", "db", "1001", "password")
+
+with Replica("replica.db") as replica:
+    replica.sync(
+        api["res.partner"],
+        ["name", "email", "parent_id", "is_company"],
+        domain=[["customer_rank", ">", 0]],
+        indexes=["email", ("parent_id", "name")],
+    )
+```
+
+Run `sync()` again, e.g. every minute, to bring the replica up to date. Other
+connections can query the replica while it syncs.
+```python
+import sqlite3
+
+connection = sqlite3.connect("replica.db")
+connection.execute("SELECT id, name FROM res_partner WHERE email = ?", (email,))
+```
+
+## Syncing
+
+The first sync loads every record matching the domain, a page at a time, and can be
+resumed where it stopped when interrupted. Later syncs only fetch the records whose
+`write_date` is past the watermark, the latest `write_date` on the server when the
+previous sync started, minus `overlap` seconds: Odoo stamps records with the time their
+transaction started, a transaction still running at the watermark can commit records
+older than it.
+
+Deletions are found by comparing the ids on the server with the replica's, which also
+fetches records that entered the domain without being written to. Syncing other fields
+or another domain into an existing table raises `odoo_api_wrapper.APIError`, `drop()`
+it first.
+
+## Tables
+
+A model is mirrored to a table named after it, `res.partner` to `res_partner`, with
+an `id` primary key, a `write_date` column and a column per field. A many2one field
+gives an id column and a `<field>_name` column, other relational fields are JSON
+lists, booleans are 0 or 1 and `False` is `NULL` for fields other than booleans.
+"""
+import datetime
+import json
+import sqlite3
+import typing as t
+
+import odoo_api_wrapper
+from odoo_api_wrapper.api import APIError
+
+# the number of ids fetched per `search` call when looking for deleted records
+ID_PAGE_SIZE = 100000
+
+_COLUMN_TYPES = {
+    "integer": "INTEGER",
+    "many2one": "INTEGER",
+    "boolean": "INTEGER",
+    "float": "REAL",
+    "monetary": "REAL",
+}
+
+_STATE_TABLE = "_odoo_sync_state"
+
+
+class SyncStats(t.NamedTuple):
+    """The outcome of a `Replica.sync`"""
+
+    # the number of records fetched and stored
+    fetched: int
+    # the number of records deleted from the replica
+    deleted: int
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(types: t.Dict[str, t.Any]) -> t.List[t.Tuple[str, str]]:
+    """The `(name, type)` columns of the fields"""
+    columns = [("id", "INTEGER PRIMARY KEY"), ("write_date", "TEXT")]
+
+    for field, type_ in types.items():
+        columns.append((field, _COLUMN_TYPES.get(type_, "TEXT")))
+        if type_ == "many2one":
+            columns.append((f"{field}_name", "TEXT"))
+
+    return columns
+
+
+def _row(record: t.Dict[str, t.Any], types: t.Dict[str, t.Any]) -> t.List[t.Any]:
+    values = [record["id"], record.get("write_date") or None]
+
+    for field, type_ in types.items():
+        value = record.get(field, False)
+
+        if type_ == "boolean":
+            values.append(int(bool(value)))
+        elif type_ == "many2one":
+            values.extend(value or (None, None))
+        elif value is False:
+            values.append(None)
+        elif isinstance(value, (list, dict)):
+            values.append(json.dumps(value))
+        else:
+            values.append(value)
+
+    return values
+
+
+class Replica:
+    """A SQLite database mirroring Odoo models
+
+    A `Replica` syncs from a single thread, other connections to the database can read
+    it meanwhile.
+
+    Args:
+        path: the database file
+        overlap: the number of seconds before the watermark records are fetched from,
+            to catch transactions committed late
+    """
+
+    def __init__(self, path: str, overlap: float = 60.0):
+        self.path = path
+        self.overlap = overlap
+
+        self.connection = sqlite3.connect(path)
+        # readers don't block the sync, nor the sync readers
+        self.connection.execute("PRAGMA journal_mode=WAL")
+
+        with self.connection:
+            self.connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {_STATE_TABLE} ("
+                "model TEXT PRIMARY KEY, spec TEXT NOT NULL, watermark TEXT, "
+                "last_id INTEGER NOT NULL, loaded INTEGER NOT NULL)"
+            )
+
+    def __enter__(self) -> "Replica":
+        return self
+
+    def __exit__(self, *exc_info: t.Any):
+        self.close()
+
+    @staticmethod
+    def table(model_name: str) -> str:
+        """The name of the table mirroring `model_name`"""
+        return model_name.replace(".", "_")
+
+    def sync(  # pylint:disable=too-many-arguments,too-many-locals
+        self,
+        model: "odoo_api_wrapper.Model",
+        fields: t.List[str],
+        domain: t.Optional[t.List] = None,
+        indexes: t.Iterable[t.Union[str, t.Sequence[str]]] = (),
+        batch_size: int = 1000,
+        kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    ) -> SyncStats:
+        """Bring the mirror of `model` up to date
+
+        Args:
+            model: the model to mirror
+            fields: the fields to mirror, `id` and `write_date` always are
+            domain: the records to mirror, all of them by default
+            indexes: the columns to index, a field or a sequence of fields per index
+            batch_size: the number of records fetched per call
+            kwargs: other `search_read` parameters, e.g. `context`
+        """
+        domain = list(domain or [])
+        kwargs = dict(kwargs or {})
+
+        field_types = model.field_types()
+        unknown = [field for field in fields if field not in field_types]
+        if unknown:
+            raise APIError(f"Unknown fields: {', '.join(unknown)}")
+
+        fields = [
+            field
+            for field in dict.fromkeys(fields)
+            if field not in ("id", "write_date")
+        ]
+        types = {field: field_types[field] for field in fields}
+        spec = json.dumps({"fields": fields, "domain": domain})
+
+        name = model.model_name
+        table = self.table(name)
+        state = self._state(name)
+
+        if state is None:
+            state = {
+                "spec": spec,
+                # changes made while loading are fetched from there
+                "watermark": self._server_watermark(model, domain, kwargs),
+                "last_id": 0,
+                "loaded": 0,
+            }
+            with self.connection:
+                self._create_table(table, types)
+                self._save_state(name, state)
+        elif state["spec"] != spec:
+            raise APIError(f"{name} is mirrored with other fields or domain")
+
+        self._create_indexes(table, types, indexes)
+
+        fetched = 0
+        if not state["loaded"]:
+            for records in model.api.iter_search_read(
+                name,
+                domain,
+                [*fields, "write_date"],
+                batch_size,
+                True,
+                kwargs,
+                state["last_id"],
+            ):
+                state["last_id"] = records[-1]["id"]
+                with self.connection:
+                    self._store(table, types, records)
+                    self._save_state(name, state)
+                fetched += len(records)
+
+            state["loaded"] = 1
+            with self.connection:
+                self._save_state(name, state)
+
+        watermark = self._server_watermark(model, domain, kwargs)
+        changed = domain
+        if state["watermark"] is not None:
+            changed = [*domain, ["write_date", ">=", self._since(state["watermark"])]]
+
+        for records in model.api.iter_search_read(
+            name, changed, [*fields, "write_date"], batch_size, True, kwargs
+        ):
+            with self.connection:
+                self._store(table, types, records)
+            fetched += len(records)
+
+        missing, deleted = self._diff(model, table, domain, kwargs)
+        if missing:
+            records = model.api.read(
+                name,
+                [missing],
+                {**kwargs, "fields": [*fields, "write_date"]},
+                chunk_size=batch_size,
+            )
+            with self.connection:
+                self._store(table, types, records)
+            fetched += len(records)
+
+        with self.connection:
+            self.connection.executemany(
+                f"DELETE FROM {_quote(table)} WHERE id = ?",
+                ((id_,) for id_ in deleted),
+            )
+            if watermark is not None:
+                state["watermark"] = watermark
+            self._save_state(name, state)
+
+        return SyncStats(fetched, len(deleted))
+
+    def drop(self, model_name: str):
+        """Drop the mirror of `model_name`, the next sync loads it again"""
+        with self.connection:
+            self.connection.execute(
+                f"DROP TABLE IF EXISTS {_quote(self.table(model_name))}"
+            )
+            self.connection.execute(
+                f"DELETE FROM {_STATE_TABLE} WHERE model = ?", (model_name,)
+            )
+
+    def close(self):
+        """Close the database"""
+        self.connection.close()
+
+    def _state(self, model_name: str) -> t.Optional[t.Dict[str, t.Any]]:
+        row = self.connection.execute(
+            f"SELECT spec, watermark, last_id, loaded FROM {_STATE_TABLE} "
+            "WHERE model = ?",
+            (model_name,),
+        ).fetchone()
+        if row is None:
+            return None
+
+        return dict(zip(("spec", "watermark", "last_id", "loaded"), row))
+
+    def _save_state(self, model_name: str, state: t.Dict[str, t.Any]):
+        self.connection.execute(
+            f"INSERT OR REPLACE INTO {_STATE_TABLE} "
+            "(model, spec, watermark, last_id, loaded) VALUES (?, ?, ?, ?, ?)",
+            (
+                model_name,
+                state["spec"],
+                state["watermark"],
+                state["last_id"],
+                state["loaded"],
+            ),
+        )
+
+    def _create_table(self, table: str, types: t.Dict[str, t.Any]):
+        columns = ", ".join(
+            f"{_quote(column)} {type_}" for column, type_ in _columns(types)
+        )
+        self.connection.execute(f"CREATE TABLE {_quote(table)} ({columns})")
+
+    def _create_indexes(
+        self,
+        table: str,
+        types: t.Dict[str, t.Any],
+        indexes: t.Iterable[t.Union[str, t.Sequence[str]]],
+    ):
+        for index in indexes:
+            columns = (index,) if isinstance(index, str) else tuple(index)
+
+            unknown = [
+                column
+                for column in columns
+                if column not in types and column not in ("id", "write_date")
+            ]
+            if unknown:
+                raise APIError(f"Unknown index fields: {', '.join(unknown)}")
+
+            with self.connection:
+                self.connection.execute(
+                    "CREATE INDEX IF NOT EXISTS "
+                    f"{_quote('__'.join((table, *columns)))} ON {_quote(table)} "
+                    f"({', '.join(map(_quote, columns))})"
+                )
+
+    def _store(
+        self,
+        table: str,
+        types: t.Dict[str, t.Any],
+        records: t.List[t.Dict[str, t.Any]],
+    ):
+        columns = [column for column, _ in _columns(types)]
+        self.connection.executemany(
+            f"INSERT OR REPLACE INTO {_quote(table)} "
+            f"({', '.join(map(_quote, columns))}) "
+            f"VALUES ({', '.join('?' * len(columns))})",
+            (_row(record, types) for record in records),
+        )
+
+    def _server_watermark(
+        self,
+        model: "odoo_api_wrapper.Model",
+        domain: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Optional[str]:
+        """The latest `write_date` of the records matching `domain` on the server"""
+        records = model.api.search_read(
+            model.model_name,
+            [domain],
+            {
+                **kwargs,
+                "fields": ["write_date"],
+                "order": "write_date desc",
+                "limit": 1,
+            },
+        )
+        return records[0]["write_date"] if records else None
+
+    def _since(self, watermark: str) -> str:
+        """The `write_date` changes are fetched from"""
+        since = datetime.datetime.strptime(watermark[:19], "%Y-%m-%d %H:%M:%S")
+        since -= datetime.timedelta(seconds=self.overlap)
+        return since.strftime("%Y-%m-%d %H:%M:%S")
+
+    def _diff(
+        self,
+        model: "odoo_api_wrapper.Model",
+        table: str,
+        domain: t.List,
+        kwargs: t.Dict[str, t.Any],
+    ) -> t.Tuple[t.List[int], t.List[int]]:
+        """The ids missing from the replica, and the ids gone from the server"""
+        remote: t.Set[int] = set()
+        last_id = 0
+        while True:
+            ids = model.api.search(
+                model.model_name,
+                [[*domain, ["id", ">", last_id]]],
+                {**kwargs, "limit": ID_PAGE_SIZE, "order": "id"},
+            )
+            remote.update(ids)
+            if len(ids) < ID_PAGE_SIZE:
+                break
+            last_id = ids[-1]
+
+        local = {
+            id_ for (id_,) in self.connection.execute(f"SELECT id FROM {_quote(table)}")
+        }
+        return sorted(remote - local), sorted(local - remote)
@@ -0,0 +1,552 @@
+""" Pooled keep-alive transport
+
+`odoo_api_wrapper.transport.PooledTransport` is an `xmlrpc.client.Transport` that keeps
+a bounded pool of persistent HTTP/1.1 connections per host, caches DNS lookups and
+transparently reconnects when the server dropped an idle keep-alive socket. It is safe
+to share between threads, and is what `odoo_api_wrapper.api.Api` uses by default.
+
+## Usage Examples
+
+### Tune the pool
+```python
+import odoo_api_wrapper
+from odoo_api_wrapper.transport import PooledTransport
+
+transport = PooledTransport(pool_size=32, max_idle=30.0, dns_ttl=600.0)
+api = odoo_api_wrapper.Api(
+    "http://localhost:8069", "db", "1001", "password", transport=transport
+)
+```
+
+### Pre-warm connections
+Open the connections up front so the first calls don't pay for the handshakes.
+```python
+transport.prewarm("localhost:8069", 8)
+```
+
+### Time out
+`timeout` bounds how long a request waits for a connection from the pool and for each
+socket operation. Calls made through an `odoo_api_wrapper.api.Api` are also bounded by
+their deadline, see `DEADLINE`. Both bound stalls, not whole requests: a response sent
+slowly but steadily is read to its end.
+```python
+transport = PooledTransport(timeout=30.0)
+```
+
+### Compress requests
+Responses are gzip compressed by servers supporting it, e.g. behind nginx with
+`gzip_types text/xml application/json;`. Request bodies larger than `encode_threshold`
+bytes are gzip compressed too. Odoo itself does not decode compressed requests, a
+proxy in front of it has to: servers answering them with
+`415 Unsupported Media Type` are sent the request again uncompressed, and no compressed
+request after that.
+```python
+transport = PooledTransport(encode_threshold=1400)
+```
+
+### Release the sockets
+```python
+transport.close()
+```
+"""
+import collections
+import contextvars
+import gzip
+import http.client
+import socket
+import threading
+import time
+import typing as t
+import urllib.parse
+import xmlrpc.client
+
+import odoo_api_wrapper.decoder
+import odoo_api_wrapper.metrics
+
+# errors raised when a kept-alive connection was closed by the server while idle
+STALE_CONNECTION_ERRORS = (
+    http.client.RemoteDisconnected,
+    ConnectionResetError,
+    ConnectionAbortedError,
+    BrokenPipeError,
+)
+
+# the gzip compression level of request bodies, zlib's default: much faster than the
+# highest level, for slightly larger bodies
+COMPRESS_LEVEL = 6
+
+# the `time.monotonic()` time by which the requests made in the current context must be
+# done, set by `odoo_api_wrapper.api.Api.call`
+DEADLINE: "contextvars.ContextVar[t.Optional[float]]" = contextvars.ContextVar(
+    "odoo_api_wrapper_deadline", default=None
+)
+
+
+def time_left(timeout: t.Optional[float] = None) -> t.Optional[float]:
+    """The number of seconds left before `DEADLINE`, at most `timeout`
+
+    Returns `timeout` when there is no deadline, raises `socket.timeout` once it has
+    passed.
+    """
+    deadline = DEADLINE.get()
+    if deadline is None:
+        return timeout
+
+    left = deadline - time.monotonic()
+    if left <= 0:
+        raise socket.timeout("deadline exceeded")
+
+    return left if timeout is None else min(left, timeout)
+
+
+class DNSCache:
+    """Cache `socket.getaddrinfo` results for `ttl` seconds"""
+
+    def __init__(self, ttl: float = 300.0):
+        self.ttl = ttl
+        self._entries: t.Dict[t.Tuple[str, int], t.Tuple[float, t.List[str]]] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, host: str, port: int) -> t.List[str]:
+        """Resolve `host` to a list of addresses, using the cache when possible
+
+        Args:
+            host: the host name
+            port: the port to connect to
+        """
+        key = (host, port)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+
+        if entry is not None and entry[0] > now:
+            return entry[1]
+
+        addresses = list(
+            dict.fromkeys(
+                str(sockaddr[0])
+                for *_, sockaddr in socket.getaddrinfo(
+                    host, port, type=socket.SOCK_STREAM
+                )
+            )
+        )
+
+        with self._lock:
+            self._entries[key] = (now + self.ttl, addresses)
+
+        return addresses
+
+    def invalidate(self, host: str, port: int):
+        """Drop the cached addresses of `host`"""
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def create_connection(
+        self, address: t.Tuple[str, int], *args: t.Any
+    ) -> socket.socket:
+        """A drop-in replacement for `socket.create_connection` using the cache
+
+        Args:
+            address: a `(host, port)` pair
+            args: passed on to `socket.create_connection` (timeout, source address)
+        """
+        host, port = address
+        error: t.Optional[OSError] = None
+
+        for ip_address in self.resolve(host, port):
+            try:
+                return socket.create_connection((ip_address, port), *args)
+            except OSError as err:
+                error = err
+
+        # the cached addresses may be outdated, resolve again on the next attempt
+        self.invalidate(host, port)
+        if error is None:
+            error = OSError(f"could not resolve {host}")
+        raise error
+
+
+class ConnectionPool:
+    """A bounded pool of keep-alive connections to a single host
+
+    At most `maxsize` connections are handed out at once, `acquire` blocks until one is
+    released. Connections that sat idle for more than `max_idle` seconds are discarded
+    instead of being reused.
+    """
+
+    def __init__(
+        self,
+        factory: t.Callable[[], http.client.HTTPConnection],
+        maxsize: int = 10,
+        max_idle: t.Optional[float] = 60.0,
+    ):
+        self.factory = factory
+        self.maxsize = maxsize
+        self.max_idle = max_idle
+
+        self._idle: t.Deque[t.Tuple[float, http.client.HTTPConnection]]
+        self._idle = collections.deque()
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(maxsize)
+
+    def acquire(
+        self, timeout: t.Optional[float] = None
+    ) -> t.Tuple[http.client.HTTPConnection, bool]:
+        """Take a connection out of the pool
+
+        Args:
+            timeout: the number of seconds to wait for a connection, raises
+                `socket.timeout` past it (optional)
+
+        Returns a `(connection, reused)` pair, `reused` is true when the connection
+        already served a request and may have been closed by the server since.
+        """
+        if not self._slots.acquire(timeout=timeout):  # pylint:disable=R1732
+            raise socket.timeout("timed out waiting for a connection")
+
+        try:
+            while True:
+                with self._lock:
+                    if not self._idle:
+                        break
+                    released_at, connection = self._idle.pop()
+
+                if (
+                    self.max_idle is None
+                    or time.monotonic() - released_at <= self.max_idle
+                ):
+                    return connection, connection.sock is not None
+
+                connection.close()
+
+            return self.factory(), False
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, connection: http.client.HTTPConnection, reusable: bool = True):
+        """Give a connection back to the pool, closing it if it is not `reusable`"""
+        with self._lock:
+            reusable = reusable and len(self._idle) < self.maxsize
+            if reusable:
+                self._idle.append((time.monotonic(), connection))
+
+        if not reusable:
+            connection.close()
+
+        self._slots.release()
+
+    def prewarm(self, count: int) -> int:
+        """Open connections ahead of time until `count` of them are idle
+
+        Returns the number of connections opened.
+        """
+        opened: t.List[http.client.HTTPConnection] = []
+
+        try:
+            for _ in range(count - self.idle):
+                if not self._slots.acquire(blocking=False):  # pylint:disable=R1732
+                    break
+
+                try:
+                    connection = self.factory()
+                    connection.connect()
+                except BaseException:
+                    self._slots.release()
+                    raise
+
+                opened.append(connection)
+        finally:
+            for connection in opened:
+                self.release(connection)
+
+        return len(opened)
+
+    @property
+    def idle(self) -> int:
+        """Number of idle connections"""
+        return len(self._idle)
+
+    def close(self):
+        """Close all idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, collections.deque()
+
+        for _, connection in idle:
+            connection.close()
+
+
+class PooledTransport(xmlrpc.client.Transport):
+    """Thread-safe XML-RPC transport over pooled keep-alive HTTP connections"""
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        use_datetime: bool = False,
+        use_builtin_types: bool = False,
+        *,
+        headers: t.Iterable[t.Tuple[str, str]] = (),
+        pool_size: int = 10,
+        max_idle: t.Optional[float] = 60.0,
+        dns_ttl: float = 300.0,
+        fast_decoder: bool = False,
+        timeout: t.Optional[float] = None,
+        encode_threshold: t.Optional[int] = None,
+    ):
+        super().__init__(
+            use_datetime=use_datetime,
+            use_builtin_types=use_builtin_types,
+            headers=headers,
+        )
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.encode_threshold = encode_threshold
+        self.max_idle = max_idle
+        self.dns = DNSCache(dns_ttl)
+        self.fast_decoder = fast_decoder
+        self.verbose = False
+
+        self._pools: t.Dict[str, ConnectionPool] = {}
+        self._pools_lock = threading.Lock()
+        # the hosts which refused a compressed request
+        self.identity_hosts: t.Set[str] = set()
+
+    def pool(self, host: str) -> ConnectionPool:
+        """Get the connection pool of `host`, creating it if needed"""
+        with self._pools_lock:
+            pool = self._pools.get(host)
+            if pool is None:
+                pool = ConnectionPool(
+                    lambda: self.make_connection(host),
+                    maxsize=self.pool_size,
+                    max_idle=self.max_idle,
+                )
+                self._pools[host] = pool
+
+        return pool
+
+    def prewarm(self, host: str, count: t.Optional[int] = None) -> int:
+        """Open `count` connections to `host` (the whole pool by default)
+
+        Args:
+            host: the host as found in the url, e.g. `"localhost:8069"`
+            count: the number of connections to open (optional)
+        """
+        return self.pool(host).prewarm(self.pool_size if count is None else count)
+
+    def getparser(self) -> t.Tuple[t.Any, t.Any]:
+        """Create the response parser, a `odoo_api_wrapper.decoder.FastDecoder` when
+        `fast_decoder` is set"""
+        if self.fast_decoder:
+            return odoo_api_wrapper.decoder.getparser(
+                self._use_datetime, self._use_builtin_types
+            )
+        return super().getparser()
+
+    def make_connection(  # type: ignore[override]
+        self, host: str
+    ) -> http.client.HTTPConnection:
+        """Create a new, unpooled, connection to `host`"""
+        chost, _, _ = self.get_host_info(host)
+        connection = http.client.HTTPConnection(chost)
+        # pylint:disable=protected-access
+        connection._create_connection = self.dns.create_connection  # type: ignore
+        return connection
+
+    def request(  # type: ignore[override]
+        self,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool = False,
+    ) -> t.Any:
+        def _exchange(connection: http.client.HTTPConnection) -> t.Any:
+            response = self.send_pooled_request(
+                connection, host, handler, request_body, verbose
+            )
+            return self.read_response(host, handler, response, verbose)
+
+        return self.pooled(host, _exchange)
+
+    def pooled(
+        self,
+        host: str,
+        exchange: t.Callable[[http.client.HTTPConnection], t.Any],
+    ) -> t.Any:
+        """Run `exchange` with a connection to `host` taken from the pool
+
+        The exchange is retried once on a new connection when a reused one turns out
+        to have been closed by the server. Faults and HTTP errors leave the connection
+        reusable, any other error discards it. Waiting for a connection and each
+        socket operation are bounded by `timeout` and `DEADLINE`.
+
+        Args:
+            host: the host as found in the url, e.g. `"localhost:8069"`
+            exchange: sends a request and reads the whole response
+        """
+        pool = self.pool(host)
+
+        # retry once when a reused connection has gone cold
+        for attempt in (0, 1):
+            with odoo_api_wrapper.metrics.timed("wait"):
+                connection, reused = pool.acquire(time_left(self.timeout))
+            reusable = False
+
+            try:
+                # the deadline came closer while waiting for the connection
+                connection.timeout = time_left(self.timeout)
+                if connection.sock is not None:
+                    connection.sock.settimeout(connection.timeout)
+
+                result = exchange(connection)
+                reusable = True
+                return result
+            except (xmlrpc.client.Fault, xmlrpc.client.ProtocolError):
+                reusable = True
+                raise
+            except STALE_CONNECTION_ERRORS:
+                if attempt or not reused:
+                    raise
+            finally:
+                pool.release(connection, reusable)
+
+        raise AssertionError("unreachable")  # pragma: no cover
+
+    def send_pooled_request(  # pylint:disable=too-many-arguments
+        self,
+        connection: http.client.HTTPConnection,
+        host: str,
+        handler: str,
+        request_body: bytes,
+        verbose: bool,
+        content_type: str = "text/xml",
+    ) -> http.client.HTTPResponse:
+        """Send the request over `connection` and wait for the response headers
+
+        The body is gzip compressed past `encode_threshold` bytes, and sent again
+        uncompressed when the server does not support it.
+        """
+        compress = (
+            self.encode_threshold is not None
+            and len(request_body) > self.encode_threshold
+            and host not in self.identity_hosts
+        )
+        body = gzip.compress(request_body, COMPRESS_LEVEL) if compress else request_body
+
+        stats = odoo_api_wrapper.metrics.CURRENT.get()
+        if stats is not None:
+            stats.request_bytes += len(body)
+            stats.request_uncompressed_bytes += len(request_body)
+
+        _, extra_headers, _ = self.get_host_info(host)
+        headers = self._headers + extra_headers
+
+        connection.set_debuglevel(1 if verbose else 0)
+        if self.accept_gzip_encoding:
+            connection.putrequest("POST", handler, skip_accept_encoding=True)
+            headers.append(("Accept-Encoding", "gzip"))
+        else:
+            connection.putrequest("POST", handler)
+        headers.append(("Content-Type", content_type))
+        headers.append(("User-Agent", self.user_agent))
+        if compress:
+            headers.append(("Content-Encoding", "gzip"))
+        headers.append(("Content-Length", str(len(body))))
+
+        with odoo_api_wrapper.metrics.timed("network"):
+            self.send_headers(connection, headers)
+            connection.endheaders(body)
+
+            response = connection.getresponse()
+            if not compress or response.status != 415:
+                return response
+
+            # drain the body so the connection can be reused
+            response.read()
+
+        self.identity_hosts.add(host)
+        return self.send_pooled_request(
+            connection, host, handler, request_body, verbose, content_type
+        )
+
+    def read_response(
+        self,
+        host: str,
+        handler: str,
+        response: http.client.HTTPResponse,
+        verbose: bool,
+    ) -> t.Any:
+        """Parse a response, raising `xmlrpc.client.ProtocolError` on HTTP errors"""
+        if response.status == 200:
+            self.verbose = verbose
+            if odoo_api_wrapper.metrics.CURRENT.get() is None:
+                return self.parse_response(response)
+
+            return self.read_timed_response(response)
+
+        # drain the body so the connection can be reused
+        response.read()
+        raise xmlrpc.client.ProtocolError(
+            host + handler,
+            response.status,
+            response.reason,
+            dict(response.getheaders()),
+        )
+
+    def read_timed_response(self, response: http.client.HTTPResponse) -> t.Any:
+        """Read the response whole then parse it, timing both in the current
+        `odoo_api_wrapper.metrics.CallStats`"""
+        with odoo_api_wrapper.metrics.timed("network"):
+            body = response.read()
+
+        stats = t.cast(
+            odoo_api_wrapper.metrics.CallStats, odoo_api_wrapper.metrics.CURRENT.get()
+        )
+        stats.response_bytes += len(body)
+
+        with odoo_api_wrapper.metrics.timed("unmarshal"):
+            if response.getheader("Content-Encoding", "") == "gzip":
+                body = gzip.decompress(body)
+            stats.response_uncompressed_bytes += len(body)
+
+            parser, unmarshaller = self.getparser()
+            parser.feed(body)
+            parser.close()
+            return unmarshaller.close()
+
+    def close(self):
+        """Close the idle connections of every pool"""
+        with self._pools_lock:
+            pools = list(self._pools.values())
+
+        for pool in pools:
+            pool.close()
+
+
+class PooledSafeTransport(PooledTransport):
+    """Thread-safe XML-RPC transport over pooled keep-alive HTTPS connections"""
+
+    def __init__(self, *args: t.Any, context: t.Any = None, **kwargs: t.Any):
+        super().__init__(*args, **kwargs)
+        self.context = context
+
+    def make_connection(  # type: ignore[override]
+        self, host: str
+    ) -> http.client.HTTPConnection:
+        chost, _, _ = self.get_host_info(host)
+        connection = http.client.HTTPSConnection(chost, context=self.context)
+        # pylint:disable=protected-access
+        connection._create_connection = self.dns.create_connection  # type: ignore
+        return connection
+
+
+def from_url(url: str, **kwargs: t.Any) -> PooledTransport:
+    """Create the pooled transport matching the scheme of `url`
+
+    Args:
+        url: the server url
+        kwargs: passed on to the transport
+    """
+    if urllib.parse.urlsplit(url).scheme == "https":
+        return PooledSafeTransport(**kwargs)
+    return PooledTransport(**kwargs)
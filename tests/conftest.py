@@ -1,12 +1,70 @@
 """ test configutation """
 # pylint:disable=redefined-outer-name
 import random
+import socketserver
 import string
+import threading
+import xmlrpc.server
 from unittest import mock
 
 import pytest
 
 
+class _RequestHandler(xmlrpc.server.SimpleXMLRPCRequestHandler):
+    """keep-alive request handler"""
+
+    protocol_version = "HTTP/1.1"
+    rpc_paths = ("/xmlrpc/2/object",)
+
+    def setup(self):
+        super().setup()
+        self.server.connections += 1
+
+    def do_POST(self):
+        super().do_POST()
+        if self.server.drop_connections:
+            self.close_connection = True
+
+    def decode_request_content(self, data):
+        encoding = self.headers.get("content-encoding", "identity").lower()
+        self.server.encodings.append(encoding)
+
+        if self.server.identity_only and encoding != "identity":
+            self.send_response(415)
+            self.send_header("Accept-Encoding", "identity")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return None
+
+        return super().decode_request_content(data)
+
+    def log_message(self, *args):  # pylint:disable=arguments-differ
+        pass
+
+
+class _Server(socketserver.ThreadingMixIn, xmlrpc.server.SimpleXMLRPCServer):
+    """threaded xml-rpc server"""
+
+    daemon_threads = True
+    block_on_close = False
+
+    connections = 0
+    drop_connections = False
+    identity_only = False
+
+    @property
+    def url(self):
+        """the server url"""
+        host, port = self.server_address
+        return f"http://{host}:{port}"
+
+    @property
+    def host(self):
+        """the server host, as passed to transports"""
+        host, port = self.server_address
+        return f"{host}:{port}"
+
+
 @pytest.fixture
 def random_string():
     """random string generator"""
@@ -35,6 +93,28 @@ def mock_server():
         yield
 
 
+@pytest.fixture
+def xmlrpc_server():
+    """a local server answering `execute_kw` with its parameters"""
+    server = _Server(
+        ("127.0.0.1", 0),
+        requestHandler=_RequestHandler,
+        logRequests=False,
+        allow_none=True,
+    )
+    server.register_function(lambda *params: list(params), "execute_kw")
+    # the content encoding of each request
+    server.encodings = []
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
 @pytest.fixture
 def model_name(random_string):
     """model_name fixture"""
@@ -0,0 +1,293 @@
+""" `odoo_api_wrapper.aio` tests """
+# pylint:disable=redefined-outer-name
+import asyncio
+import gzip
+import socket
+import time
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.aio import AsyncApi
+from odoo_api_wrapper.aio import AsyncModel
+from odoo_api_wrapper.aio import AsyncTransport
+from odoo_api_wrapper.aio import read_response
+
+
+def run(coroutine):
+    """run a coroutine to completion"""
+    return asyncio.run(coroutine)
+
+
+def test_api_operations(xmlrpc_server, init_params, model_name):
+    """test every operation is a coroutine calling `execute_kw`"""
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            for operation in odoo_api_wrapper.Operations:
+                result = await getattr(api, operation.value)(model_name, [[1]])
+                assert result == [
+                    *init_params[1:],
+                    model_name,
+                    operation.value,
+                    [[1]],
+                    {},
+                ]
+
+    run(_test())
+    assert xmlrpc_server.connections == 1
+
+
+def test_model_operations(xmlrpc_server, init_params, model_name):
+    """test `AsyncModel` binds the model name"""
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            model = AsyncModel(api, model_name)
+            return await model.search_read([[]], {"limit": 5})
+
+    assert run(_test()) == [
+        *init_params[1:],
+        model_name,
+        "search_read",
+        [[]],
+        {"limit": 5},
+    ]
+
+
+def test_concurrency_limit(xmlrpc_server, init_params, model_name):
+    """test concurrent calls never use more than `max_connections` connections"""
+
+    async def _test():
+        async with AsyncApi(
+            xmlrpc_server.url, *init_params[1:], max_connections=2
+        ) as api:
+            return await asyncio.gather(
+                *(api.read(model_name, [[i]]) for i in range(20))
+            )
+
+    results = run(_test())
+
+    assert [result[5] for result in results] == [[[i]] for i in range(20)]
+    assert xmlrpc_server.connections <= 2
+
+
+def test_stale_connection(xmlrpc_server, init_params, model_name):
+    """test a connection closed by the server is transparently replaced"""
+    xmlrpc_server.drop_connections = True
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            await api.search(model_name, [[]])
+            return await api.search(model_name, [[]])
+
+    assert run(_test())
+    assert xmlrpc_server.connections == 2
+
+
+def test_max_idle(xmlrpc_server, init_params, model_name):
+    """test connections idle for too long are not reused"""
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            api.transport.max_idle = -1
+            await api.search(model_name, [[]])
+            await api.search(model_name, [[]])
+
+    run(_test())
+    assert xmlrpc_server.connections == 2
+
+
+@pytest.mark.parametrize(
+    "requests, error",
+    [
+        # a disconnect on a fresh connection is not retried
+        (0, ConnectionResetError()),
+        # nor a second one on a reused connection
+        (1, asyncio.IncompleteReadError(b"", 10)),
+        (1, ConnectionResetError("connection closed by the server")),
+    ],
+)
+def test_connection_error(init_params, model_name, requests, error):
+    """test connection errors raise `odoo_api_wrapper.APIError`"""
+
+    async def _test():
+        async with AsyncApi("http://localhost:8069", *init_params[1:]) as api:
+            connection = mock.Mock(requests=requests)
+            with mock.patch.object(api.transport, "connect", return_value=connection):
+                with mock.patch.object(
+                    api.transport, "send_request", side_effect=error
+                ) as send_request:
+                    try:
+                        await api.search(model_name, [[]])
+                    finally:
+                        assert send_request.call_count == 1 + requests
+
+    with pytest.raises(odoo_api_wrapper.APIError) as raised:
+        run(_test())
+
+    assert raised.value.__cause__ is error
+
+
+def test_connection_refused(init_params, model_name):
+    """test refused connections raise `odoo_api_wrapper.APIError`"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+
+    async def _test():
+        async with AsyncApi(f"http://127.0.0.1:{port}", *init_params[1:]) as api:
+            await api.search(model_name, [[]])
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        run(_test())
+
+
+def test_fault(xmlrpc_server, init_params, model_name):
+    """test faults raise `odoo_api_wrapper.APIError`"""
+
+    def _fault(*params):
+        raise ValueError("boom")
+
+    xmlrpc_server.register_function(_fault, "execute_kw")
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            await api.search(model_name, [[]])
+
+    with pytest.raises(odoo_api_wrapper.APIError) as error:
+        run(_test())
+
+    assert "boom" in str(error.value)
+
+
+def test_protocol_error(xmlrpc_server, init_params, model_name):
+    """test http errors raise `odoo_api_wrapper.APIError`"""
+
+    async def _test():
+        async with AsyncApi(f"{xmlrpc_server.url}/missing", *init_params[1:]) as api:
+            await api.search(model_name, [[]])
+
+    with pytest.raises(odoo_api_wrapper.APIError, match="HTTP 404") as error:
+        run(_test())
+
+    assert isinstance(error.value.__cause__, xmlrpc.client.ProtocolError)
+
+
+def test_invalid_operation(init_params, random_string, model_name, args, kwargs):
+    """test with an invalid operation"""
+
+    async def _test():
+        async with AsyncApi(*init_params) as api:
+            await api.call(model_name, random_string(), args, kwargs)
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        run(_test())
+
+
+def test_socket_gaierror(init_params, random_string, model_name, args, kwargs):
+    """test that raises `socket.gaierror`"""
+
+    async def _test():
+        async with AsyncApi(*init_params) as api:
+            with mock.patch(
+                "asyncio.open_connection",
+                side_effect=socket.gaierror(random_string(), random_string()),
+            ):
+                await api.search(model_name, args, kwargs)
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        run(_test())
+
+
+def test_https():
+    """test https urls use tls"""
+    transport = AsyncTransport("https://localhost/odoo")
+    assert transport.ssl is True
+    assert transport.port == 443
+
+    assert AsyncTransport("http://localhost").port == 80
+
+
+GZIPPED = gzip.compress(b"ok")
+
+
+def _reader(data):
+    reader = asyncio.StreamReader()
+    reader.feed_data(data)
+    reader.feed_eof()
+    return reader
+
+
+@pytest.mark.parametrize(
+    "data, body, will_close",
+    [
+        (b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\nok", b"ok", False),
+        (b"HTTP/1.0 200 OK\r\nContent-Length: 2\r\n\r\nok", b"ok", True),
+        (b"HTTP/1.1 200\r\nConnection: close\r\n\r\nok", b"ok", True),
+        (
+            b"HTTP/1.1 200 OK\r\nTransfer-Encoding: chunked\r\n\r\n"
+            b"2\r\nok\r\n3;ext\r\n!!!\r\n0\r\nX-Trailer: 1\r\n\r\n",
+            b"ok!!!",
+            False,
+        ),
+        (
+            b"HTTP/1.1 200 OK\r\nContent-Encoding: gzip\r\nContent-Length: %d\r\n\r\n%s"
+            % (len(GZIPPED), GZIPPED),
+            b"ok",
+            False,
+        ),
+    ],
+)
+def test_read_response(data, body, will_close):
+    """test parsing http responses"""
+
+    async def _test():
+        return await read_response(_reader(data))
+
+    response = run(_test())
+    assert response.status == 200
+    assert response.body == body
+    assert response.will_close == will_close
+
+
+def test_read_closed_response():
+    """test reading from a closed connection"""
+
+    async def _test():
+        await read_response(_reader(b""))
+
+    with pytest.raises(ConnectionResetError):
+        run(_test())
+
+
+def test_timeout(xmlrpc_server, init_params, model_name):
+    """test slow calls raise `odoo_api_wrapper.APITimeoutError`"""
+
+    def _slow(*params):
+        time.sleep(0.5)
+
+    xmlrpc_server.register_function(_slow, "execute_kw")
+
+    async def _test():
+        async with AsyncApi(xmlrpc_server.url, *init_params[1:]) as api:
+            await api.search(model_name, [[]], timeout=0.05)
+
+    with pytest.raises(odoo_api_wrapper.APITimeoutError):
+        run(_test())
+
+
+def test_socket_timeout(init_params, model_name):
+    """test socket timeouts raise `odoo_api_wrapper.APITimeoutError`"""
+
+    async def _test():
+        async with AsyncApi(*init_params) as api:
+            with mock.patch(
+                "asyncio.open_connection", side_effect=socket.timeout("timed out")
+            ):
+                await api.search(model_name, [[]])
+
+    with pytest.raises(odoo_api_wrapper.APITimeoutError):
+        run(_test())
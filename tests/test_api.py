@@ -1,12 +1,15 @@
 """ `odoo_api_wrapper.api.Api` tests """
 # pylint:disable=too-many-arguments
 import socket
+import threading
+import time
 import xmlrpc.client
 from unittest import mock
 
 import pytest
 
 import odoo_api_wrapper
+import odoo_api_wrapper.aio
 
 
 def test_api_init(init_params):
@@ -14,6 +17,48 @@ def test_api_init(init_params):
     assert odoo_api_wrapper.Api(*init_params)
 
 
+@pytest.mark.parametrize(
+    "cls, on_model",
+    [
+        (odoo_api_wrapper.Api, False),
+        (odoo_api_wrapper.Model, True),
+        (odoo_api_wrapper.aio.AsyncApi, False),
+        (odoo_api_wrapper.aio.AsyncModel, True),
+    ],
+)
+def test_operation_methods(cls, on_model):
+    """test every operation is defined once, on the class"""
+    for operation in odoo_api_wrapper.Operations.__members__.values():
+        method = getattr(cls, operation.value)
+        assert isinstance(method, odoo_api_wrapper.api.OperationMethod)
+        assert method.operation is operation
+        assert method.on_model is on_model
+
+
+def test_lazy_server(mock_server, init_params, model_name):
+    """test the server proxy is created on first use, once"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    assert "server" not in api.__dict__
+    assert odoo_api_wrapper.Api.server is vars(odoo_api_wrapper.Api)["server"]
+
+    api.search(model_name, [[]])
+    assert api.server is api.__dict__["server"]
+    odoo_api_wrapper.api.xmlrpc.client.ServerProxy.assert_called_once()
+
+
+def test_model_registry(init_params, model_name):
+    """test models are created once per name"""
+    api = odoo_api_wrapper.Api(*init_params)
+
+    model = api[model_name]
+    assert isinstance(model, odoo_api_wrapper.Model)
+    assert model.api is api and model.model_name == model_name
+    assert api[model_name] is model
+    assert api["res.partner"] is not model
+
+
 def test_api_search(mock_server, init_params, model_name):
     """test api.search"""
     del mock_server
@@ -191,3 +236,547 @@ def test_error_description(init_params, random_string, model_name, args, kwargs)
             api.search(model_name, args, kwargs)
         except odoo_api_wrapper.APIError as error:
             assert str(error) == f"[Errno {error_no}] {error_string}"
+
+
+def test_call_many(mock_server, init_params, model_name):
+    """test api.call_many returns the results in order"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params, max_workers=3) as api:
+        threads = set()
+
+        def _execute_kw(*params):
+            threads.add(threading.current_thread().name)
+            time.sleep(0.01)
+            return params[5][0]
+
+        api.server.execute_kw.side_effect = _execute_kw
+
+        calls = [
+            (odoo_api_wrapper.Operations.READ, model_name, [i], {"fields": ["name"]})
+            for i in range(12)
+        ]
+        calls.append((odoo_api_wrapper.Operations.SEARCH, model_name, [12]))
+
+        assert api.call_many(calls) == list(range(13))
+        assert 1 < len(threads) <= 3
+
+
+def test_call_many_error(mock_server, init_params, model_name):
+    """test api.call_many raises the errors of its calls"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params) as api:
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.call_many([("read", model_name, [[1]])])
+
+
+def test_nested_map(mock_server, init_params):
+    """test mapping from a worker runs inline instead of waiting on the pool"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params, max_workers=1) as api:
+        assert api.map(lambda i: api.map(lambda j: i * j, [1, 2]), [1, 2]) == [
+            [1, 2],
+            [2, 4],
+        ]
+
+
+def test_close(mock_server, init_params):
+    """test closing the api shuts the worker pool down"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    executor = api.executor
+    assert api.executor is executor
+    api.close()
+
+    assert api.executor is not executor
+    api.close()
+    api.close()
+
+
+def _search_read(ids):
+    """fake `search_read` over `ids`, honouring `id >` leaves and `limit`"""
+
+    def _execute_kw(*params):
+        [domain], kwargs = params[5:]
+        last_id = max(leaf[2] for leaf in domain if leaf[:2] == ["id", ">"])
+        return [{"id": i} for i in ids if i > last_id][: kwargs["limit"]]
+
+    return _execute_kw
+
+
+def test_iter_search_read(mock_server, init_params, model_name):
+    """test api.iter_search_read pages with `id >` conditions"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    ids = [1, 2, 5, 8, 9, 13, 20]
+    api.server.execute_kw.side_effect = _search_read(ids)
+
+    records = api.iter_search_read(
+        model_name,
+        [["active", "=", True]],
+        ["name"],
+        batch_size=3,
+        kwargs={"context": {"lang": "en_US"}},
+    )
+    assert [record["id"] for record in records] == ids
+
+    assert [call[0][5:] for call in api.server.execute_kw.call_args_list] == [
+        (
+            [[["active", "=", True], ["id", ">", last_id]]],
+            {
+                "context": {"lang": "en_US"},
+                "limit": 3,
+                "order": "id",
+                "fields": ["name"],
+            },
+        )
+        for last_id in (0, 5, 13)
+    ]
+
+
+def test_iter_search_read_batched(mock_server, init_params, model_name):
+    """test api.iter_search_read yielding batches"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    api.server.execute_kw.side_effect = _search_read([1, 2, 3, 4])
+
+    batches = list(api.iter_search_read(model_name, [], batch_size=2, batched=True))
+
+    assert batches == [[{"id": 1}, {"id": 2}], [{"id": 3}, {"id": 4}]]
+    # the last page was full, an empty one ends the iteration
+    assert api.server.execute_kw.call_count == 3
+    assert "fields" not in api.server.execute_kw.call_args[0][6]
+
+
+def test_api_name_search(mock_server, init_params, model_name):
+    """test api.name_search"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    api.server.execute_kw.return_value = [[1, "Azure Interior"]]
+
+    assert api.name_search(model_name, ["Azure"], {"limit": 8}) == [
+        [1, "Azure Interior"]
+    ]
+    api.server.execute_kw.assert_called_with(
+        *init_params[1:], model_name, "name_search", ["Azure"], {"limit": 8}
+    )
+
+
+def test_iter_read_group(mock_server, init_params, model_name):
+    """test api.iter_read_group pages over the groups"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    groups = [{"partner_id": [i, f"P{i}"], "__count": i} for i in range(1, 6)]
+    api.server.execute_kw.side_effect = lambda *params: groups[
+        params[6]["offset"] : params[6]["offset"] + params[6]["limit"]
+    ]
+
+    assert (
+        list(
+            api.iter_read_group(
+                model_name,
+                [["state", "=", "posted"]],
+                ["debit:sum"],
+                ["partner_id", "date:month"],
+                page_size=2,
+                kwargs={"context": {"lang": "en_US"}},
+            )
+        )
+        == groups
+    )
+    assert [call[0][4:] for call in api.server.execute_kw.call_args_list] == [
+        (
+            "read_group",
+            [[["state", "=", "posted"]], ["debit:sum"], ["partner_id", "date:month"]],
+            {
+                "context": {"lang": "en_US"},
+                "lazy": False,
+                "limit": 2,
+                "orderby": "partner_id, date",
+                "offset": offset,
+            },
+        )
+        for offset in (0, 2, 4)
+    ]
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        next(api.iter_read_group(model_name, [], [], [], page_size=0))
+
+
+def test_aggregate(mock_server, init_params, model_name):
+    """test api.aggregate keys the aggregates by group"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    api.server.execute_kw.return_value = [
+        {
+            "partner_id": [7, "Azure"],
+            "date:month": "January 2024",
+            "debit": 1250.0,
+            "total": 10.0,
+            "__count": 3,
+            "__domain": [],
+        },
+        {
+            "partner_id": False,
+            "date:month": "January 2024",
+            "debit": 5.0,
+            "__count": 1,
+            "__domain": [],
+        },
+    ]
+
+    assert api.aggregate(
+        model_name,
+        [],
+        ["debit:sum", "total:sum(credit)", "partner_id"],
+        ["partner_id", "date:month"],
+        timeout=10,
+    ) == {
+        (7, "January 2024"): {"debit": 1250.0, "total": 10.0, "__count": 3},
+        (False, "January 2024"): {"debit": 5.0, "__count": 1},
+    }
+    assert api.server.execute_kw.call_args[0][6]["orderby"] == "partner_id, date"
+
+
+def test_iter_search_read_batch_size(mock_server, init_params, model_name):
+    """test api.iter_search_read with an invalid batch size"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        next(api.iter_search_read(model_name, [], batch_size=0))
+
+
+def test_read_chunked(mock_server, init_params, model_name):
+    """test api.read splits ids into concurrent calls and keeps their order"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params, max_workers=3) as api:
+        ids = [7, 3, 9, 1, 4, 8, 2]
+
+        def _execute_kw(*params):
+            [chunk], kwargs = params[5:]
+            assert len(chunk) <= 3 and kwargs == {"fields": ["name"]}
+            # odoo doesn't promise any order
+            return [{"id": id_, "name": str(id_)} for id_ in sorted(chunk)]
+
+        api.server.execute_kw.side_effect = _execute_kw
+
+        records = api.read(model_name, [ids], {"fields": ["name"]}, chunk_size=3)
+
+        assert [record["id"] for record in records] == ids
+        assert api.server.execute_kw.call_count == 3
+
+
+def test_write_unlink_chunked(mock_server, init_params, model_name):
+    """test api.write and api.unlink by chunks"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params) as api:
+        api.server.execute_kw.return_value = True
+
+        assert api.write(model_name, [list(range(5)), {"active": False}], chunk_size=2)
+        assert [call[0][5] for call in api.server.execute_kw.call_args_list] == [
+            [[0, 1], {"active": False}],
+            [[2, 3], {"active": False}],
+            [[4], {"active": False}],
+        ]
+
+        api.server.execute_kw.side_effect = [True, False]
+        assert not api.unlink(model_name, [[1, 2, 3]], chunk_size=2)
+
+
+def test_chunked_error(init_params, model_name):
+    """test errors of chunked calls"""
+    api = odoo_api_wrapper.Api(*init_params, max_workers=1)
+
+    with api, mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = [
+            [{"id": 1}],
+            xmlrpc.client.Fault(1, "chunk failed"),
+        ]
+
+        with pytest.raises(odoo_api_wrapper.APIError) as error:
+            api.read(model_name, [[1, 2]], chunk_size=1)
+        assert str(error.value) == "chunk failed"
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.search(model_name, [[]], chunk_size=1)
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.read(model_name, [[1, 2]], chunk_size=0)
+
+
+def test_chunked_error_waits(init_params, model_name):
+    """test a failing chunk raises once the other chunks are done"""
+    api = odoo_api_wrapper.Api(*init_params, max_workers=4)
+    done = []
+
+    def _execute_kw(*params):
+        [[id_], _] = params[5]
+        if id_ in (1, 3):
+            raise xmlrpc.client.Fault(1, f"chunk {id_} failed")
+
+        time.sleep(0.05)
+        done.append(id_)
+        return True
+
+    with api, mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = _execute_kw
+
+        with pytest.raises(odoo_api_wrapper.APIError, match="chunk 1 failed"):
+            api.write(model_name, [[1, 2, 3, 4], {"active": False}], chunk_size=1)
+
+        assert sorted(done) == [2, 4]
+
+
+def test_create_many(mock_server, init_params, model_name):
+    """test api.create_many returns the ids in the order of the records"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params, max_workers=3) as api:
+
+        def _execute_kw(*params):
+            [values] = params[5]
+            time.sleep(0.01 * (3 - values[0]["index"] // 2))
+            return [100 + value["index"] for value in values]
+
+        api.server.execute_kw.side_effect = _execute_kw
+        records = [{"index": index} for index in range(5)]
+
+        assert api.create_many(model_name, records, chunk_size=2) == [
+            100,
+            101,
+            102,
+            103,
+            104,
+        ]
+        assert api.server.execute_kw.call_count == 3
+        assert api.create_many(model_name, []) == []
+
+
+def test_create_many_error(init_params, model_name):
+    """test api.create_many reports the failed chunks"""
+    api = odoo_api_wrapper.Api(*init_params, max_workers=1)
+
+    with api, mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = [
+            [1, 2],
+            xmlrpc.client.Fault(1, "missing name"),
+            [3],
+        ]
+
+        with pytest.raises(odoo_api_wrapper.BulkCreateError) as error:
+            api.create_many(model_name, [{}] * 5, chunk_size=2)
+
+    assert isinstance(error.value, odoo_api_wrapper.APIError)
+    assert error.value.ids == [1, 2, None, None, 3]
+    [(index, chunk_error)] = error.value.errors
+    assert index == 2
+    assert str(chunk_error) == "missing name"
+    assert str(error.value) == "1 chunk(s) failed, first at record 2: missing name"
+
+
+def _database(*params):
+    """fake database of sale orders, their lines and partners"""
+    method, args, kwargs = params[4:]
+
+    if method == "fields_get":
+        return {
+            field: relation
+            for field, relation in {
+                "name": {"type": "char"},
+                "partner_id": {"type": "many2one", "relation": "res.partner"},
+                "user_id": {"type": "many2one", "relation": "res.partner"},
+                "order_line": {"type": "one2many", "relation": "sale.order.line"},
+            }.items()
+            if field in kwargs["allfields"]
+        }
+
+    if method == "search_read":
+        return [
+            {
+                "id": 1,
+                "partner_id": [10, "a"],
+                "user_id": [11, "b"],
+                "order_line": [3, 1],
+            },
+            {"id": 2, "partner_id": [10, "a"], "user_id": False, "order_line": [2]},
+            {"id": 3, "partner_id": False, "user_id": False, "order_line": []},
+        ][: kwargs.get("limit")]
+
+    return [
+        {"id": id_, **{field: id_ for field in kwargs["fields"]}} for id_ in args[0]
+    ]
+
+
+def test_prefetch(mock_server, init_params, model_name):
+    """test related records are read once per model and stitched in"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params) as api:
+        api.server.execute_kw.side_effect = _database
+
+        orders = api.search_read(
+            model_name,
+            [[]],
+            {"fields": ["name", "user_id"]},
+            prefetch={
+                "partner_id": ["name"],
+                "user_id": ["email"],
+                "order_line": ["price"],
+            },
+        )
+
+        assert orders == [
+            {
+                "id": 1,
+                "partner_id": {"id": 10, "name": 10, "email": 10},
+                "user_id": {"id": 11, "name": 11, "email": 11},
+                "order_line": [{"id": 3, "price": 3}, {"id": 1, "price": 1}],
+            },
+            {
+                "id": 2,
+                "partner_id": {"id": 10, "name": 10, "email": 10},
+                "user_id": False,
+                "order_line": [{"id": 2, "price": 2}],
+            },
+            {"id": 3, "partner_id": False, "user_id": False, "order_line": []},
+        ]
+        assert orders[0]["partner_id"] is orders[1]["partner_id"]
+
+        calls = {
+            call[0][3]: call[0][5:] for call in api.server.execute_kw.call_args_list
+        }
+        assert calls[model_name][1]["fields"] == [
+            "name",
+            "user_id",
+            "partner_id",
+            "order_line",
+        ]
+        assert calls["res.partner"] == ([[10, 11]], {"fields": ["name", "email"]})
+        assert calls["sale.order.line"] == ([[3, 1, 2]], {"fields": ["price"]})
+        assert api.server.execute_kw.call_count == 4
+
+
+def test_prefetch_nothing_related(mock_server, init_params, model_name):
+    """test related models without records aren't read"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params) as api:
+        api.server.execute_kw.side_effect = _database
+
+        assert (
+            api.search_read(
+                model_name, [[]], {"limit": 0}, prefetch={"partner_id": ["name"]}
+            )
+            == []
+        )
+        assert api.server.execute_kw.call_count == 2
+
+
+def test_prefetch_errors(mock_server, init_params, model_name):
+    """test prefetching non relational fields or from other operations"""
+    del mock_server
+
+    with odoo_api_wrapper.Api(*init_params) as api:
+        api.server.execute_kw.side_effect = _database
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.read(model_name, [[1]], prefetch={"name": ["id"]})
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.search(model_name, [[]], prefetch={"partner_id": ["name"]})
+
+
+def test_socket_timeout(init_params, model_name):
+    """test socket timeouts raise `odoo_api_wrapper.APITimeoutError`"""
+    api = odoo_api_wrapper.Api(*init_params)
+
+    with mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = socket.timeout("timed out")
+
+        with pytest.raises(odoo_api_wrapper.APITimeoutError):
+            api.search(model_name, [[]])
+
+
+def test_connection_error(init_params, model_name):
+    """test connection errors raise `odoo_api_wrapper.APIError`"""
+    api = odoo_api_wrapper.Api(*init_params)
+
+    with mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = ConnectionRefusedError("refused")
+
+        with pytest.raises(odoo_api_wrapper.APIError) as error:
+            api.search(model_name, [[]])
+
+    assert not isinstance(error.value, odoo_api_wrapper.APITimeoutError)
+
+
+def test_deadline_exceeded(mock_server, init_params, model_name):
+    """test calls past their deadline are not sent"""
+    api = odoo_api_wrapper.Api(*init_params)
+
+    with pytest.raises(odoo_api_wrapper.APITimeoutError):
+        api.search(model_name, [[]], deadline=time.monotonic() - 1)
+
+    del mock_server
+    api.server.execute_kw.assert_not_called()
+
+
+def test_deadline(init_params):
+    """test nested deadlines keep the earliest one"""
+    api = odoo_api_wrapper.Api(*init_params, timeout=None)
+
+    with api.deadline() as deadline:
+        assert deadline is None
+
+    with api.deadline(timeout=10) as deadline:
+        with api.deadline(timeout=100) as inner:
+            assert inner == deadline
+
+        with api.deadline(deadline=deadline - 5) as inner:
+            assert inner == deadline - 5
+
+    with api.deadline(timeout=10) as deadline:
+        assert deadline == pytest.approx(time.monotonic() + 10, abs=1)
+
+
+def test_deadline_propagation(mock_server, init_params, model_name):
+    """test chunks, concurrent calls and pages share the caller's deadline"""
+    api = odoo_api_wrapper.Api(*init_params)
+    deadlines = []
+
+    def _execute_kw(*params):
+        deadlines.append(odoo_api_wrapper.transport.DEADLINE.get())
+        if params[4] == "read":
+            return [{"id": id_} for id_ in params[5][0]]
+        if params[4] == "search_read":
+            return _search_read([1])(*params)
+        return [1]
+
+    del mock_server
+    api.server.execute_kw.side_effect = _execute_kw
+    deadline = time.monotonic() + 60
+
+    api.read(model_name, [[1, 2, 3]], chunk_size=1, deadline=deadline)
+    api.call_many(
+        [(odoo_api_wrapper.Operations.SEARCH, model_name, [[]])] * 2,
+        deadline=deadline,
+    )
+    list(api.iter_search_read(model_name, [], batch_size=1, deadline=deadline))
+    api.create_many(model_name, [{}, {}], chunk_size=1, deadline=deadline)
+
+    assert deadlines == [deadline] * 9
+
+    api.search(model_name, [[]])
+    assert deadlines[-1] == pytest.approx(time.monotonic() + api.timeout, abs=1)
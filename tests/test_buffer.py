@@ -0,0 +1,116 @@
+""" `odoo_api_wrapper.buffer` tests """
+# pylint:disable=redefined-outer-name
+import time
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.buffer import WriteBuffer
+
+
+@pytest.fixture
+def api(mock_server, init_params):
+    """create an api instance"""
+    del mock_server
+    with odoo_api_wrapper.Api(*init_params, max_workers=1) as api:
+        yield api
+
+
+def _writes(api):
+    return [call[0][3:6] for call in api.server.execute_kw.call_args_list]
+
+
+def test_commit(api, model_name):
+    """test updates are merged per record and grouped by values"""
+    buffer = WriteBuffer(api)
+
+    buffer.write(model_name, [1, 2], {"active": False})
+    buffer.write(model_name, [3], {"active": False})
+    buffer.write(model_name, [2], {"comment": "archived"})
+    buffer.write(model_name, [4], {"comment": "archived"})
+    buffer.write(model_name, [4], {"active": False})
+    buffer.write("res.company", [1], {"active": False})
+    assert len(buffer) == 5
+
+    assert buffer.commit() == 3
+    assert _writes(api) == [
+        (model_name, "write", [[1, 3], {"active": False}]),
+        (model_name, "write", [[2, 4], {"active": False, "comment": "archived"}]),
+        ("res.company", "write", [[1], {"active": False}]),
+    ]
+    assert not buffer
+    assert buffer.commit() == 0
+
+
+def test_x2many_commands(api, model_name):
+    """test x2many commands are appended to each other, other values replaced"""
+    buffer = WriteBuffer(api)
+
+    buffer.write(model_name, [1], {"category_id": [(4, 7)], "name": "a"})
+    buffer.write(model_name, [1], {"category_id": [(4, 8), (3, 2)], "name": "b"})
+    buffer.write(model_name, [2], {"category_id": [(6, 0, [1])]})
+    buffer.write(model_name, [2], {"category_id": False})
+
+    buffer.commit()
+    assert _writes(api) == [
+        (
+            model_name,
+            "write",
+            [[1], {"category_id": [(4, 7), (4, 8), (3, 2)], "name": "b"}],
+        ),
+        (model_name, "write", [[2], {"category_id": False}]),
+    ]
+
+
+def test_empty_values(api, model_name):
+    """test records without values aren't written"""
+    buffer = WriteBuffer(api)
+    buffer.write(model_name, [1], {})
+
+    assert buffer.commit() == 0
+    assert not api.server.execute_kw.called
+
+
+def test_max_records(api, model_name):
+    """test committing once `max_records` records are pending"""
+    buffer = WriteBuffer(api, max_records=3, chunk_size=2)
+
+    buffer.write(model_name, [1, 2], {"active": False})
+    buffer.write(model_name, [2], {"active": True})
+    assert not api.server.execute_kw.called
+
+    buffer.write(model_name, [3], {"active": False})
+    assert _writes(api) == [
+        (model_name, "write", [[1, 3], {"active": False}]),
+        (model_name, "write", [[2], {"active": True}]),
+    ]
+    assert not buffer
+
+
+def test_max_delay(api, model_name):
+    """test committing on a write made `max_delay` after the oldest pending one"""
+    buffer = WriteBuffer(api, max_records=None, max_delay=0.05)
+
+    buffer.write(model_name, [1], {"active": False})
+    assert buffer
+
+    time.sleep(0.06)
+    buffer.write(model_name, [2], {"active": False})
+    assert _writes(api) == [(model_name, "write", [[1, 2], {"active": False}])]
+    assert not buffer
+
+
+def test_context_manager(api, model_name):
+    """test leaving the block commits, or rolls back on errors"""
+    with WriteBuffer(api) as buffer:
+        buffer.write(model_name, [1], {"active": False})
+
+    assert api.server.execute_kw.call_count == 1
+
+    with pytest.raises(ZeroDivisionError):
+        with WriteBuffer(api) as buffer:
+            buffer.write(model_name, [1], {"active": True})
+            raise ZeroDivisionError
+
+    assert not buffer
+    assert api.server.execute_kw.call_count == 1
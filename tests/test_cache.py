@@ -0,0 +1,285 @@
+""" `odoo_api_wrapper.cache` tests """
+# pylint:disable=redefined-outer-name
+import json
+import time
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.cache import make_key
+from odoo_api_wrapper.cache import MetadataCache
+from odoo_api_wrapper.cache import RecordCache
+
+FIELDS = {"name": {"type": "char", "string": "Name"}}
+
+
+@pytest.fixture
+def api(mock_server, init_params):
+    """create an api instance with a metadata cache"""
+    del mock_server
+    api = odoo_api_wrapper.Api(*init_params, metadata_cache=MetadataCache())
+    api.server.execute_kw.return_value = FIELDS
+    return api
+
+
+def test_make_key():
+    """test attributes are sorted and other parameters are part of the key"""
+    key = make_key(
+        "url", "db", 2, "res.partner", [], {"attributes": ["type", "string"]}
+    )
+
+    assert key == ("url", "db", "2", "res.partner", "string,type", "[[], {}]")
+    assert key == make_key(
+        "url", "db", 2, "res.partner", [], {"attributes": ["string", "type"]}
+    )
+    assert make_key("url", "db", 2, "res.partner", [], {}) != make_key(
+        "url", "db", 2, "res.partner", [], {"context": {"lang": "fr_FR"}}
+    )
+
+
+def test_api_fields_get(api, model_name):
+    """test fields_get is served from the cache"""
+    kwargs = {"attributes": ["type", "string"]}
+
+    assert api.fields_get(model_name, [], kwargs) == FIELDS
+    assert api.fields_get(model_name, [], {"attributes": ["string", "type"]}) == FIELDS
+    assert api.server.execute_kw.call_count == 1
+
+    # results are copies
+    api.fields_get(model_name, [], kwargs)["name"]["type"] = "text"
+    assert api.fields_get(model_name, [], kwargs) == FIELDS
+
+    api.fields_get(model_name, [], {})
+    api.search(model_name, [[]])
+    assert api.server.execute_kw.call_count == 3
+    assert api.metadata_cache.hits == 3
+    assert api.metadata_cache.misses == 2
+
+
+def test_ttl():
+    """test expired entries are dropped"""
+    cache = MetadataCache(ttl=0.05)
+    cache.set(("key",), FIELDS)
+    assert cache.get(("key",)) == FIELDS
+
+    time.sleep(0.06)
+    assert cache.get(("key",)) is None
+    assert not cache
+
+
+def test_lru():
+    """test the least recently used entries are evicted"""
+    cache = MetadataCache(ttl=None, maxsize=2)
+    cache.set(("a",), 1)
+    cache.set(("b",), 2)
+    cache.get(("a",))
+    cache.set(("c",), 3)
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == 1
+    assert cache.get(("c",)) == 3
+
+    cache.clear()
+    assert not cache
+
+
+def test_disk(tmp_path):
+    """test entries are saved and loaded, skipping expired ones"""
+    path = tmp_path / "fields.json"
+
+    cache = MetadataCache(path=str(path))
+    cache.set(("a", "b"), FIELDS)
+    cache.set(("c",), 1)
+
+    assert MetadataCache(path=str(path)).get(("a", "b")) == FIELDS
+    assert len(MetadataCache(path=str(path), maxsize=1)) == 1
+
+    entries = json.loads(path.read_text())
+    entries[0][1] -= 7200
+    path.write_text(json.dumps(entries))
+    assert len(MetadataCache(path=str(path))) == 1
+
+    cache.clear()
+    assert not MetadataCache(path=str(path))
+
+
+def test_disk_errors(tmp_path):
+    """test unreadable files are ignored and failed saves are cleaned up"""
+    path = tmp_path / "fields.json"
+    path.write_text("{not json")
+
+    cache = MetadataCache(path=str(path))
+    assert not cache
+
+    with mock.patch("json.dump", side_effect=TypeError):
+        with pytest.raises(TypeError):
+            cache.set(("a",), 1)
+
+    assert [file.name for file in tmp_path.iterdir()] == ["fields.json"]
+
+
+@pytest.fixture
+def cached_api(mock_server, init_params):
+    """create an api instance with a record cache, reading from a fake database"""
+    del mock_server
+    api = odoo_api_wrapper.Api(*init_params, record_cache=RecordCache())
+    database = {
+        id_: {"name": f"name {id_}", "email": f"{id_}@example.com"}
+        for id_ in range(1, 10)
+    }
+
+    def _execute_kw(*params):
+        method, args, kwargs = params[4:]
+        if method != "read":
+            return True
+
+        return [
+            {
+                "id": id_,
+                **{
+                    field: database[id_][field]
+                    for field in kwargs.get("fields") or database[id_]
+                },
+            }
+            for id_ in args[0]
+        ]
+
+    api.server.execute_kw.side_effect = _execute_kw
+    return api
+
+
+def _reads(api):
+    return [
+        (call[0][5][0], call[0][6].get("fields"))
+        for call in api.server.execute_kw.call_args_list
+        if call[0][4] == "read"
+    ]
+
+
+def test_record_cache_read(cached_api, model_name):
+    """test reads only fetch the missing records and fields"""
+    assert cached_api.read(model_name, [[2, 1]], {"fields": ["name"]}) == [
+        {"id": 2, "name": "name 2"},
+        {"id": 1, "name": "name 1"},
+    ]
+    assert cached_api.read(
+        model_name, [[1, 3, 1]], {"fields": ["id", "email", "name"]}
+    ) == [
+        {"id": 1, "email": "1@example.com", "name": "name 1"},
+        {"id": 3, "email": "3@example.com", "name": "name 3"},
+        {"id": 1, "email": "1@example.com", "name": "name 1"},
+    ]
+    assert cached_api.read(model_name, [2], {"fields": ["name"]}) == [
+        {"id": 2, "name": "name 2"}
+    ]
+
+    assert _reads(cached_api) == [([2, 1], ["name"]), ([1, 3], ["email", "name"])]
+    assert cached_api.record_cache.hits == 1
+    assert cached_api.record_cache.misses == 4
+
+    # results are copies
+    cached_api.read(model_name, [[2]], {"fields": ["name"]})[0]["name"] = "changed"
+    assert (
+        cached_api.read(model_name, [[2]], {"fields": ["name"]})[0]["name"] == "name 2"
+    )
+
+
+def test_record_cache_concurrent_invalidation(cached_api, model_name):
+    """test records invalidated while their missing fields are read are read again"""
+    cached_api.read(model_name, [[1, 2]], {"fields": ["name"]})
+
+    execute_kw = cached_api.server.execute_kw.side_effect
+
+    def _execute_kw(*params):
+        # a write from another thread
+        cached_api.record_cache.invalidate(model_name, [1])
+        return execute_kw(*params)
+
+    cached_api.server.execute_kw.side_effect = _execute_kw
+    assert cached_api.read(model_name, [[1, 2]], {"fields": ["name", "email"]}) == [
+        {"id": 1, "name": "name 1", "email": "1@example.com"},
+        {"id": 2, "name": "name 2", "email": "2@example.com"},
+    ]
+    assert _reads(cached_api) == [
+        ([1, 2], ["name"]),
+        ([1, 2], ["email"]),
+        ([1], ["name", "email"]),
+    ]
+
+
+def test_record_cache_bypass(cached_api, model_name):
+    """test reads with other parameters and other operations go to the server"""
+    cached_api.read(model_name, [[1]], {"fields": ["name"]})
+
+    cached_api.read(
+        model_name, [[1]], {"fields": ["name"], "context": {"lang": "fr_FR"}}
+    )
+    cached_api.read(model_name, [[1]])
+    # all the fields, not none
+    assert cached_api.read(model_name, [[1]], {"fields": []}) == [
+        {"id": 1, "name": "name 1", "email": "1@example.com"}
+    ]
+    cached_api.search(model_name, [[]])
+
+    assert len(_reads(cached_api)) == 4
+    assert cached_api.server.execute_kw.call_count == 5
+
+
+def test_record_cache_invalidation(cached_api, model_name):
+    """test writes and deletions evict the records they touch"""
+    cached_api.read(model_name, [[1, 2, 3]], {"fields": ["name"]})
+
+    cached_api.write(model_name, [[1], {"name": "new"}])
+    cached_api.unlink(model_name, [2])
+    cached_api.read(model_name, [[1, 2, 3]], {"fields": ["name"]})
+
+    assert _reads(cached_api)[1] == ([1, 2], ["name"])
+
+
+def test_record_cache_failed_write(init_params, model_name):
+    """test failed writes evict the records too"""
+    cache = RecordCache()
+    cache.update(model_name, [{"id": 1, "name": "name"}])
+    api = odoo_api_wrapper.Api(*init_params, record_cache=cache)
+
+    with mock.patch.object(api, "server") as mock_server:
+        mock_server.execute_kw.side_effect = xmlrpc.client.Fault(1, "denied")
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.write(model_name, [[1], {"name": "new"}])
+
+    assert not cache
+
+
+def test_record_cache_lru():
+    """test the least recently used records are evicted"""
+    cache = RecordCache(maxsize=2)
+    cache.update("a", [{"id": 1, "name": "1"}, {"id": 2, "name": "2"}])
+    cache.lookup("a", [1], ["name"])
+
+    merged = cache.update("a", [{"id": 3, "name": "3"}, {"id": 1, "email": "e"}])
+
+    assert merged == {
+        3: {"id": 3, "name": "3"},
+        1: {"id": 1, "name": "1", "email": "e"},
+    }
+    assert cache.lookup("a", [1, 2, 3], ["name"]) == (
+        {1: {"id": 1, "name": "1"}, 3: {"id": 3, "name": "3"}},
+        [2],
+        ["name"],
+    )
+
+
+def test_record_cache_invalidate_model():
+    """test evicting a whole model"""
+    cache = RecordCache()
+    cache.update("a", [{"id": 1}, {"id": 2}])
+    cache.update("b", [{"id": 1}])
+
+    cache.invalidate("a")
+    assert len(cache) == 1
+
+    cache.clear()
+    assert not cache
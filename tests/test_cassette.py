@@ -0,0 +1,179 @@
+""" `odoo_api_wrapper.cassette` tests """
+# pylint:disable=redefined-outer-name
+import base64
+import gzip
+import json
+import time
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.cassette import CassetteError
+from odoo_api_wrapper.cassette import CassetteTransport
+from odoo_api_wrapper.cassette import Mode
+from odoo_api_wrapper.cassette import RecordedResponse
+from odoo_api_wrapper.transport import PooledTransport
+
+
+@pytest.fixture
+def path(tmp_path):
+    """cassette path"""
+    return str(tmp_path / "calls.cassette")
+
+
+def _api(url, transport, password="secret", **kwargs):
+    return odoo_api_wrapper.Api(url, "db", "2", password, transport, **kwargs)
+
+
+def test_record_replay(xmlrpc_server, path, model_name):
+    """test replayed responses match the recorded ones, with no server"""
+    with _api(
+        xmlrpc_server.url, CassetteTransport(path, "record", secrets=["secret"])
+    ) as api:
+        recorded = [api.search(model_name, [[["id", "=", i]]]) for i in range(3)]
+        # large enough to be gzipped
+        large = api.read(model_name, [list(range(5000))])
+
+    xmlrpc_server.shutdown()
+    xmlrpc_server.server_close()
+
+    transport = CassetteTransport(path, secrets=["other"])
+    with _api(xmlrpc_server.url, transport, "other") as api:
+        assert [
+            api.search(model_name, [[["id", "=", i]]]) for i in range(3)
+        ] == recorded
+        assert api.read(model_name, [list(range(5000))]) == large
+
+        with pytest.raises(CassetteError):
+            api.search(model_name, [[["id", "=", 3]]])
+
+
+def test_secrets_not_stored(xmlrpc_server, path, model_name):
+    """test cassettes hold no request, and only some headers"""
+    xmlrpc_server.register_function(lambda *params: True, "execute_kw")
+    with _api(
+        xmlrpc_server.url, CassetteTransport(path, "record", secrets=["s3cr&t"])
+    ) as api:
+        api.search(model_name, [[]])
+
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        entries = [json.loads(line) for line in file]
+
+    assert len(entries) == 1
+    assert set(entries[0]["headers"]) <= {"Content-Type", "Content-Encoding"}
+    assert "s3cr" not in json.dumps(entries[0])
+    assert entries[0]["latency"] > 0
+
+
+@pytest.mark.parametrize(
+    "body", [b"<string>s3cr&amp;t</string>", b'"s3cr&t"', b"<string>s3cr&t</string>"]
+)
+def test_key(path, body):
+    """test keys ignore the secrets, however they are encoded"""
+    transport = CassetteTransport(path, "record", secrets=["s3cr&t", ""])
+    assert transport.key("/jsonrpc", body) == transport.key(
+        "/jsonrpc", body.replace(b"s3cr&amp;t", b"").replace(b"s3cr&t", b"")
+    )
+    assert transport.key("/jsonrpc", body) != transport.key("/xmlrpc/2/object", body)
+
+
+def test_replay_order(path):
+    """test repeated requests replay in order, the last response repeating"""
+    recorder = CassetteTransport(path, "record")
+    for body in (b"1", b"2"):
+        recorder.record(
+            {
+                "key": "key",
+                "status": 200,
+                "reason": "OK",
+                "headers": {"Content-Type": "text/xml"},
+                "latency": 0.01,
+                "body": base64.b64encode(body).decode(),
+            }
+        )
+
+    transport = CassetteTransport(path)
+    responses = [transport.replay("key") for _ in range(3)]
+    assert [response.read() for response in responses] == [b"1", b"2", b"2"]
+    assert responses[0].getheader("content-type") == "text/xml"
+    assert responses[0].getheader("Content-Encoding", "") == ""
+    assert responses[0].getheaders() == [("Content-Type", "text/xml")]
+
+
+@pytest.mark.parametrize("mode", ["play", "Record"])
+def test_invalid_mode(path, mode):
+    """test unknown modes are refused"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        CassetteTransport(path, mode)
+
+
+def test_mode(path):
+    """test modes accept their values"""
+    assert CassetteTransport(path, Mode.RECORD).mode is Mode.RECORD
+    assert CassetteTransport(path, "replay").mode is Mode.REPLAY
+
+
+def test_timing(xmlrpc_server, path, model_name):
+    """test replays can wait for the recorded latencies"""
+    xmlrpc_server.register_function(
+        lambda *params: time.sleep(0.1) or True, "execute_kw"
+    )
+    with _api(xmlrpc_server.url, CassetteTransport(path, "record")) as api:
+        api.search(model_name, [[]])
+
+    with _api(xmlrpc_server.url, CassetteTransport(path)) as api:
+        start = time.monotonic()
+        api.search(model_name, [[]])
+        assert time.monotonic() - start < 0.1
+
+    with mock.patch("odoo_api_wrapper.cassette.time.sleep") as sleep:
+        with _api(xmlrpc_server.url, CassetteTransport(path, timing=True)) as api:
+            assert api.search(model_name, [[]]) is True
+
+    assert sleep.call_args[0][0] >= 0.1
+
+
+def test_fault(xmlrpc_server, path, model_name):
+    """test faults replay as errors"""
+
+    def _fail(*params):
+        raise ValueError("invalid")
+
+    xmlrpc_server.register_function(_fail, "execute_kw")
+    with _api(xmlrpc_server.url, CassetteTransport(path, "record")) as api:
+        with pytest.raises(odoo_api_wrapper.APIError, match="invalid"):
+            api.search(model_name, [[]])
+
+    with _api(xmlrpc_server.url, CassetteTransport(path)) as api:
+        with pytest.raises(odoo_api_wrapper.APIError, match="invalid"):
+            api.search(model_name, [[]])
+
+
+def test_jsonrpc(path, model_name):
+    """test json-rpc responses replay too"""
+    response = RecordedResponse(
+        {
+            "status": 200,
+            "reason": "OK",
+            "headers": {"Content-Type": "application/json"},
+            "body": base64.b64encode(b'{"id": 1, "result": [1, 2]}').decode(),
+        }
+    )
+
+    with mock.patch.object(
+        PooledTransport, "send_pooled_request", return_value=response
+    ):
+        with _api(
+            "http://localhost:8069",
+            CassetteTransport(path, "record"),
+            protocol=odoo_api_wrapper.Protocol.JSONRPC,
+        ) as api:
+            assert api.search(model_name, [[]]) == [1, 2]
+
+    with _api(
+        "http://localhost:8069",
+        CassetteTransport(path),
+        protocol=odoo_api_wrapper.Protocol.JSONRPC,
+    ) as api:
+        assert api.search(model_name, [[]]) == [1, 2]
@@ -0,0 +1,112 @@
+""" `odoo_api_wrapper.columns` tests """
+# pylint:disable=redefined-outer-name
+import array
+import math
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.columns import ColumnBuilder
+from odoo_api_wrapper.columns import NAT
+
+TYPES = {
+    "id": "integer",
+    "quantity": "integer",
+    "debit": "float",
+    "reconciled": "boolean",
+    "date": "date",
+    "create_date": "datetime",
+    "partner_id": "many2one",
+    "name": "char",
+}
+
+ROWS = [
+    {
+        "id": 1,
+        "quantity": 3,
+        "debit": 1.5,
+        "reconciled": True,
+        "date": "1970-01-02",
+        "create_date": "1970-01-02 00:01:05",
+        "partner_id": [7, "Partner"],
+        "name": "line",
+    },
+    {
+        "id": 2,
+        "quantity": False,
+        "debit": False,
+        "reconciled": False,
+        "date": False,
+        "create_date": False,
+        "partner_id": False,
+        "name": False,
+    },
+]
+
+
+def test_arrays():
+    """test columns are packed into `array.array` buffers"""
+    builder = ColumnBuilder(TYPES, use_numpy=False)
+    builder.extend(ROWS[:1])
+    builder.extend(iter(ROWS[1:]))
+    columns = builder.build()
+
+    assert list(columns) == [*list(TYPES)[:7], "partner_id_name", "name"]
+    assert columns["id"] == array.array("q", [1, 2])
+    assert columns["quantity"] == array.array("q", [3, 0])
+    assert columns["debit"][0] == 1.5 and math.isnan(columns["debit"][1])
+    assert columns["reconciled"] == array.array("b", [1, 0])
+    assert columns["date"] == array.array("q", [1, NAT])
+    assert columns["create_date"] == array.array("q", [86465, NAT])
+    assert columns["partner_id"] == array.array("q", [7, 0])
+    assert columns["partner_id_name"] == ["Partner", None]
+    assert columns["name"] == ["line", False]
+
+
+def test_numpy():
+    """test columns are NumPy arrays when asked to"""
+    numpy = pytest.importorskip("numpy")
+
+    builder = ColumnBuilder(TYPES, use_numpy=True)
+    builder.extend(ROWS)
+    columns = builder.build()
+
+    assert columns["id"].dtype == numpy.int64
+    assert columns["id"].tolist() == [1, 2]
+    assert numpy.isnan(columns["debit"][1])
+    assert columns["reconciled"].tolist() == [True, False]
+    assert columns["date"][0] == numpy.datetime64("1970-01-02")
+    assert numpy.isnat(columns["date"][1])
+    assert columns["create_date"][0] == numpy.datetime64("1970-01-02T00:01:05")
+    assert columns["partner_id"].tolist() == [7, 0]
+    assert columns["partner_id_name"] == ["Partner", None]
+
+    assert ColumnBuilder({}).use_numpy
+
+
+def test_model_search_read_columns(mock_server, init_params):
+    """test model.search_read_columns reads by batches"""
+    del mock_server
+
+    api = odoo_api_wrapper.Api(*init_params)
+    model = odoo_api_wrapper.Model(api, "account.move.line")
+    api.server.execute_kw.side_effect = [
+        {field: {"type": type_} for field, type_ in TYPES.items()},
+        [{"id": 1, "partner_id": [7, "Partner"]}],
+    ]
+
+    columns = model.search_read_columns([], ["partner_id"], use_numpy=False)
+
+    assert columns == {
+        "id": array.array("q", [1]),
+        "partner_id": array.array("q", [7]),
+        "partner_id_name": ["Partner"],
+    }
+    assert api.server.execute_kw.call_args[0][4:] == (
+        "search_read",
+        [[["id", ">", 0]]],
+        {"limit": 1000, "order": "id", "fields": ["partner_id"]},
+    )
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        model.search_read_columns([], ["missing"])
@@ -0,0 +1,172 @@
+""" `odoo_api_wrapper.decoder` tests """
+import asyncio
+import datetime
+import xmlrpc.client
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.aio import AsyncApi
+from odoo_api_wrapper.decoder import FastDecoder
+from odoo_api_wrapper.decoder import loads
+from odoo_api_wrapper.decoder import parse_datetime
+from odoo_api_wrapper.transport import PooledTransport
+
+
+def _response(*params):
+    return xmlrpc.client.dumps(params, methodresponse=True, allow_none=True)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        1,
+        -2147483648,
+        2.5,
+        True,
+        False,
+        None,
+        "",
+        "<&> \"quoted\" 'single' é 中文\n",
+        [],
+        {},
+        [1, "a", [2, [3, {}]], {"b": None}],
+        {"id": 1, "partner_id": [3, "Partner"], "tag_ids": [], "active": True},
+        [{"id": i, "name": f"record {i}", "amount": i / 3} for i in range(50)],
+    ],
+)
+def test_same_as_stock(value):
+    """test decoding matches `xmlrpc.client.loads`"""
+    body = _response(value)
+
+    assert loads(body) == xmlrpc.client.loads(body)[0]
+
+
+def test_streaming():
+    """test feeding the response one byte at a time"""
+    value = [{"id": i, "name": f"record {i}"} for i in range(10)]
+    body = _response(value).encode()
+
+    decoder = FastDecoder()
+    for index in range(len(body)):
+        decoder.feed(body[index : index + 1])
+
+    assert decoder.close() == (value,)
+    assert decoder.close() == (value,)
+
+
+def test_interned_names():
+    """test field names are shared between records"""
+    [records] = loads(_response([{"partner_id": 1}, {"partner_id": 2}]))
+
+    [first], [second] = records[0], records[1]
+    assert first is second
+
+
+def test_untyped_value():
+    """test a value without a type element is a string"""
+    body = "<methodResponse><params><param><value>text</value></param></params>"
+
+    assert loads(f"{body}</methodResponse>") == ("text",)
+
+
+def test_namespaced_types():
+    """test the `ex:` extension types, unknown types are read as strings"""
+    body = (
+        "<methodResponse xmlns:ex='http://ws.apache.org/xmlrpc/namespaces/extensions'>"
+        "<params><param><value><array><data>"
+        "<value><ex:nil/></value><value><ex:i8>9007199254740993</ex:i8></value>"
+        "<value><i8>-1</i8></value><value><biginteger>12</biginteger></value>"
+        "<value><ex:unknown>1</ex:unknown></value>"
+        "</data></array></value></param></params></methodResponse>"
+    )
+
+    assert loads(body) == ([None, 9007199254740993, -1, 12, "1"],)
+
+
+def test_datetime():
+    """test dates are only converted to `datetime.datetime` when asked to"""
+    value = datetime.datetime(2022, 1, 2, 3, 4, 5)
+    body = _response(value)
+
+    assert loads(body) == ("20220102T03:04:05",)
+    assert loads(body, use_datetime=True) == (value,)
+
+
+def test_parse_datetime():
+    """test both date formats"""
+    expected = datetime.datetime(2022, 1, 2, 3, 4, 5)
+
+    assert parse_datetime(" 20220102T03:04:05 ") == expected
+    assert parse_datetime("2022-01-02T03:04:05") == expected
+
+
+def test_base64():
+    """test binary values"""
+    body = _response(xmlrpc.client.Binary(b"\x00binary"))
+
+    [value] = loads(body)
+    assert isinstance(value, xmlrpc.client.Binary)
+    assert value.data == b"\x00binary"
+
+    assert loads(body, use_builtin_types=True) == (b"\x00binary",)
+
+
+def test_fault():
+    """test faults raise `xmlrpc.client.Fault`"""
+    body = xmlrpc.client.dumps(xmlrpc.client.Fault(1, "boom"), methodresponse=True)
+
+    with pytest.raises(xmlrpc.client.Fault) as error:
+        loads(body)
+
+    assert error.value.faultString == "boom"
+
+
+def test_bad_boolean():
+    """test invalid booleans are rejected"""
+    body = _response(True).replace("<boolean>1", "<boolean>2")
+
+    with pytest.raises(TypeError):
+        loads(body)
+
+
+def test_not_a_response():
+    """test documents without params nor fault are rejected"""
+    with pytest.raises(xmlrpc.client.ResponseError):
+        loads("<methodResponse></methodResponse>")
+
+
+def test_transport_parser():
+    """test the transport only uses the fast decoder when asked to"""
+    parser, unmarshaller = PooledTransport(fast_decoder=True).getparser()
+    assert isinstance(parser, FastDecoder)
+    assert unmarshaller is parser
+
+    _, unmarshaller = PooledTransport().getparser()
+    assert isinstance(unmarshaller, xmlrpc.client.Unmarshaller)
+
+
+def test_api(xmlrpc_server, init_params, model_name):
+    """test calls through an api using the fast decoder"""
+    with odoo_api_wrapper.Api(
+        xmlrpc_server.url, *init_params[1:], fast_decoder=True
+    ) as api:
+        assert api.search_read(model_name, [[]], {"limit": 1}) == [
+            *init_params[1:],
+            model_name,
+            "search_read",
+            [[]],
+            {"limit": 1},
+        ]
+
+
+def test_async_api(xmlrpc_server, init_params, model_name):
+    """test calls through an async api using the fast decoder"""
+
+    async def _test():
+        async with AsyncApi(
+            xmlrpc_server.url, *init_params[1:], fast_decoder=True
+        ) as api:
+            return await api.search(model_name, [[]])
+
+    assert asyncio.run(_test())[4] == "search"
@@ -0,0 +1,140 @@
+""" `odoo_api_wrapper.export` tests """
+# pylint:disable=redefined-outer-name
+import csv
+import gzip
+import json
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+
+TYPES = {
+    "id": "integer",
+    "name": "char",
+    "active": "boolean",
+    "partner_id": "many2one",
+    "tag_ids": "many2many",
+}
+
+
+def _record(id_):
+    return {
+        "id": id_,
+        "name": f"name {id_}" if id_ % 2 else False,
+        "active": bool(id_ % 2),
+        "partner_id": [id_ * 10, f"partner {id_}"] if id_ % 2 else False,
+        "tag_ids": [id_],
+    }
+
+
+@pytest.fixture
+def model(init_params):
+    """model over a fake database of 5 records, failing on demand"""
+    api = odoo_api_wrapper.Api(*init_params)
+    api.fail_after = None
+
+    def _execute_kw(*params):
+        method, args, kwargs = params[4:]
+        if method == "fields_get":
+            return {field: {"type": type_} for field, type_ in TYPES.items()}
+
+        last_id = max(leaf[2] for leaf in args[0] if leaf[:2] == ["id", ">"])
+        if last_id == api.fail_after:
+            raise xmlrpc.client.Fault(1, "connection lost")
+
+        return [
+            {field: _record(id_)[field] for field in ["id", *kwargs["fields"]]}
+            for id_ in range(last_id + 1, 6)
+        ][: kwargs["limit"]]
+
+    with mock.patch.object(api, "server") as server:
+        server.execute_kw.side_effect = _execute_kw
+        yield odoo_api_wrapper.Model(api, "res.partner")
+
+
+def test_jsonl(model, tmp_path):
+    """test exporting to json lines"""
+    path = tmp_path / "partners.jsonl"
+
+    assert model.export([], ["name", "partner_id"], str(path), batch_size=2) == 5
+
+    assert [json.loads(line) for line in path.read_text().splitlines()] == [
+        {field: _record(id_)[field] for field in ("id", "name", "partner_id")}
+        for id_ in range(1, 6)
+    ]
+    assert not (tmp_path / "partners.jsonl.checkpoint").exists()
+
+
+def test_csv_gzip(model, tmp_path):
+    """test exporting to gzipped csv"""
+    path = tmp_path / "partners.csv.gz"
+
+    assert model.export([], list(TYPES), str(path), format="csv", batch_size=2) == 5
+
+    with gzip.open(path, "rt") as file:
+        rows = list(csv.reader(file))
+
+    assert rows[:3] == [
+        ["id", "name", "active", "partner_id", "partner_id_name", "tag_ids"],
+        ["1", "name 1", "True", "10", "partner 1", "[1]"],
+        ["2", "", "False", "", "", "[2]"],
+    ]
+    assert len(rows) == 6
+
+
+def test_empty_csv(model, tmp_path):
+    """test an empty csv export still has its header"""
+    path = tmp_path / "partners.csv.gz"
+    domain = [["id", ">", 5]]
+
+    assert model.export(domain, ["name"], str(path), "csv", compress=False) == 0
+    assert path.read_text().splitlines() == ["id,name"]
+
+
+def test_resume(model, tmp_path):
+    """test an interrupted export resumes after its checkpoint"""
+    path = tmp_path / "partners.csv.gz"
+    model.api.fail_after = 4
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        model.export([], ["name"], str(path), format="csv", batch_size=2)
+
+    checkpoint = json.loads((tmp_path / "partners.csv.gz.checkpoint").read_text())
+    assert (checkpoint["last_id"], checkpoint["count"]) == (4, 4)
+
+    # a partially written page is dropped
+    with open(path, "ab") as file:
+        file.write(b"garbage")
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        model.export([], ["name", "active"], str(path), format="csv")
+    with pytest.raises(odoo_api_wrapper.APIError, match="another export"):
+        model.export([], ["name"], str(path), format="csv", compress=False)
+    with pytest.raises(odoo_api_wrapper.APIError, match="another export"):
+        model.export([["id", ">", 2]], ["name"], str(path), format="csv")
+    with pytest.raises(odoo_api_wrapper.APIError, match="another export"):
+        model.export(
+            [], ["name"], str(path), format="csv", kwargs={"context": {"lang": "fr"}}
+        )
+
+    path.rename(tmp_path / "moved")
+    with pytest.raises(odoo_api_wrapper.APIError, match="is missing"):
+        model.export([], ["name"], str(path), format="csv")
+    (tmp_path / "moved").rename(path)
+
+    model.api.fail_after = None
+    assert model.export([], ["name"], str(path), format="csv", batch_size=2) == 5
+
+    with gzip.open(path, "rt") as file:
+        assert [row[0] for row in csv.reader(file)] == ["id", "1", "2", "3", "4", "5"]
+
+
+def test_invalid(model, tmp_path, random_string):
+    """test invalid formats and fields"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        model.export([], ["name"], str(tmp_path / "out"), format=random_string())
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        model.export([], ["missing"], str(tmp_path / "out"))
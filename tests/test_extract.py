@@ -0,0 +1,92 @@
+""" `odoo_api_wrapper.extract` tests """
+# pylint:disable=redefined-outer-name
+import concurrent.futures
+import multiprocessing
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.extract import extract
+from odoo_api_wrapper.extract import split_ids
+
+IDS = list(range(1, 60, 2))
+
+
+def _matches(id_, domain):
+    for _, operator, value in domain:
+        if not (id_ > value if operator == ">" else id_ <= value):
+            return False
+
+    return True
+
+
+def _execute_kw(*params):
+    """a model of `IDS` records, supporting `id` domains"""
+    method, [domain], kwargs = params[4:]
+    ids = [id_ for id_ in IDS if _matches(id_, domain)]
+
+    if method == "search_count":
+        return len(ids)
+
+    if kwargs.get("order") == "id desc":
+        ids.reverse()
+
+    offset = kwargs.get("offset", 0)
+    ids = ids[offset : offset + kwargs["limit"]]
+
+    if method == "search":
+        return ids
+
+    return [{"id": id_, "name": f"name {id_}"} for id_ in ids]
+
+
+@pytest.fixture
+def api(xmlrpc_server, init_params):
+    """api connected to a fake model"""
+    xmlrpc_server.register_function(_execute_kw, "execute_kw")
+
+    with odoo_api_wrapper.Api(xmlrpc_server.url, *init_params[1:]) as api:
+        yield api
+
+
+def test_split_ids(api):
+    """test ranges hold about the same number of ids"""
+    ranges = split_ids(api, "res.partner", [], 4)
+
+    assert ranges == [(0, 13), (13, 29), (29, 43), (43, 59)]
+    assert split_ids(api, "res.partner", [["id", ">", 55]], 4) == [(0, 57), (57, 59)]
+    assert split_ids(api, "res.partner", [["id", ">", 59]], 4) == []
+
+
+def test_extract_threads(api):
+    """test extracting on a given executor"""
+    with concurrent.futures.ThreadPoolExecutor(2) as executor:
+        batches = list(
+            extract(
+                api,
+                "res.partner",
+                [["id", ">", 4]],
+                ["name"],
+                workers=2,
+                batch_size=3,
+                executor=executor,
+            )
+        )
+
+    assert len(batches) == 8
+    assert [record["id"] for batch in batches for record in batch] == IDS[2:]
+
+
+def test_extract_processes(api):
+    """test extracting on a pool of processes"""
+    batches = extract(
+        api,
+        "res.partner",
+        [],
+        ["name"],
+        workers=2,
+        ranges_per_worker=2,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+    assert [record["id"] for batch in batches for record in batch] == IDS
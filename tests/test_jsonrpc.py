@@ -0,0 +1,194 @@
+""" `odoo_api_wrapper.jsonrpc` tests """
+# pylint:disable=redefined-outer-name
+import gzip
+import http.server
+import json
+import threading
+import xmlrpc.client
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.cassette import CassetteTransport
+from odoo_api_wrapper.jsonrpc import JsonRpcProxy
+from odoo_api_wrapper.metrics import InMemorySink
+
+
+class _RequestHandler(http.server.BaseHTTPRequestHandler):
+    """`/jsonrpc` handler answering `execute_kw` with its parameters"""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):  # pylint:disable=invalid-name
+        """handle a json-rpc call"""
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.path, dict(self.headers), request))
+
+        if self.path != "/jsonrpc":
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+
+        params = request["params"]
+        payload = {"jsonrpc": "2.0", "id": request["id"]}
+        if params["args"][3] == "fault":
+            payload["error"] = {
+                "code": 200,
+                "message": "Odoo Server Error",
+                "data": {"name": "odoo.exceptions.UserError", "message": "boom"},
+            }
+        else:
+            payload["result"] = [params["service"], params["method"], *params["args"]]
+
+        body = json.dumps(payload).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        if self.server.gzip:
+            body = gzip.compress(body)
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):  # pylint:disable=arguments-differ
+        pass
+
+
+@pytest.fixture
+def jsonrpc_server():
+    """a local json-rpc server"""
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _RequestHandler)
+    server.daemon_threads = True
+    server.block_on_close = False
+    server.requests = []
+    server.gzip = False
+
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def api(jsonrpc_server, init_params):
+    """json-rpc api connected to the local server"""
+    host, port = jsonrpc_server.server_address
+
+    with odoo_api_wrapper.Api(
+        f"http://{host}:{port}",
+        *init_params[1:],
+        protocol=odoo_api_wrapper.Protocol.JSONRPC,
+    ) as api:
+        yield api
+
+
+def test_api_operations(jsonrpc_server, api, init_params, model_name):
+    """test operations are sent to `/jsonrpc`"""
+    kwargs = {"fields": ["name"], "limit": 5}
+
+    for _ in range(2):
+        assert api.search_read(model_name, [[["id", ">", 1]]], kwargs) == [
+            "object",
+            "execute_kw",
+            *init_params[1:],
+            model_name,
+            "search_read",
+            [[["id", ">", 1]]],
+            kwargs,
+        ]
+
+    [(path, headers, request), (_, _, second_request)] = jsonrpc_server.requests
+    assert path == "/jsonrpc"
+    assert headers["Content-Type"] == "application/json"
+    assert request["method"] == "call"
+    assert request["id"] != second_request["id"]
+
+
+def test_gzip_response(jsonrpc_server, api, model_name):
+    """test gzip encoded responses are decoded"""
+    jsonrpc_server.gzip = True
+
+    assert api.search(model_name, [[]])[6] == "search"
+
+
+def test_error(api):
+    """test server errors raise `odoo_api_wrapper.APIError`"""
+    with pytest.raises(odoo_api_wrapper.APIError) as error:
+        api.search("fault", [[]])
+
+    assert str(error.value) == "boom"
+
+
+def test_protocol_error(jsonrpc_server, model_name):
+    """test http errors raise `xmlrpc.client.ProtocolError`"""
+    host, port = jsonrpc_server.server_address
+    proxy = JsonRpcProxy(f"http://{host}:{port}/missing")
+
+    with pytest.raises(xmlrpc.client.ProtocolError):
+        proxy.execute_kw("db", 1, "password", model_name, "search", [[]], {})
+
+    proxy.transport.close()
+
+
+def test_invalid_protocol(init_params, random_string):
+    """test with an invalid protocol"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        odoo_api_wrapper.Api(*init_params, protocol=random_string())
+
+
+def test_unpooled_transport(init_params):
+    """test json-rpc requires a pooled transport"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        odoo_api_wrapper.Api(
+            *init_params,
+            transport=xmlrpc.client.Transport(),
+            protocol="jsonrpc",
+        )
+
+
+def test_metrics(jsonrpc_server, init_params, model_name):
+    """test json-rpc requests record their sizes and phases"""
+    sink = InMemorySink()
+    host, port = jsonrpc_server.server_address
+    jsonrpc_server.gzip = True
+
+    with odoo_api_wrapper.Api(
+        f"http://{host}:{port}", *init_params[1:], protocol="jsonrpc", metrics=[sink]
+    ) as api:
+        api.search(model_name, [[]])
+
+    stats = sink.snapshot()[("search", model_name)]
+    assert stats.count == 1
+    assert stats.request_bytes > 0 and stats.response_bytes > 0
+    assert stats.response_uncompressed_bytes > stats.response_bytes
+    assert stats.network > 0 and stats.unmarshal > 0
+
+
+def test_cassette_replay_order(jsonrpc_server, init_params, model_name, tmp_path):
+    """test recorded calls replay in another order, whatever their ids"""
+    host, port = jsonrpc_server.server_address
+    path = str(tmp_path / "calls.cassette")
+
+    def _api(transport):
+        return odoo_api_wrapper.Api(
+            f"http://{host}:{port}",
+            *init_params[1:],
+            transport=transport,
+            protocol=odoo_api_wrapper.Protocol.JSONRPC,
+        )
+
+    with _api(CassetteTransport(path, "record")) as api:
+        recorded = {
+            name: api.search(model_name, [[["name", "=", name]]]) for name in "ab"
+        }
+
+    with _api(CassetteTransport(path)) as api:
+        for name in "ba":
+            assert api.search(model_name, [[["name", "=", name]]]) == recorded[name]
+
+    assert len(jsonrpc_server.requests) == 2
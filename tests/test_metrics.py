@@ -0,0 +1,146 @@
+""" `odoo_api_wrapper.metrics` tests """
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.metrics import CallStats
+from odoo_api_wrapper.metrics import CURRENT
+from odoo_api_wrapper.metrics import error_cause
+from odoo_api_wrapper.metrics import InMemorySink
+from odoo_api_wrapper.metrics import PrometheusSink
+from odoo_api_wrapper.metrics import timed
+
+
+def _stats(operation="read", model="res.partner", duration=0.02, error=None):
+    stats = CallStats(operation, model)
+    stats.duration = duration
+    stats.network = duration / 2
+    stats.request_bytes = 100
+    stats.response_bytes = 1000
+    stats.request_uncompressed_bytes = 100
+    stats.response_uncompressed_bytes = 5000
+    stats.error = error
+    return stats
+
+
+def test_timed():
+    """test phases are only timed while recording"""
+    with timed("network"):
+        pass
+
+    stats = CallStats("read", "res.partner")
+    token = CURRENT.set(stats)
+    try:
+        with timed("network"):
+            pass
+    finally:
+        CURRENT.reset(token)
+
+    assert stats.network > 0
+    stats.duration = stats.network / 2
+    assert stats.marshal == 0
+
+
+def test_error_cause():
+    """test errors are named after their cause"""
+    try:
+        try:
+            raise ConnectionResetError()
+        except ConnectionResetError as cause:
+            raise odoo_api_wrapper.APIError("reset") from cause
+    except odoo_api_wrapper.APIError as error:
+        assert error_cause(error) == "ConnectionResetError"
+
+    assert error_cause(odoo_api_wrapper.APIError("error")) == "APIError"
+
+
+def test_in_memory_sink():
+    """test metrics are aggregated by operation and model"""
+    sink = InMemorySink()
+    sink.record(_stats())
+    sink.record(_stats(duration=100, error="Fault"))
+    sink.record(_stats(operation="search"))
+
+    snapshot = sink.snapshot()
+    assert set(snapshot) == {("read", "res.partner"), ("search", "res.partner")}
+
+    stats = snapshot[("read", "res.partner")]
+    assert stats.count == 2
+    assert stats.errors == {"Fault": 1}
+    assert stats.buckets[2] == stats.buckets[-1] == 1
+    assert stats.duration == pytest.approx(100.02)
+    assert stats.network == pytest.approx(50.01)
+    assert stats.marshal == pytest.approx(50.01)
+    assert stats.request_bytes == 200
+    assert stats.response_bytes == 2000
+    assert stats.request_ratio == 1.0
+    assert stats.response_ratio == 5.0
+
+    sink.clear()
+    assert not sink.snapshot()
+
+
+def test_prometheus_sink():
+    """test the prometheus text format"""
+    sink = PrometheusSink()
+    sink.record(_stats(model='a "quoted"\\model\n'))
+    sink.record(_stats(error="Fault"))
+
+    lines = sink.render().splitlines()
+    labels = 'operation="read",model="res.partner"'
+
+    assert "# TYPE odoo_api_requests_total counter" in lines
+    assert f"odoo_api_requests_total{{{labels}}} 1" in lines
+    assert f'odoo_api_errors_total{{{labels},cause="Fault"}} 1' in lines
+    assert f'odoo_api_request_duration_seconds_bucket{{{labels},le="0.01"}} 0' in lines
+    assert f'odoo_api_request_duration_seconds_bucket{{{labels},le="0.025"}} 1' in lines
+    assert f'odoo_api_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1' in lines
+    assert f"odoo_api_request_duration_seconds_count{{{labels}}} 1" in lines
+    assert f'odoo_api_phase_seconds_total{{{labels},phase="network"}} 0.01' in lines
+    assert f"odoo_api_response_bytes_total{{{labels}}} 1000" in lines
+    assert f"odoo_api_response_uncompressed_bytes_total{{{labels}}} 5000" in lines
+    assert (
+        'odoo_api_requests_total{operation="read",model="a \\"quoted\\"\\\\model\\n"} 1'
+        in lines
+    )
+
+
+def test_api_metrics(xmlrpc_server, init_params, model_name):
+    """test requests record their sizes and phases"""
+    sink = InMemorySink()
+
+    with odoo_api_wrapper.Api(
+        xmlrpc_server.url, *init_params[1:], metrics=[sink]
+    ) as api:
+        # large enough for the server to gzip the response
+        assert api.search(model_name, [["x" * 2000]])[5] == [["x" * 2000]]
+        api.search(model_name, [[]])
+
+    stats = sink.snapshot()[("search", model_name)]
+    assert stats.count == 2
+    assert not stats.errors
+    assert stats.request_bytes > 2000
+    assert 0 < stats.response_bytes < 2000
+    assert stats.request_uncompressed_bytes == stats.request_bytes
+    assert stats.response_uncompressed_bytes > 2000
+    assert stats.request_ratio == 1.0
+    assert stats.response_ratio > 1.0
+    assert stats.network > 0 and stats.unmarshal > 0
+
+
+def test_api_metrics_error(init_params, model_name):
+    """test failed requests record their cause"""
+    sink = InMemorySink()
+    api = odoo_api_wrapper.Api(*init_params, metrics=[sink])
+
+    with mock.patch.object(api, "server") as server:
+        server.execute_kw.side_effect = xmlrpc.client.Fault(1, "error")
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.search(model_name, [[]])
+
+    stats = sink.snapshot()[("search", model_name)]
+    assert stats.errors == {"Fault": 1}
+    assert stats.duration > 0 and stats.network == 0
@@ -100,3 +100,65 @@ def test_model_unlink(init_params, api, model, model_name):
     api.server.execute_kw.assert_called_with(
         *init_params[1:], model_name, "unlink", args, {}
     )
+
+
+def test_model_iter_search_read(init_params, api, model, model_name):
+    """test model.iter_search_read"""
+    api.server.execute_kw.return_value = [{"id": 1}]
+
+    assert list(model.iter_search_read([], ["name"], batch_size=2)) == [{"id": 1}]
+    api.server.execute_kw.assert_called_once_with(
+        *init_params[1:],
+        model_name,
+        "search_read",
+        [[["id", ">", 0]]],
+        {"limit": 2, "order": "id", "fields": ["name"]},
+    )
+
+
+def test_model_aggregate(init_params, api, model, model_name):
+    """test model.aggregate and model.iter_read_group"""
+    api.server.execute_kw.return_value = [{"state": "posted", "__count": 2}]
+
+    assert model.aggregate([], [], ["state"]) == {("posted",): {"__count": 2}}
+    assert list(model.iter_read_group([], [], ["state"], orderby="state desc")) == [
+        {"state": "posted", "__count": 2}
+    ]
+    api.server.execute_kw.assert_called_with(
+        *init_params[1:],
+        model_name,
+        "read_group",
+        [[], [], ["state"]],
+        {"lazy": False, "limit": 1000, "orderby": "state desc", "offset": 0},
+    )
+
+
+def test_model_create_many(init_params, api, model, model_name):
+    """test model.create_many"""
+    api.server.execute_kw.return_value = [1, 2]
+
+    assert model.create_many([{"name": "a"}, {"name": "b"}]) == [1, 2]
+    api.server.execute_kw.assert_called_once_with(
+        *init_params[1:], model_name, "create", [[{"name": "a"}, {"name": "b"}]], {}
+    )
+
+
+def test_model_prefetch(api, model, model_name):
+    """test model.search_read with prefetch"""
+    api.server.execute_kw.side_effect = [
+        {"country_id": {"type": "many2one", "relation": "res.country"}},
+        [{"id": 1, "country_id": [2, "Country"]}],
+        [{"id": 2, "code": "EG"}],
+    ]
+
+    assert model.search_read([[]], prefetch={"country_id": ["code"]}) == [
+        {"id": 1, "country_id": {"id": 2, "code": "EG"}}
+    ]
+    api.server.execute_kw.assert_called_with(
+        *api.server.execute_kw.call_args[0][:3],
+        "res.country",
+        "read",
+        [[2]],
+        {"fields": ["code"]},
+    )
+    assert api.server.execute_kw.call_args_list[0][0][3] == model_name
@@ -0,0 +1,126 @@
+""" `odoo_api_wrapper.records` tests """
+# pylint:disable=redefined-outer-name,protected-access
+import typing as t
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.records import from_dicts
+from odoo_api_wrapper.records import make_record_class
+from odoo_api_wrapper.records import Record
+
+FIELDS: t.Dict[str, t.Dict] = {
+    "id": {},
+    "name": {},
+    "partner_id": {},
+    "__last_update": {},
+}
+
+
+@pytest.fixture
+def api(mock_server, init_params):
+    """create an api instance"""
+    del mock_server
+    return odoo_api_wrapper.Api(*init_params)
+
+
+@pytest.fixture
+def model(api):
+    """model returning records"""
+    return odoo_api_wrapper.Model(api, "res.partner", result_mode="record")
+
+
+def test_make_record_class():
+    """test generated classes hold their fields in slots"""
+    cls = make_record_class("res.partner_bank", ["id", "name", "__last_update"])
+    record = cls(1, "name", "2022-01-01")
+
+    assert cls.__name__ == "ResPartnerBank"
+    assert issubclass(cls, Record)
+    assert not hasattr(record, "__dict__")
+    assert (record.id, record.name) == (1, "name")
+    assert getattr(record, "__last_update") == "2022-01-01"
+    assert record._asdict() == {"id": 1, "name": "name", "__last_update": "2022-01-01"}
+    assert (
+        repr(record) == "ResPartnerBank(id=1, name='name', __last_update='2022-01-01')"
+    )
+
+    assert record == cls(1, "name", "2022-01-01")
+    assert record != cls(2, "name", "2022-01-01")
+    assert record != {"id": 1}
+
+    with pytest.raises(AttributeError):
+        record.other = 1  # pylint:disable=attribute-defined-outside-init
+
+    assert make_record_class("res.partner", [])()._asdict() == {}
+
+
+def test_invalid_field_name():
+    """test fields have to be valid identifiers"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        make_record_class("res.partner", ["id", "class"])
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        make_record_class("res.partner", ["x_studio field"])
+
+
+def test_from_dicts():
+    """test building records from `read` results"""
+    cls = make_record_class("res.partner", ["id", "name"])
+    [record] = from_dicts(cls, [{"name": "name", "id": 1}])
+    assert (record.id, record.name) == (1, "name")
+
+    [record] = from_dicts(make_record_class("res.partner", ["id"]), [{"id": 1}])
+    assert record.id == 1
+
+
+def test_model_records(api, model):
+    """test read and search_read return records, classes are built once"""
+    api.server.execute_kw.side_effect = [
+        [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+        FIELDS,
+        [{"id": 3, "name": "c"}],
+        [],
+    ]
+
+    first, second = model.search_read([[]], {"fields": ["name"]})
+    [third] = model.read([[3]], {"fields": ["name"]})
+    assert model.read([[4]], {"fields": ["name"]}) == []
+
+    assert (first.id, first.name, second.name, third.name) == (1, "a", "b", "c")
+    assert type(first) is type(third)  # pylint:disable=unidiomatic-typecheck
+    assert model.record_class(["id", "name"]) is type(first)
+    assert model.record_class(["id"]) is not type(first)
+    assert api.server.execute_kw.call_count == 4
+
+
+def test_model_unknown_fields(api, model):
+    """test record classes are checked against `fields_get`"""
+    api.server.execute_kw.return_value = FIELDS
+
+    with pytest.raises(odoo_api_wrapper.APIError) as error:
+        model.record_class(["id", "email"])
+
+    assert str(error.value) == "Unknown fields: email"
+
+
+def test_model_iter_records(api, model):
+    """test iter_search_read yields records"""
+    api.server.execute_kw.side_effect = [
+        [{"id": 1, "name": "a"}, {"id": 2, "name": "b"}],
+        FIELDS,
+        [{"id": 3, "name": "c"}],
+        [{"id": 1, "name": "a"}],
+    ]
+
+    records = model.iter_search_read([], ["name"], batch_size=2)
+    assert [record.name for record in records] == ["a", "b", "c"]
+
+    [[record]] = model.iter_search_read([], ["name"], batch_size=2, batched=True)
+    assert record.name == "a"
+
+
+def test_invalid_result_mode(api, random_string):
+    """test with an invalid result mode"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        odoo_api_wrapper.Model(api, "res.partner", result_mode=random_string())
@@ -0,0 +1,219 @@
+""" `odoo_api_wrapper.resilience` tests """
+import socket
+import threading
+import time
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.resilience import CircuitBreaker
+from odoo_api_wrapper.resilience import Hedger
+from odoo_api_wrapper.resilience import is_retryable
+from odoo_api_wrapper.resilience import is_server_failure
+from odoo_api_wrapper.resilience import RetryPolicy
+
+
+def _http_error(status):
+    return xmlrpc.client.ProtocolError("localhost/xmlrpc/2/object", status, "", {})
+
+
+def test_is_retryable():
+    """test connection errors and 5xx responses are retried"""
+    assert is_retryable(ConnectionRefusedError())
+    assert is_retryable(_http_error(502))
+    assert not is_retryable(_http_error(404))
+    assert not is_retryable(socket.timeout())
+    assert not is_retryable(xmlrpc.client.Fault(1, "error"))
+    assert not is_retryable(None)
+
+    assert is_server_failure(socket.timeout())
+    assert is_server_failure(_http_error(503))
+    assert not is_server_failure(xmlrpc.client.Fault(1, "error"))
+
+
+def test_retry_delay():
+    """test the backoff doubles up to its maximum"""
+    policy = RetryPolicy(backoff=0.1, max_backoff=0.3, jitter=False)
+    assert [policy.delay(retry) for retry in range(3)] == [0.1, 0.2, 0.3]
+
+    policy = RetryPolicy(backoff=0.1)
+    assert all(0 <= policy.delay(2) <= 0.4 for _ in range(20))
+
+
+def test_circuit_breaker():
+    """test the circuit opens, lets a trial call through and closes"""
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.05)
+
+    breaker.record(True)
+    assert breaker.allow() and not breaker.open
+
+    breaker.record(True)
+    assert breaker.open and not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()
+    assert not breaker.allow()
+
+    # a failed trial keeps the circuit open
+    breaker.record(True)
+    assert breaker.open and not breaker.allow()
+
+    time.sleep(0.05)
+    assert breaker.allow()
+    breaker.record(False)
+    assert not breaker.open and breaker.failures == 0
+
+
+def test_hedger():
+    """test slow calls are sent again and the first result is kept"""
+    hedger = Hedger(percentile=50, min_samples=2)
+    calls = []
+    release = threading.Event()
+
+    def _call():
+        calls.append(None)
+        if len(calls) == 3:
+            release.wait(1)
+            return "slow"
+        return "fast"
+
+    try:
+        assert hedger.delay() is None
+        assert hedger.run(_call) == "fast"
+        assert hedger.run(_call) == "fast"
+        assert hedger.delay() is not None
+
+        assert hedger.run(_call) == "fast"
+        assert hedger.hedged == 1
+    finally:
+        release.set()
+        hedger.close()
+
+    assert len(calls) == 4
+
+
+def test_hedger_fast():
+    """test calls faster than the percentile are sent once"""
+    hedger = Hedger(min_samples=1)
+    hedger.run(lambda: time.sleep(0.1))
+
+    try:
+        assert hedger.run(lambda: "fast") == "fast"
+    finally:
+        hedger.close()
+
+    assert hedger.hedged == 0
+
+
+def test_hedger_errors():
+    """test the last error is raised when every call fails"""
+    hedger = Hedger(min_samples=1)
+    hedger.run(lambda: time.sleep(0.01))
+
+    def _fail():
+        time.sleep(0.05)
+        raise ValueError("boom")
+
+    try:
+        with pytest.raises(ValueError):
+            hedger.run(_fail)
+    finally:
+        hedger.close()
+
+    assert hedger.hedged == 1
+
+
+def test_retry(init_params, model_name):
+    """test read-only calls are retried on server failures"""
+    api = odoo_api_wrapper.Api(*init_params, retry=RetryPolicy(retries=2, backoff=0))
+
+    with mock.patch.object(api, "server") as server:
+        server.execute_kw.side_effect = [_http_error(502), ConnectionResetError(), [1]]
+        assert api.search(model_name, [[]]) == [1]
+        assert server.execute_kw.call_count == 3
+
+        server.execute_kw.side_effect = [_http_error(502)] * 3
+        with pytest.raises(odoo_api_wrapper.APIError, match="HTTP 502"):
+            api.search(model_name, [[]])
+
+
+def test_no_retry(init_params, model_name):
+    """test writes, faults and timeouts are not retried"""
+    api = odoo_api_wrapper.Api(*init_params, retry=RetryPolicy(backoff=0))
+
+    for operation, error in (
+        (odoo_api_wrapper.Operations.WRITE, _http_error(502)),
+        (odoo_api_wrapper.Operations.SEARCH, xmlrpc.client.Fault(1, "error")),
+        (odoo_api_wrapper.Operations.SEARCH, socket.timeout()),
+    ):
+        with mock.patch.object(api, "server") as server:
+            server.execute_kw.side_effect = error
+
+            with pytest.raises(odoo_api_wrapper.APIError):
+                api.call(operation, model_name, [[]])
+
+            assert server.execute_kw.call_count == 1
+
+
+def test_retry_deadline(init_params, model_name):
+    """test retries don't wait past the deadline"""
+    api = odoo_api_wrapper.Api(
+        *init_params, retry=RetryPolicy(backoff=10, jitter=False)
+    )
+
+    with mock.patch.object(api, "server") as server:
+        server.execute_kw.side_effect = ConnectionResetError()
+
+        with pytest.raises(odoo_api_wrapper.APIError):
+            api.search(model_name, [[]], timeout=1)
+
+        assert server.execute_kw.call_count == 1
+
+
+def test_circuit_open(init_params, model_name):
+    """test calls fail fast once the circuit is open"""
+    api = odoo_api_wrapper.Api(
+        *init_params, circuit_breaker=CircuitBreaker(failure_threshold=2)
+    )
+
+    with mock.patch.object(api, "server") as server:
+        server.execute_kw.side_effect = [
+            xmlrpc.client.Fault(1, "error"),
+            ConnectionRefusedError(),
+            [1],
+            ConnectionRefusedError(),
+            ConnectionRefusedError(),
+        ]
+
+        for _ in range(2):
+            with pytest.raises(odoo_api_wrapper.APIError):
+                api.search(model_name, [[]])
+        assert api.search(model_name, [[]]) == [1]
+        assert api.circuit_breaker.failures == 0
+
+        for _ in range(2):
+            with pytest.raises(odoo_api_wrapper.APIError):
+                api.write(model_name, [[1], {}])
+
+        with pytest.raises(odoo_api_wrapper.CircuitOpenError):
+            api.search(model_name, [[]])
+
+        assert server.execute_kw.call_count == 5
+
+
+def test_hedged_reads(init_params, model_name):
+    """test only read-only calls are hedged"""
+    hedging = Hedger(min_samples=1)
+    api = odoo_api_wrapper.Api(*init_params, hedging=hedging)
+
+    try:
+        with mock.patch.object(api, "server") as server:
+            server.execute_kw.return_value = [1]
+
+            assert api.search(model_name, [[]]) == [1]
+            assert api.write(model_name, [[1], {}]) == [1]
+            assert hedging.delay() is not None
+    finally:
+        hedging.close()
@@ -0,0 +1,230 @@
+""" `odoo_api_wrapper.sync` tests """
+# pylint:disable=redefined-outer-name
+import operator
+import sqlite3
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.sync import Replica
+
+FIELDS = {
+    "name": {"type": "char"},
+    "active": {"type": "boolean"},
+    "parent_id": {"type": "many2one"},
+    "tag_ids": {"type": "many2many"},
+    "credit": {"type": "monetary"},
+    "write_date": {"type": "datetime"},
+}
+
+_OPERATORS = {"=": operator.eq, ">": operator.gt, ">=": operator.ge}
+
+
+class _FakeOdoo:
+    """`execute_kw` over in-memory `res.partner` records"""
+
+    def __init__(self):
+        self.records = {}
+        self.fail_after = None
+
+    def put(self, id_, write_date, **values):
+        """create or update a record"""
+        self.records[id_] = {
+            "id": id_,
+            "name": f"Partner {id_}",
+            "active": True,
+            "parent_id": False,
+            "tag_ids": [],
+            "credit": 0.0,
+            **values,
+            "write_date": write_date,
+        }
+
+    def _search(self, domain, kwargs):
+        rows = sorted(
+            (
+                row
+                for row in self.records.values()
+                if all(_OPERATORS[op](row[field], value) for field, op, value in domain)
+            ),
+            key=lambda row: row["id"],
+        )
+        if kwargs.get("order") == "write_date desc":
+            rows.sort(key=lambda row: row["write_date"], reverse=True)
+
+        return rows[: kwargs.get("limit")]
+
+    def execute_kw(self, *params):
+        """answer a call"""
+        method, args, kwargs = params[4:]
+
+        if method == "fields_get":
+            return FIELDS
+        if method == "search":
+            return [row["id"] for row in self._search(args[0], kwargs)]
+        if method == "read":
+            rows = [self.records[id_] for id_ in args[0]]
+        else:
+            rows = self._search(args[0], kwargs)
+
+            if self.fail_after is not None:
+                if not self.fail_after:
+                    raise OSError("connection lost")
+                self.fail_after -= 1
+
+        return [
+            {field: row[field] for field in ["id", *kwargs["fields"]]} for row in rows
+        ]
+
+
+@pytest.fixture
+def odoo():
+    """fake server with 5 partners"""
+    odoo = _FakeOdoo()
+    for id_ in range(1, 6):
+        odoo.put(id_, f"2024-01-01 10:00:0{id_}")
+    return odoo
+
+
+@pytest.fixture
+def model(odoo, init_params):
+    """partner model on the fake server"""
+    api = odoo_api_wrapper.Api(*init_params)
+    with mock.patch.object(api, "server", odoo):
+        yield api["res.partner"]
+
+
+@pytest.fixture
+def replica(tmp_path):
+    """replica fixture"""
+    with Replica(str(tmp_path / "replica.db"), overlap=0) as replica:
+        yield replica
+
+
+def _rows(replica, columns="id, name"):
+    return replica.connection.execute(
+        f"SELECT {columns} FROM res_partner ORDER BY id"
+    ).fetchall()
+
+
+def test_initial_load(odoo, model, replica):
+    """test the first sync loads every record, with converted values"""
+    odoo.put(2, "2024-01-01 10:00:02", parent_id=[1, "Partner 1"], tag_ids=[3, 4])
+    odoo.put(3, "2024-01-01 10:00:03", active=False, name=False, credit=12.5)
+
+    assert replica.sync(
+        model, ["name", "active", "parent_id", "tag_ids", "credit"], batch_size=2
+    ) == (6, 0)
+    assert _rows(replica, "*")[1:3] == [
+        (2, "2024-01-01 10:00:02", "Partner 2", 1, 1, "Partner 1", "[3, 4]", 0.0),
+        (3, "2024-01-01 10:00:03", None, 0, None, None, "[]", 12.5),
+    ]
+
+
+def test_incremental(odoo, model, replica):
+    """test later syncs fetch changes, new records and deletions"""
+    replica.sync(model, ["name"])
+
+    odoo.put(2, "2024-01-02 09:00:00", name="Renamed")
+    odoo.put(6, "2024-01-02 09:00:01")
+    del odoo.records[4]
+
+    # the records written to since the watermark, the one at it included, with the
+    # ids paged through
+    with mock.patch("odoo_api_wrapper.sync.ID_PAGE_SIZE", 2):
+        assert replica.sync(model, ["name"]) == (3, 1)
+    assert _rows(replica) == [
+        (1, "Partner 1"),
+        (2, "Renamed"),
+        (3, "Partner 3"),
+        (5, "Partner 5"),
+        (6, "Partner 6"),
+    ]
+
+    assert replica.sync(model, ["name"]) == (1, 0)
+
+    replica.overlap = 24 * 3600
+    assert replica.sync(model, ["name"]) == (5, 0)
+
+
+def test_missing_records(odoo, model, replica):
+    """test records entering the domain unchanged are fetched"""
+    odoo.put(6, "2023-01-01 00:00:00", active=False)
+    replica.sync(model, ["name"], domain=[["active", "=", True]])
+
+    odoo.records[6]["active"] = True
+    odoo.records[1]["active"] = False
+
+    assert replica.sync(model, ["name"], domain=[["active", "=", True]]) == (2, 1)
+    assert [row[0] for row in _rows(replica)] == [2, 3, 4, 5, 6]
+
+
+def test_resume(odoo, model, replica):
+    """test an interrupted load carries on after the last stored page"""
+    odoo.fail_after = 2  # the watermark and the first page
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        replica.sync(model, ["name"], batch_size=2)
+    assert [row[0] for row in _rows(replica)] == [1, 2]
+
+    odoo.fail_after = None
+    with mock.patch.object(model.api, "search_read", wraps=model.api.search_read):
+        replica.sync(model, ["name"], batch_size=2)
+        domains = [call[0][1][0] for call in model.api.search_read.call_args_list]
+
+    assert domains[0] == [["id", ">", 2]]
+    assert [row[0] for row in _rows(replica)] == [1, 2, 3, 4, 5]
+
+
+def test_empty(odoo, model, replica):
+    """test syncing a model without records"""
+    odoo.records.clear()
+    assert replica.sync(model, ["name"]) == (0, 0)
+
+    odoo.put(1, "2024-01-01 10:00:00")
+    assert replica.sync(model, ["name"]) == (1, 0)
+
+
+def test_indexes(model, replica):
+    """test indexes are created once"""
+    for _ in range(2):
+        replica.sync(
+            model, ["name", "parent_id"], indexes=["name", ("parent_id", "id")]
+        )
+
+    assert {
+        row[0]
+        for row in replica.connection.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' "
+            "AND tbl_name = 'res_partner'"
+        )
+        if not row[0].startswith("sqlite_")
+    } == {"res_partner__name", "res_partner__parent_id__id"}
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        replica.sync(model, ["name", "parent_id"], indexes=["email"])
+
+
+def test_invalid(model, replica):
+    """test unknown fields and changed specs are refused"""
+    with pytest.raises(odoo_api_wrapper.APIError):
+        replica.sync(model, ["email"])
+
+    replica.sync(model, ["name"])
+    with pytest.raises(odoo_api_wrapper.APIError):
+        replica.sync(model, ["name", "active"])
+
+    replica.drop("res.partner")
+    assert replica.sync(model, ["name", "active"]).fetched == 6
+
+
+def test_concurrent_reader(tmp_path, model, replica):
+    """test other connections read the replica"""
+    replica.sync(model, ["name"])
+
+    connection = sqlite3.connect(str(tmp_path / "replica.db"))
+    try:
+        assert connection.execute("SELECT count(*) FROM res_partner").fetchone() == (5,)
+    finally:
+        connection.close()
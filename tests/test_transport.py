@@ -0,0 +1,293 @@
+""" `odoo_api_wrapper.transport` tests """
+# pylint:disable=redefined-outer-name
+import concurrent.futures
+import http.client
+import socket
+import ssl
+import time
+import xmlrpc.client
+from unittest import mock
+
+import pytest
+
+import odoo_api_wrapper
+from odoo_api_wrapper.transport import ConnectionPool
+from odoo_api_wrapper.transport import DEADLINE
+from odoo_api_wrapper.transport import DNSCache
+from odoo_api_wrapper.transport import from_url
+from odoo_api_wrapper.transport import PooledSafeTransport
+from odoo_api_wrapper.transport import PooledTransport
+
+
+@pytest.fixture
+def transport():
+    """pooled transport fixture"""
+    transport = PooledTransport(pool_size=2)
+    yield transport
+    transport.close()
+
+
+@pytest.fixture
+def api(xmlrpc_server, transport, init_params):
+    """api connected to the local server"""
+    return odoo_api_wrapper.Api(xmlrpc_server.url, *init_params[1:], transport)
+
+
+def test_keep_alive(xmlrpc_server, transport, api, init_params, model_name):
+    """test consecutive calls reuse the same connection"""
+    for _ in range(3):
+        assert api.search(model_name, [[]]) == [
+            *init_params[1:],
+            model_name,
+            "search",
+            [[]],
+            {},
+        ]
+
+    assert xmlrpc_server.connections == 1
+    assert transport.pool(xmlrpc_server.host).idle == 1
+
+
+def test_pool_is_bounded(xmlrpc_server, api, model_name):
+    """test concurrent calls never open more than `pool_size` connections"""
+    with concurrent.futures.ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda i: api.read(model_name, [[i]]), range(32)))
+
+    assert [result[5] for result in results] == [[[i]] for i in range(32)]
+    assert xmlrpc_server.connections <= 2
+
+
+def test_prewarm(xmlrpc_server, transport, api, model_name):
+    """test pre-warmed connections are used by the next calls"""
+    assert transport.prewarm(xmlrpc_server.host) == 2
+    assert transport.pool(xmlrpc_server.host).idle == 2
+
+    api.search(model_name, [[]])
+
+    assert xmlrpc_server.connections == 2
+
+
+def test_prewarm_exhausted(xmlrpc_server, transport):
+    """test pre-warming stops once every connection is in use"""
+    pool = transport.pool(xmlrpc_server.host)
+    connection, _ = pool.acquire()
+
+    assert pool.prewarm(5) == 1
+    assert pool.prewarm(1) == 0
+
+    pool.release(connection)
+    pool.release(pool.acquire()[0])
+    assert pool.idle == 2
+
+
+def test_stale_connection(xmlrpc_server, api, model_name):
+    """test a connection closed by the server is transparently replaced"""
+    xmlrpc_server.drop_connections = True
+
+    api.search(model_name, [[]])
+    assert api.search(model_name, [[]])
+
+    assert xmlrpc_server.connections == 2
+
+
+def test_max_idle(xmlrpc_server, api, model_name):
+    """test connections idle for too long are not reused"""
+    api.transport.max_idle = -1
+
+    api.search(model_name, [[]])
+    api.search(model_name, [[]])
+
+    assert xmlrpc_server.connections == 2
+
+
+def test_fresh_connection_error(xmlrpc_server, transport):
+    """test a disconnect on a fresh connection is not retried"""
+    with mock.patch.object(
+        transport,
+        "send_pooled_request",
+        side_effect=http.client.RemoteDisconnected,
+    ) as send:
+        with pytest.raises(http.client.RemoteDisconnected):
+            transport.request(xmlrpc_server.host, "/xmlrpc/2/object", b"")
+
+    assert send.call_count == 1
+    assert transport.pool(xmlrpc_server.host).idle == 0
+
+
+def test_fault_keeps_connection(xmlrpc_server, transport, api, model_name):
+    """test a fault leaves the connection in the pool"""
+
+    def _fault(*params):
+        raise ValueError("boom")
+
+    xmlrpc_server.register_function(_fault, "execute_kw")
+
+    with pytest.raises(odoo_api_wrapper.APIError):
+        api.search(model_name, [[]])
+
+    assert transport.pool(xmlrpc_server.host).idle == 1
+
+
+def test_protocol_error(xmlrpc_server, transport):
+    """test http errors raise `xmlrpc.client.ProtocolError`"""
+    transport.accept_gzip_encoding = False
+    body = xmlrpc.client.dumps((), "execute_kw").encode()
+
+    with pytest.raises(xmlrpc.client.ProtocolError) as error:
+        transport.request(xmlrpc_server.host, "/missing", body, verbose=False)
+
+    assert error.value.errcode == 404
+    assert transport.pool(xmlrpc_server.host).idle == 1
+
+
+def test_connection_refused(transport):
+    """test connection errors are raised and the connection discarded"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        address, port = sock.getsockname()
+        host = f"{address}:{port}"
+
+    with pytest.raises(ConnectionRefusedError):
+        transport.request(host, "/xmlrpc/2/object", b"")
+
+    assert transport.pool(host).idle == 0
+
+
+def test_api_close(xmlrpc_server, api, model_name):
+    """test closing the api releases the connections"""
+    api.search(model_name, [[]])
+    api.close()
+
+    assert api.transport.pool(xmlrpc_server.host).idle == 0
+
+
+def test_pool_factory_error():
+    """test a failing factory gives its slot back"""
+    pool = ConnectionPool(mock.Mock(side_effect=OSError), maxsize=1)
+
+    for _ in range(2):
+        with pytest.raises(OSError):
+            pool.acquire()
+
+        with pytest.raises(OSError):
+            pool.prewarm(1)
+
+
+def test_dns_cache():
+    """test addresses are cached for `ttl` seconds"""
+    cache = DNSCache(ttl=60)
+
+    with mock.patch("socket.getaddrinfo", wraps=socket.getaddrinfo) as getaddrinfo:
+        assert cache.resolve("localhost", 80)
+        assert cache.resolve("localhost", 80)
+        assert getaddrinfo.call_count == 1
+
+        cache.invalidate("localhost", 80)
+        cache.resolve("localhost", 80)
+        assert getaddrinfo.call_count == 2
+
+        cache.ttl = 0
+        cache.invalidate("localhost", 80)
+        cache.resolve("localhost", 80)
+        cache.resolve("localhost", 80)
+        assert getaddrinfo.call_count == 4
+
+
+def test_dns_cache_connection_error():
+    """test failed connections invalidate the cached addresses"""
+    cache = DNSCache()
+
+    with mock.patch.object(cache, "resolve", return_value=["127.0.0.1"]):
+        with mock.patch("socket.create_connection", side_effect=OSError):
+            with pytest.raises(OSError):
+                cache.create_connection(("localhost", 80))
+
+    with mock.patch.object(cache, "resolve", return_value=[]):
+        with pytest.raises(OSError):
+            cache.create_connection(("localhost", 80))
+
+
+def test_from_url():
+    """test the transport matches the url scheme"""
+    context = ssl.create_default_context()
+    transport = from_url("https://localhost", context=context, pool_size=3)
+
+    assert isinstance(transport, PooledSafeTransport)
+    assert transport.pool_size == 3
+
+    connection = transport.make_connection("localhost:8443")
+    assert isinstance(connection, http.client.HTTPSConnection)
+    assert connection.port == 8443
+
+    assert not isinstance(from_url("http://localhost"), PooledSafeTransport)
+
+
+def test_timeout(xmlrpc_server, init_params, model_name):
+    """test slow responses time out and discard their connection"""
+
+    def _slow(*params):
+        time.sleep(0.5)
+
+    xmlrpc_server.register_function(_slow, "execute_kw")
+    transport = PooledTransport(timeout=0.05)
+
+    with odoo_api_wrapper.Api(xmlrpc_server.url, *init_params[1:], transport) as api:
+        with pytest.raises(odoo_api_wrapper.APITimeoutError):
+            api.search(model_name, [[]])
+
+    assert transport.pool(xmlrpc_server.host).idle == 0
+
+
+def test_deadline(xmlrpc_server, api, init_params, model_name):
+    """test the deadline bounds the socket operations"""
+
+    def _slow(*params):
+        time.sleep(0.5)
+
+    xmlrpc_server.register_function(_slow, "execute_kw")
+
+    with pytest.raises(odoo_api_wrapper.APITimeoutError):
+        api.search(model_name, [[]], timeout=0.05)
+
+    token = DEADLINE.set(time.monotonic() - 1)
+    try:
+        with pytest.raises(socket.timeout):
+            api.transport.request(xmlrpc_server.host, "/xmlrpc/2/object", b"")
+    finally:
+        DEADLINE.reset(token)
+
+
+def test_acquire_timeout():
+    """test waiting for a connection times out"""
+    pool = ConnectionPool(mock.Mock, maxsize=1)
+    pool.acquire()
+
+    with pytest.raises(socket.timeout):
+        pool.acquire(timeout=0.01)
+
+
+def test_compress_requests(xmlrpc_server, init_params, model_name):
+    """test request bodies past `encode_threshold` are gzip compressed"""
+    with odoo_api_wrapper.Api(
+        xmlrpc_server.url, *init_params[1:], encode_threshold=1000
+    ) as api:
+        assert api.search(model_name, [[]])[5] == [[]]
+        assert api.search(model_name, [["x" * 2000]])[5] == [["x" * 2000]]
+
+    assert xmlrpc_server.encodings == ["identity", "gzip"]
+
+
+def test_compress_refused(xmlrpc_server, init_params, model_name):
+    """test servers refusing compressed requests get them uncompressed"""
+    xmlrpc_server.identity_only = True
+
+    with odoo_api_wrapper.Api(
+        xmlrpc_server.url, *init_params[1:], encode_threshold=1000
+    ) as api:
+        for _ in range(2):
+            assert api.search(model_name, [["x" * 2000]])[5] == [["x" * 2000]]
+
+        assert api.transport.identity_hosts == {xmlrpc_server.host}
+
+    assert xmlrpc_server.encodings == ["gzip", "identity", "identity"]
+    assert xmlrpc_server.connections == 1